@@ -11,6 +11,7 @@ Modules_Dir = "D:\\2025\\Projects\\Presence\\Presence0.1\\Resources\\Internal_Mo
 sys.path.insert(0, Modules_Dir)
 
 from utilities.request_chatgpt.request_chatgpt import request_chatgpt_response
+from uploaders.post_queue.post_queue import PostQueue
 from utilities.string_manager.string_manager import normalize_hebrew
 
 debug_mode = False  # Set to False to enable real ChatGPT API call
@@ -97,4 +98,9 @@ print(matrix_args)
 print("Running matrix_v1.py to generate the video...")
 subprocess.run(matrix_args)
 
+# hand the finished clip to the uploaders' queue
+if os.path.exists(os.path.join(base_output_dir, f"{timestamp}.mp4")):
+    with PostQueue(config.base_dir) as post_queue:
+        print(f"Queued post #{post_queue.enqueue(base_output_dir)}")
+
 log_file.close()
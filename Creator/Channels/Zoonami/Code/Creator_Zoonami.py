@@ -1,16 +1,23 @@
 import os
 import random
 import subprocess
+import sys
 import datetime
 from metadata_items_list import ANIMAL_VIDEO_TITLES, ANIMAL_VIDEO_DESCRIPTIONS
 import random
 
+Modules_Dir = "D:\\2025\\Projects\\Presence\\Presence0.1\\Resources\\Internal_Modules"
+sys.path.insert(0, Modules_Dir)
+from utilities.media_probe.media_probe import probe_directory
+from uploaders.post_queue.post_queue import PostQueue
+
 INPUT_VIDEO_DIR   = fr"D:\2025\Projects\Presence\Presence0.1\Creator\Channels\Zoonami\Resources\Videos"
 CLIPS_ROOT_DIR    = fr"D:\2025\Projects\Presence\Presence0.1\Channels\Zoonami\Clips"
 VIDEO_CUTTER_PATH = fr"D:\2025\Projects\Presence\Presence0.1\Resources\Internal_Modules\creators\video_cutter\video_cutter_v1\video_cutter_v1.py"
+CLIP_DURATION     = 58
 
 
-def pick_random_mp4(directory: str) -> str | None:
+def pick_random_mp4(directory: str, min_duration: float = 0) -> str | None:
     if not os.path.isdir(directory):
         print(f"❌  Not a valid directory: {directory}")
         return None
@@ -18,12 +25,20 @@ def pick_random_mp4(directory: str) -> str | None:
     if not mp4s:
         print("⚠️  No MP4 files found.")
         return None
+
+    # durations come from the shared probe index (cached, no decoding)
+    probed = probe_directory(directory, extensions=(".mp4",), recursive=False)
+    if probed:
+        long_enough = [p for p, info in probed.items() if info["duration"] >= min_duration]
+        if long_enough:
+            return random.choice(long_enough)
+        print(f"⚠️  No MP4 is at least {min_duration}s long, picking any.")
     return os.path.join(directory, random.choice(mp4s))
 
 
 if __name__ == "__main__":
     # 1️⃣  Select a random source video
-    src_video = pick_random_mp4(INPUT_VIDEO_DIR)
+    src_video = pick_random_mp4(INPUT_VIDEO_DIR, min_duration=CLIP_DURATION)
     if not src_video:
         raise SystemExit(1)
 
@@ -45,8 +60,13 @@ if __name__ == "__main__":
         "--output_name",   output_name,
         "--title",         title,
         "--description",   description,
-        "--duration",      "58",
+        "--duration",      str(CLIP_DURATION),
+        "--cut_point",     "scene",
     ]
 
     print("🎬 Running video_cutter_v1.py …")
     subprocess.run(cutter_args, check=True)
+
+    # hand the finished clip to the uploaders' queue
+    with PostQueue(os.path.dirname(CLIPS_ROOT_DIR)) as post_queue:
+        print(f"📥 Queued post #{post_queue.enqueue(output_name)}")
@@ -1,10 +1,13 @@
 import argparse
+import os
 import random
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor, as_completed
 from pathlib import Path
 import sys
-from typing import List, Tuple, Optional
+from typing import Dict, Iterable, Iterator, List, Tuple, Optional
 
-from PIL import Image, ImageDraw, ImageFont, ImageFilter, ImageEnhance
+from PIL import Image, ImageDraw, ImageFont, ImageFilter, ImageEnhance, ImageOps
 
 Modules_Dir = "D:\\2025\\Projects\\Presence\\Presence0.1\\Resources\\Internal_Modules"
 sys.path.insert(0, Modules_Dir)
@@ -28,6 +31,46 @@ FOUR_K = {
     "vertical": (2160, 3840),
 }
 
+# Extra sizes that can be produced alongside the 4K master
+OUTPUT_TARGETS = {
+    "instagram_post": (1080, 1350),
+    "instagram_story": (1080, 1920),
+    "youtube_community": (1920, 1080),
+}
+
+# Pixel sizes (shadow, stroke, border, blur…) are tuned for a 4K short side
+REFERENCE_SHORT_SIDE = 2160
+
+
+def _parse_target(target: str) -> Tuple[str, Tuple[int, int]]:
+    name = target.strip().lower()
+    if name in OUTPUT_TARGETS:
+        return name, OUTPUT_TARGETS[name]
+    try:
+        w, h = (int(v) for v in name.split("x"))
+    except ValueError:
+        raise ValueError(f"Invalid output target '{target}' (use a preset name or WIDTHxHEIGHT)") from None
+    return name, (w, h)
+
+
+def _same_aspect(a: Tuple[int, int], b: Tuple[int, int]) -> bool:
+    return abs(a[0] * b[1] - a[1] * b[0]) <= 0.002 * a[1] * b[1]
+
+def _blur_pad(radius: float) -> int:
+    # GaussianBlur runs 3 box passes of ~radius each; beyond this reach the result is untouched
+    return int(3 * radius) + 4
+
+
+def _padded_box(bbox, pad: int, size: Tuple[int, int]) -> Tuple[int, int, int, int]:
+    # grow a (possibly fractional) bbox by `pad` pixels and clip it to the canvas
+    left, top, right, bottom = bbox
+    return (
+        max(0, int(left) - pad),
+        max(0, int(top) - pad),
+        min(size[0], int(right) + 1 + pad),
+        min(size[1], int(bottom) + 1 + pad),
+    )
+
 # Border effect implementation ------------------------------------------------
 
 def _apply_border(img: Image.Image, effect: str, color: Tuple[int, int, int, int], width: int) -> Image.Image:
@@ -69,8 +112,13 @@ def _apply_border(img: Image.Image, effect: str, color: Tuple[int, int, int, int
         draw.rectangle([band, band, band + img.width, band + img.height],       # inner cut‑out
                     fill=(0, 0, 0, 0))
 
-        # 3️⃣ blur the ring to form the glow halo
-        glow_layer = ring.filter(ImageFilter.GaussianBlur(blur_radius))
+        # 3️⃣ blur the ring to form the glow halo – only the four edge strips,
+        #    the hollow centre stays transparent after blurring anyway
+        strip = min(band + _blur_pad(blur_radius), cw, ch)
+        glow_layer = Image.new("RGBA", (cw, ch), (0, 0, 0, 0))
+        for box in ((0, 0, cw, strip), (0, ch - strip, cw, ch),
+                    (0, 0, strip, ch), (cw - strip, 0, cw, ch)):
+            glow_layer.paste(ring.crop(box).filter(ImageFilter.GaussianBlur(blur_radius)), box[:2])
 
         # 4️⃣ composite glow UNDER the original picture
         base = Image.alpha_composite(glow_layer, base)   # halo sits around border
@@ -78,6 +126,42 @@ def _apply_border(img: Image.Image, effect: str, color: Tuple[int, int, int, int
 
     return img
 
+# Background loading ----------------------------------------------------------
+
+# Decoded + resized backgrounds, per process. A 4K RGBA frame is ~33 MB, so keep few.
+_BG_CACHE: "OrderedDict[tuple, Image.Image]" = OrderedDict()
+_BG_CACHE_SIZE = 8
+
+BACKGROUND_FITS = ("stretch", "cover")
+
+
+def _load_background(src: Path, size: Tuple[int, int], fit: str = "stretch") -> Image.Image:
+    """Return *src* decoded to RGBA and fitted to *size*. The result is shared – don't mutate it."""
+    if fit not in BACKGROUND_FITS:
+        raise ValueError(f"Invalid background fit '{fit}'")
+
+    key = (str(src.resolve()), src.stat().st_mtime_ns, size, fit)
+    bg = _BG_CACHE.get(key)
+    if bg is not None:
+        _BG_CACHE.move_to_end(key)
+        return bg
+
+    with Image.open(src) as im:
+        im = im.convert("RGBA")
+    if fit == "cover":
+        bg = ImageOps.fit(im, size, Image.LANCZOS)   # keep aspect, center-crop the overflow
+    else:
+        bg = im.resize(size, Image.LANCZOS)          # force image to fill the entire output
+
+    _BG_CACHE[key] = bg
+    if len(_BG_CACHE) > _BG_CACHE_SIZE:
+        _BG_CACHE.popitem(last=False)
+    return bg
+
+def _border_growth(effect: str, width: int) -> int:
+    # "simple" and "glow" extend the canvas by the border width on every side
+    return 2 * width if effect.strip().lower() in ("simple", "glow") else 0
+
 # Overlay filters -------------------------------------------------------------
 
 def _apply_overlay(img: Image.Image, effects: List[str], color: Tuple[int, int, int, int], blur_amount: int) -> Image.Image:
@@ -152,6 +236,7 @@ def _draw_text(
     fade_strength: float,
     h_align: str,
     v_align: str,
+    scale: float = 1.0,
 ):
     if not text or not text.strip():
         return img
@@ -161,8 +246,8 @@ def _draw_text(
     # base size calculation (80% width & 70% height)
     base_font_size = _auto_font_size(text, font_path, img.width, img.height, draw)
     size_map = {"tiny": 0.4, "small": 0.6, "medium": 0.8, "large": 1.0, "big": 1.1}
-    scale = size_map.get(font_size, 1.0)
-    font_size = max(10, int(base_font_size * scale))
+    size_factor = size_map.get(font_size, 1.0)
+    font_size = max(10, int(base_font_size * size_factor))
     font = ImageFont.truetype(font_path, font_size)
 
     max_width = int(img.width * 0.8)
@@ -186,17 +271,22 @@ def _draw_text(
 
     # ─ Marker Background Overlay (once per block) ─
     if "marker" in font_effects:
-        overlay_margin = 20
+        overlay_margin = round(20 * scale)
         overlay_top = y - overlay_margin
         overlay_bottom = y + total_h + (overlay_margin * 3)
         overlay_left = int(img.width * 0.1) - overlay_margin
         overlay_right = img.width - int(img.width * 0.1) + overlay_margin
         overlay_box = (overlay_left, overlay_top, overlay_right, overlay_bottom)
 
-        overlay_layer = Image.new("RGBA", img.size, (255, 255, 255, 0))
+        # only the marker rectangle itself is composited
+        region = _padded_box(overlay_box, 1, img.size)
+        overlay_layer = Image.new("RGBA", (region[2] - region[0], region[3] - region[1]), (255, 255, 255, 0))
         overlay_draw = ImageDraw.Draw(overlay_layer)
-        overlay_draw.rectangle(overlay_box, fill=font_marker_effect_color)
-        img.alpha_composite(overlay_layer)
+        overlay_draw.rectangle(
+            (overlay_left - region[0], overlay_top - region[1], overlay_right - region[0], overlay_bottom - region[1]),
+            fill=font_marker_effect_color,
+        )
+        img.alpha_composite(overlay_layer, dest=region[:2])
 
     for idx, line in enumerate(lines):
         line_h = line_heights[idx]
@@ -222,35 +312,42 @@ def _draw_text(
             fill_color = (*fore_rgb[:3], text_alpha)  # 🟢 always strip alpha here too
 
         # ─ Shadow ─
+        # Layers cover only the line's bbox (plus the blur reach) instead of the
+        # whole 4K canvas; text is shifted by whole pixels so rendering is unchanged.
         if "shadow" in font_effects:
-            shadow_offset = 20
-            shadow_blur_radius = 30
+            shadow_offset = round(20 * scale)
+            shadow_blur_radius = 30 * scale
+            sx, sy = x + shadow_offset, y + shadow_offset
+            box = _padded_box(draw.textbbox((sx, sy), line, font=font), _blur_pad(shadow_blur_radius), img.size)
 
             # Step 1: create shadow-only layer
-            shadow_layer = Image.new("RGBA", img.size, (0, 0, 0, 0))
+            shadow_layer = Image.new("RGBA", (box[2] - box[0], box[3] - box[1]), (0, 0, 0, 0))
             shadow_draw = ImageDraw.Draw(shadow_layer)
-            shadow_draw.text((x + shadow_offset, y + shadow_offset), line, font=font,
+            shadow_draw.text((sx - box[0], sy - box[1]), line, font=font,
                             fill=font_shadow_effect_color)
 
             # Step 2: blur the shadow
             blurred_shadow = shadow_layer.filter(ImageFilter.GaussianBlur(radius=shadow_blur_radius))
 
             # Step 3: composite the blurred shadow under the main text
-            img.alpha_composite(blurred_shadow)
+            img.alpha_composite(blurred_shadow, dest=box[:2])
 
         # ─ Main Text ─
-        text_layer = Image.new("RGBA", img.size, (255, 255, 255, 0))
+        stroke_width = max(1, round(2 * scale)) if "stroke" in font_effects else 0
+        box = _padded_box(draw.textbbox((x, y), line, font=font, stroke_width=stroke_width), 1, img.size)
+        text_layer = Image.new("RGBA", (box[2] - box[0], box[3] - box[1]), (255, 255, 255, 0))
         text_draw = ImageDraw.Draw(text_layer)
+        tx, ty = x - box[0], y - box[1]
 
         # ─ Stroke effect ─
         if "stroke" in font_effects:
-            text_draw.text((x, y), line, font=font,
-                           fill=fill_color, stroke_width=2,
+            text_draw.text((tx, ty), line, font=font,
+                           fill=fill_color, stroke_width=stroke_width,
                            stroke_fill=font_stroke_effect_color[:3])
         else:
-            text_draw.text((x, y), line, font=font, fill=fill_color)
+            text_draw.text((tx, ty), line, font=font, fill=fill_color)
 
-        img.alpha_composite(text_layer)
+        img.alpha_composite(text_layer, dest=box[:2])
         y += line_h
 
 
@@ -259,11 +356,12 @@ def _draw_text(
 # Main API
 # -----------------------------------------------------------------------------
 
-def generate_image(
+def _render(
+    size: Tuple[int, int],
+    scale: float,
+    src: Optional[Path],
+    *,
     text: str,
-    output_path: str,
-    image_orientation: str,
-    media_paths: Optional[List[str]],
     fore_color: str,
     bg_color: str,
     font_path: str,
@@ -283,26 +381,19 @@ def generate_image(
     text_v_align: str,
     blur_amount: int,
     border_width: int,
-):
-    orientation = image_orientation.lower()
-    if orientation not in FOUR_K:
-        raise ValueError("Invalid orientation")
-    w, h = FOUR_K[orientation]
+    background_fit: str,
+) -> Image.Image:
+    # One full pass (background → overlay → text → border) at *size*; *scale*
+    # converts the 4K-tuned effect sizes to this canvas.
+    w, h = size
 
     # base background
-    if media_paths:
-        src = Path(random.choice(media_paths))
-        if not src.exists():
-            raise FileNotFoundError(src)
-        bg = Image.open(src).convert("RGBA")
-        bg = bg.resize((w, h), Image.LANCZOS)  # force image to fill the entire output
-        canvas = Image.new("RGBA", (w, h), _parse_rgba(bg_color))
-        canvas.alpha_composite(bg)
-    else:
-        canvas = Image.new("RGBA", (w, h), _parse_rgba(bg_color))
+    canvas = Image.new("RGBA", (w, h), _parse_rgba(bg_color))
+    if src is not None:
+        canvas.alpha_composite(_load_background(src, (w, h), background_fit))
 
     # overlay filters
-    canvas = _apply_overlay(canvas, image_overlay_effect.split(",") if image_overlay_effect else [], _parse_rgba(image_overlay_effect_tint_color), blur_amount)
+    canvas = _apply_overlay(canvas, image_overlay_effect.split(",") if image_overlay_effect else [], _parse_rgba(image_overlay_effect_tint_color), blur_amount * scale)
 
     # text drawing
     _draw_text(
@@ -320,15 +411,114 @@ def generate_image(
         font_fade_effect_strength,
         text_h_align,
         text_v_align,
+        scale,
     )
 
     # border
-    canvas = _apply_border(canvas, border_effect.strip().lower(), _parse_rgba(border_effect_color), border_width)
+    return _apply_border(canvas, border_effect.strip().lower(), _parse_rgba(border_effect_color), round(border_width * scale))
+
+
+def generate_image(
+    text: str,
+    output_path: str,
+    image_orientation: str,
+    media_paths: Optional[List[str]],
+    fore_color: str,
+    bg_color: str,
+    font_path: str,
+    font_size: str,
+    text_alpha: int,
+    font_effect: str,
+    font_stroke_effect_color: str,
+    font_shadow_effect_color: str,
+    font_marker_effect_color: str,
+    font_fade_effect_color: str,
+    font_fade_effect_strength: float,
+    border_effect: str,
+    border_effect_color: str,
+    image_overlay_effect: str,
+    image_overlay_effect_tint_color: str,
+    text_h_align: str,
+    text_v_align: str,
+    blur_amount: int,
+    border_width: int,
+    background_fit: str = "stretch",
+    output_targets: Optional[List[str]] = None,
+) -> str:
+    """
+    Render the 4K master to *output_path*. Each entry of *output_targets* (a
+    preset from ``OUTPUT_TARGETS`` or ``"WIDTHxHEIGHT"``) is written next to
+    it as ``<stem>_<target><suffix>``.
+
+    Effect sizes scale with the canvas, so one set of parameters works for
+    every target. Targets are written at exactly their size (borders included)
+    and are LANCZOS-downscaled from an already rendered image of the same
+    aspect ratio when there is one; only new aspect ratios are rendered.
+    """
+    orientation = image_orientation.lower()
+    if orientation not in FOUR_K:
+        raise ValueError("Invalid orientation")
+
+    # pick the background once so every variant shares it
+    src = None
+    if media_paths:
+        src = Path(random.choice(media_paths))
+        if not src.exists():
+            raise FileNotFoundError(src)
+
+    def render(size: Tuple[int, int], scale: float) -> Image.Image:
+        return _render(
+            size, scale, src,
+            text=text,
+            fore_color=fore_color,
+            bg_color=bg_color,
+            font_path=font_path,
+            font_size=font_size,
+            text_alpha=text_alpha,
+            font_effect=font_effect,
+            font_stroke_effect_color=font_stroke_effect_color,
+            font_shadow_effect_color=font_shadow_effect_color,
+            font_marker_effect_color=font_marker_effect_color,
+            font_fade_effect_color=font_fade_effect_color,
+            font_fade_effect_strength=font_fade_effect_strength,
+            border_effect=border_effect,
+            border_effect_color=border_effect_color,
+            image_overlay_effect=image_overlay_effect,
+            image_overlay_effect_tint_color=image_overlay_effect_tint_color,
+            text_h_align=text_h_align,
+            text_v_align=text_v_align,
+            blur_amount=blur_amount,
+            border_width=border_width,
+            background_fit=background_fit,
+        )
 
-    # save
     out = Path(output_path)
     out.parent.mkdir(parents=True, exist_ok=True)
-    canvas.convert("RGB").save(out, format="JPEG", quality=95)
+
+    # the master keeps its historical size: 4K plus whatever the border adds
+    master = render(FOUR_K[orientation], 1.0)
+    master.convert("RGB").save(out, format="JPEG", quality=95)
+    print(f"Saved image at {out}")
+
+    variants = {"master": out.name}
+    rendered = [master]
+    targets = [_parse_target(t) for t in output_targets or []]
+
+    # largest first, so smaller sizes of the same aspect are derived by downscaling
+    for name, size in sorted(targets, key=lambda t: t[1][0] * t[1][1], reverse=True):
+        source = next((img for img in rendered if img.width >= size[0] and _same_aspect(img.size, size)), None)
+        if source is not None:
+            canvas = source.resize(size, Image.LANCZOS)
+        else:
+            scale = min(size) / REFERENCE_SHORT_SIDE
+            grow = _border_growth(border_effect, round(border_width * scale))
+            canvas = render((size[0] - grow, size[1] - grow), scale)
+            rendered.append(canvas)
+
+        path = out.with_name(f"{out.stem}_{name}{out.suffix}")
+        canvas.convert("RGB").save(path, format="JPEG", quality=95)
+        variants[name] = path.name
+        print(f"Saved image at {path}")
 
     # metadata
     if not text or not text.strip():
@@ -338,9 +528,88 @@ def generate_image(
         title = text.split()[0][:60]
         description = text
 
-    create_json(title, description, out.parent)
+    create_json(title, description, out.parent, extra={"variants": variants} if targets else None)
 
-    print(f"Saved image at {out}")
+    return str(out)
+
+
+def _job_defaults() -> Dict[str, object]:
+    # the CLI defaults double as defaults for batch jobs
+    args = vars(_build_parser().parse_args(["--text", "", "--output_path", ""]))
+    args["media_paths"] = args.pop("media_path")
+    del args["text"], args["output_path"]
+    return args
+
+
+def render_preview(max_side: int, **params) -> Image.Image:
+    """
+    Render in memory at *max_side* pixels on the long edge instead of 4K,
+    laid out the same way as the master. Takes ``generate_image`` keyword
+    arguments (minus the outputs); missing ones fall back to the CLI defaults.
+    """
+    params = {**_job_defaults(), **params}
+    params.pop("output_targets", None)
+    orientation = params.pop("image_orientation").lower()
+    if orientation not in FOUR_K:
+        raise ValueError("Invalid orientation")
+
+    src = None
+    media_paths = params.pop("media_paths")
+    if media_paths:
+        src = Path(media_paths[0])
+        if not src.exists():
+            raise FileNotFoundError(src)
+
+    w, h = FOUR_K[orientation]
+    factor = max_side / max(w, h)
+    size = (round(w * factor), round(h * factor))
+    img = _render(size, min(size) / REFERENCE_SHORT_SIDE, src, **params)
+    img.thumbnail((max_side, max_side), Image.LANCZOS)   # borders may have grown the canvas
+    return img
+
+
+def _render_job(job: Dict[str, object]) -> str:
+    return generate_image(**job)
+
+
+def generate_images(
+    batch: Iterable[Dict[str, object]],
+    max_workers: Optional[int] = None,
+) -> Iterator[Tuple[Dict[str, object], Optional[str], Optional[BaseException]]]:
+    """
+    Render a batch of images across a process pool.
+
+    Each job is a dict of ``generate_image`` keyword arguments; ``text`` and
+    ``output_path`` are required, everything else falls back to the CLI
+    defaults. Yields ``(job, output_path, error)`` as each image finishes.
+
+    The random background pick happens here so jobs can be submitted grouped
+    by background; each worker decodes a given background at most once.
+    Give every job its own output folder – ``metadata.json`` is written next
+    to the image.
+    """
+    defaults = _job_defaults()
+    jobs: List[Dict[str, object]] = []
+    for job in batch:
+        job = {**defaults, **job}
+        if job["media_paths"]:
+            job["media_paths"] = [random.choice(job["media_paths"])]
+        jobs.append(job)
+    if not jobs:
+        return
+
+    jobs.sort(key=lambda j: str(j["media_paths"] or ""))
+    workers = max_workers or min(len(jobs), os.cpu_count() or 1)
+
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        futures = {pool.submit(_render_job, job): job for job in jobs}
+        for future in as_completed(futures):
+            job = futures[future]
+            try:
+                yield job, future.result(), None
+            except Exception as e:
+                print(f"[ERROR] Picasso failed for {job['output_path']}: {e}")
+                yield job, None, e
 
 # -----------------------------------------------------------------------------
 # CLI
@@ -360,6 +629,10 @@ def _build_parser() -> argparse.ArgumentParser:
                    help="Image layout format. 'square' = 2160x2160, 'vertical' = 2160x3840, 'horizontal' = 3840x2160.")
     p.add_argument("--media_path", nargs="*", default=None,
                    help="Path(s) to background image(s). One is randomly chosen and resized to fill the image.")
+    p.add_argument("--output_targets", nargs="*", default=None,
+                   help="Extra output sizes next to the 4K master: " + ", ".join(OUTPUT_TARGETS) + " or WIDTHxHEIGHT.")
+    p.add_argument("--background_fit", choices=list(BACKGROUND_FITS), default="stretch",
+                   help="How the background fills the image: 'stretch' ignores its aspect ratio, 'cover' center-crops it.")
 
     # colors
     p.add_argument("--fore_color", type=str, default="0,0,0,255",
@@ -435,6 +708,8 @@ def main():
         text_v_align=args.text_v_align,
         blur_amount=args.blur_amount,
         border_width=args.border_width,
+        background_fit=args.background_fit,
+        output_targets=args.output_targets,
     )
 
 if __name__ == "__main__":
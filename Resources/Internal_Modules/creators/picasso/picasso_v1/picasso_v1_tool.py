@@ -1,12 +1,23 @@
+import queue
 import subprocess
+import threading
 import tkinter as tk
 from tkinter import filedialog, colorchooser, ttk, messagebox
 from pathlib import Path
 import sys
 
+from PIL import ImageTk
+
 # Path to the Picasso CLI script (adjust if necessary)
 PICASSO_SCRIPT = Path(__file__).parent / "picasso_v1.py"
 
+sys.path.insert(0, str(PICASSO_SCRIPT.parent))
+from picasso_v1 import render_preview
+
+PREVIEW_MAX_SIDE = 640      # long edge of the live preview, in pixels
+PREVIEW_DEBOUNCE_MS = 150   # wait this long after the last change before rendering
+POLL_MS = 16                # ~60 Hz check for finished background work
+
 # ---------------------------------------------------------------------------
 # Helper functions
 # ---------------------------------------------------------------------------
@@ -21,6 +32,46 @@ def pick_color(initial="#ffffff"):
         return f"{int(rgb[0])},{int(rgb[1])},{int(rgb[2])}"
     return None
 
+# ---------------------------------------------------------------------------
+# Background preview renderer
+# ---------------------------------------------------------------------------
+
+class PreviewRenderer:
+    """
+    Renders previews on a daemon thread so the Tk loop never blocks.
+
+    Only the newest request is kept: a request that is still waiting when a
+    newer one arrives is dropped, and the GUI ignores results whose job id is
+    no longer current. Results (job_id, image, error) land in ``results``.
+    """
+
+    def __init__(self):
+        self.results = queue.Queue()
+        self._lock = threading.Lock()
+        self._wake = threading.Event()
+        self._pending = None
+        threading.Thread(target=self._loop, daemon=True).start()
+
+    def submit(self, job_id, params):
+        with self._lock:
+            self._pending = (job_id, params)
+        self._wake.set()
+
+    def _loop(self):
+        while True:
+            self._wake.wait()
+            with self._lock:
+                job, self._pending = self._pending, None
+                self._wake.clear()
+            if job is None:
+                continue
+
+            job_id, params = job
+            try:
+                self.results.put((job_id, render_preview(PREVIEW_MAX_SIDE, **params), None))
+            except Exception as e:
+                self.results.put((job_id, None, e))
+
 # ---------------------------------------------------------------------------
 # Main GUI class
 # ---------------------------------------------------------------------------
@@ -29,10 +80,19 @@ class PicassoGUI(tk.Tk):
     def __init__(self):
         super().__init__()
         self.title("Picasso 4K Image Generator")
-        self.geometry("700x650")
+        self.geometry("1380x700")
         self.configure(padx=10, pady=10)
 
+        self._renderer = PreviewRenderer()
+        self._export_results = queue.Queue()
+        self._preview_job = 0
+        self._preview_after_id = None
+        self._preview_photo = None
+
         self._build_widgets()
+        self._watch_inputs()
+        self._schedule_preview()
+        self.after(POLL_MS, self._poll_background)
 
     # ----------------------- UI Layout ------------------------------------
     def _build_widgets(self):
@@ -144,7 +204,14 @@ class PicassoGUI(tk.Tk):
         tk.Entry(overlay_frame, textvariable=self.blur_var, width=6).grid(row=1, column=3, sticky="w")
 
         # Run button
-        tk.Button(self, text="Generate Image", bg="#4caf50", fg="white", command=self.run_picasso).grid(row=11, column=0, columnspan=4, pady=20, ipadx=10, ipady=5)
+        self.run_btn = tk.Button(self, text="Generate Image", bg="#4caf50", fg="white", command=self.run_picasso)
+        self.run_btn.grid(row=11, column=0, columnspan=4, pady=20, ipadx=10, ipady=5)
+
+        # Live preview
+        self.preview_canvas = tk.Canvas(self, width=PREVIEW_MAX_SIDE, height=PREVIEW_MAX_SIDE, bg="#202020", highlightthickness=0)
+        self.preview_canvas.grid(row=0, column=4, rowspan=11, padx=(15, 0), sticky="n")
+        self.preview_status = tk.StringVar(value="")
+        tk.Label(self, textvariable=self.preview_status, anchor="w").grid(row=11, column=4, padx=(15, 0), sticky="we")
 
     # ----------------------- Callbacks ------------------------------------
     def _browse_output(self):
@@ -162,12 +229,61 @@ class PicassoGUI(tk.Tk):
         if col:
             var.set(col)
 
-    # ----------------------- Run generator --------------------------------
-    def run_picasso(self):
-        if not self.out_var.get():
-            messagebox.showerror("Missing", "Please choose an output path")
+    # ----------------------- Live preview ---------------------------------
+    def _watch_inputs(self):
+        for var in vars(self).values():
+            if isinstance(var, tk.Variable) and var is not self.preview_status:
+                var.trace_add("write", lambda *_: self._schedule_preview())
+        self.text_entry.bind("<KeyRelease>", lambda _e: self._schedule_preview())
+
+    def _schedule_preview(self):
+        # debounce: restart the timer on every change while the user is still editing
+        if self._preview_after_id is not None:
+            self.after_cancel(self._preview_after_id)
+        self._preview_after_id = self.after(PREVIEW_DEBOUNCE_MS, self._request_preview)
+
+    def _request_preview(self):
+        self._preview_after_id = None
+        try:
+            params = self._collect_params()
+        except tk.TclError:
+            self.preview_status.set("Preview paused – invalid number")
             return
 
+        self._preview_job += 1
+        self._renderer.submit(self._preview_job, params)
+        self.preview_status.set("Rendering preview…")
+
+    def _poll_background(self):
+        # Tk is not thread safe – worker results are only applied here, on the main thread
+        latest = None
+        while not self._renderer.results.empty():
+            result = self._renderer.results.get_nowait()
+            if result[0] == self._preview_job:
+                latest = result
+
+        if latest is not None:
+            _job_id, img, err = latest
+            if err is not None:
+                self.preview_status.set(f"Preview failed: {err}")
+            else:
+                self._preview_photo = ImageTk.PhotoImage(img.convert("RGB"))
+                self.preview_canvas.delete("all")
+                self.preview_canvas.create_image(PREVIEW_MAX_SIDE // 2, PREVIEW_MAX_SIDE // 2, image=self._preview_photo)
+                self.preview_status.set(f"Preview {img.width}x{img.height}")
+
+        while not self._export_results.empty():
+            err = self._export_results.get_nowait()
+            self.run_btn.config(state="normal")
+            if err is None:
+                messagebox.showinfo("Success", "Image generated successfully!")
+            else:
+                messagebox.showerror("Error", f"Failed to generate image\n{err}")
+
+        self.after(POLL_MS, self._poll_background)
+
+    # ----------------------- Run generator --------------------------------
+    def _collect_params(self):
         effects = []
         if self.stroke_chk.get():
             effects.append("stroke")
@@ -179,36 +295,59 @@ class PicassoGUI(tk.Tk):
             effects.append("fade")
         eff_str = ",".join(effects)
 
-        cmd = [sys.executable, str(PICASSO_SCRIPT),
-               "--text", self.text_entry.get("1.0", "end").strip(),
-               "--output_path", self.out_var.get(),
-               "--image_orientation", self.orientation_var.get(),
-               "--fore_color", self.fore_var.get(),
-               "--bg_color", self.bg_var.get(),
-               "--font_size", self.font_size_var.get(),
-               "--text_h_align", self.halign_var.get(),
-               "--text_v_align", self.valign_var.get(),
-               "--font_effect", eff_str,
-               "--font_stroke_effect_color", self.stroke_col_var.get(),
-               "--font_shadow_effect_color", self.shadow_col_var.get(),
-               "--font_marker_effect_color", self.marker_col_var.get(),
-               "--font_fade_effect_color", self.fade_col_var.get(),
-               "--font_fade_effect_strength", str(self.fade_str_var.get()),
-               "--border_effect", self.border_eff_var.get(),
-               "--border_width", str(self.border_width_var.get()),
-               "--border_effect_color", self.border_col_var.get(),
-               "--image_overlay_effect", self.overlay_eff_var.get(),
-               "--image_overlay_effect_tint_color", self.overlay_tint_var.get(),
-               "--blur_amount", str(self.blur_var.get())]
-
-        if self.media_var.get():
-            cmd.extend(["--media_path", self.media_var.get()])
+        # keys match picasso's generate_image / CLI argument names
+        return {
+            "text": self.text_entry.get("1.0", "end").strip(),
+            "image_orientation": self.orientation_var.get(),
+            "media_paths": [self.media_var.get()] if self.media_var.get() else None,
+            "fore_color": self.fore_var.get(),
+            "bg_color": self.bg_var.get(),
+            "font_size": self.font_size_var.get(),
+            "text_h_align": self.halign_var.get(),
+            "text_v_align": self.valign_var.get(),
+            "font_effect": eff_str,
+            "font_stroke_effect_color": self.stroke_col_var.get(),
+            "font_shadow_effect_color": self.shadow_col_var.get(),
+            "font_marker_effect_color": self.marker_col_var.get(),
+            "font_fade_effect_color": self.fade_col_var.get(),
+            "font_fade_effect_strength": self.fade_str_var.get(),
+            "border_effect": self.border_eff_var.get(),
+            "border_width": self.border_width_var.get(),
+            "border_effect_color": self.border_col_var.get(),
+            "image_overlay_effect": self.overlay_eff_var.get(),
+            "image_overlay_effect_tint_color": self.overlay_tint_var.get(),
+            "blur_amount": self.blur_var.get(),
+        }
+
+    def run_picasso(self):
+        if not self.out_var.get():
+            messagebox.showerror("Missing", "Please choose an output path")
+            return
+
+        try:
+            params = self._collect_params()
+        except tk.TclError as e:
+            messagebox.showerror("Invalid value", str(e))
+            return
+
+        # the full 4K render only happens here, in a separate process
+        cmd = [sys.executable, str(PICASSO_SCRIPT), "--output_path", self.out_var.get()]
+        for key, value in params.items():
+            if key == "media_paths":
+                if value:
+                    cmd.extend(["--media_path", *value])
+            else:
+                cmd.extend([f"--{key}", str(value)])
+
+        self.run_btn.config(state="disabled")
+        threading.Thread(target=self._export, args=(cmd,), daemon=True).start()
 
+    def _export(self, cmd):
         try:
             subprocess.run(cmd, check=True)
-            messagebox.showinfo("Success", "Image generated successfully!")
-        except subprocess.CalledProcessError as e:
-            messagebox.showerror("Error", f"Failed to generate image\n{e}")
+            self._export_results.put(None)
+        except Exception as e:             # anything left uncaught would keep run_btn disabled
+            self._export_results.put(e)
 
 
 if __name__ == "__main__":
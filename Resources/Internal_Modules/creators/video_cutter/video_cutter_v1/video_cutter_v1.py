@@ -2,11 +2,17 @@ import os
 import sys
 import json
 import random
+import subprocess
 import time
 import argparse
 from datetime import datetime
 
-from moviepy import VideoClip, VideoFileClip
+Modules_Dir = "D:\\2025\\Projects\\Presence\\Presence0.1\\Resources\\Internal_Modules"
+sys.path.insert(0, Modules_Dir)
+from utilities.media_probe.media_probe import analyze_scenes, find_ffmpeg_tool, probe_media
+
+MIN_BRIGHTNESS = 40     # mean luma (0-255) below which a stretch counts as dark
+MIN_MOTION = 1.0        # mean frame difference (0-255) below which a stretch counts as static
 
 def get_center_crop_coords(video_w, video_h, target_w, target_h):
     x1 = int((video_w - target_w) / 2)
@@ -23,48 +29,98 @@ def get_aspect_crop(video_w, video_h, target_ratio):
         new_h = int(video_w / target_ratio)
     return get_center_crop_coords(video_w, video_h, new_w, new_h)
 
-def parse_resolution(res_str):
-    try:
-        w, h = map(int, res_str.lower().split('x'))
-        return w, h
-    except:
-        raise argparse.ArgumentTypeError("Resolution must be in format WIDTHxHEIGHT (e.g. 1080x1920)")
+# ---------------------------------------------------------------------------
+# ffmpeg fast path
+# ---------------------------------------------------------------------------
 
-def cut_and_process_video(
-    input_path,
-    output_dir_name,
-    output_name=None,
-    title=None,
-    description=None,
-    duration=60,
-    cut_point="random",
-    resolution=(1080, 1920),
-    fps=30
-):
-    output_name = output_name or str(int(time.time()))
-    base_dir = os.path.dirname(os.path.abspath(input_path))
-    full_output_dir = os.path.join(base_dir, output_dir_name, output_name)
-    os.makedirs(full_output_dir, exist_ok=True)
+def can_stream_copy(info, crop_box, resolution, fps):
+    """True when the cut needs no re-encode apart from the start position."""
+    return (
+        crop_box == (0, 0, info["width"], info["height"])
+        and resolution == (info["width"], info["height"])
+        and abs(info["fps"] - fps) < 0.01
+        and info["rotation"] == 0
+        and info["video_codec"] == "h264"
+        and info["pix_fmt"] == "yuv420p"
+        and info["audio_codec"] in (None, "aac")
+    )
 
-    output_path = os.path.join(full_output_dir, output_name + ".mp4")
-    json_path = os.path.join(full_output_dir, "metadata.json")
+def build_ffmpeg_command(ffmpeg, input_path, output_path, start_time, duration, crop_box, resolution, fps, stream_copy):
+    # -ss before -i: seek on the input side instead of decoding up to the cut point
+    cmd = [ffmpeg, "-y", "-hide_banner", "-loglevel", "error",
+           "-ss", f"{start_time:.3f}", "-i", input_path, "-t", f"{duration:.3f}",
+           "-map", "0:v:0", "-map", "0:a:0?"]
+    if stream_copy:
+        cmd += ["-c", "copy", "-avoid_negative_ts", "make_zero"]
+    else:
+        x1, y1, x2, y2 = crop_box
+        target_w, target_h = resolution
+        vf = f"crop={x2 - x1}:{y2 - y1}:{x1}:{y1},scale={target_w}:{target_h}:flags=lanczos,setsar=1,fps={fps}"
+        cmd += ["-vf", vf, "-c:v", "libx264", "-preset", "medium", "-pix_fmt", "yuv420p", "-c:a", "aac"]
+    cmd += ["-movflags", "+faststart", output_path]
+    return cmd
 
-    clip = VideoFileClip(input_path)
-    video_duration = clip.duration
-    target_w, target_h = resolution
+# ---------------------------------------------------------------------------
+# Scene-aware windows
+# ---------------------------------------------------------------------------
+
+def _window_stats(shots, start, end):
+    """Duration-weighted brightness/motion of the shots overlapping [start, end)."""
+    total = brightness = motion = 0.0
+    for shot in shots:
+        overlap = min(end, shot["end"]) - max(start, shot["start"])
+        if overlap > 0:
+            total += overlap
+            brightness += shot["brightness"] * overlap
+            motion += shot["motion"] * overlap
+    return (brightness / total, motion / total) if total else (0.0, 0.0)
+
+def choose_scene_window(shots, duration, min_brightness=MIN_BRIGHTNESS, min_motion=MIN_MOTION, min_fill=0.8):
+    """
+    Pick a random (start, end) that starts on a shot boundary and, when a
+    boundary falls in the last (1 - min_fill) of the window, ends on one too.
+    Windows that open on a dark shot or are dark/static on average are
+    skipped. None if nothing fits.
+    """
+    video_end = shots[-1]["end"]
+    candidates = []
+    for shot in shots:
+        start = shot["start"]
+        if start + duration * min_fill > video_end:
+            break
+        if shot["brightness"] < min_brightness:
+            continue
+        end = min(start + duration, video_end)
+        boundaries = [s["start"] for s in shots if start + duration * min_fill <= s["start"] <= end]
+        if boundaries:
+            end = max(boundaries)
 
-    # Choose start point
+        brightness, motion = _window_stats(shots, start, end)
+        if brightness >= min_brightness and motion >= min_motion:
+            candidates.append((start, end))
+
+    return random.choice(candidates) if candidates else None
+
+def choose_start_time(video_duration, duration, cut_point):
     if cut_point == "random":
         max_start = max(0, video_duration - duration)
-        start_time = random.uniform(0, max_start)
-    else:
-        start_time = float(cut_point)
-        if start_time + duration > video_duration:
-            start_time = max(0, video_duration - duration)
+        return random.uniform(0, max_start)
+    start_time = float(cut_point)
+    if start_time + duration > video_duration:
+        start_time = max(0, video_duration - duration)
+    return start_time
 
+def _cut_with_moviepy(input_path, output_path, duration, cut_point, resolution, fps, crop_box=None):
+    from moviepy import VideoFileClip
+
+    clip = VideoFileClip(input_path)
+    video_duration = clip.duration
+    target_w, target_h = resolution
+
+    start_time = choose_start_time(video_duration, duration, cut_point)
     end_time = start_time + duration
 
-    crop_x1, crop_y1, crop_x2, crop_y2 = get_aspect_crop(clip.w, clip.h, target_w / target_h)
+    crop_x1, crop_y1, crop_x2, crop_y2 = crop_box or get_aspect_crop(clip.w, clip.h, target_w / target_h)
 
     final_clip = (
         clip.subclipped(start_time, end_time)
@@ -75,6 +131,151 @@ def cut_and_process_video(
 
     final_clip.write_videofile(output_path, codec="libx264", audio_codec="aac")
 
+    clip.reader.close()
+    if clip.audio:
+        clip.audio.close()
+
+def _cut_with_ffmpeg(input_path, output_path, duration, cut_point, resolution, fps, crop_box=None):
+    """Returns the method used ('copy' / 'encode'), or None if the fast path isn't available."""
+    ffmpeg = find_ffmpeg_tool("ffmpeg")
+    info = probe_media(input_path) if ffmpeg else None
+    if not info or not info["duration"]:
+        return None
+
+    target_w, target_h = resolution
+    crop_box = crop_box or get_aspect_crop(info["width"], info["height"], target_w / target_h)
+    copy_ok = can_stream_copy(info, crop_box, resolution, fps)
+    keyframes = (probe_media(input_path, keyframes=True)["keyframes"] or []) if copy_ok else []
+
+    # with no geometry change, a random cut may as well start on a keyframe
+    if cut_point == "random" and keyframes:
+        max_start = max(0, info["duration"] - duration)
+        candidates = [k for k in keyframes if k <= max_start]
+        start_time = random.choice(candidates) if candidates else choose_start_time(info["duration"], duration, cut_point)
+    else:
+        start_time = choose_start_time(info["duration"], duration, cut_point)
+
+    stream_copy = any(abs(k - start_time) <= 0.5 / fps for k in keyframes)
+    cmd = build_ffmpeg_command(ffmpeg, input_path, output_path, start_time, duration, crop_box, resolution, fps, stream_copy)
+    subprocess.run(cmd, check=True)
+    return "copy" if stream_copy else "encode"
+
+# ---------------------------------------------------------------------------
+# Batch cutting: several outputs from one source
+# ---------------------------------------------------------------------------
+
+def _normalize_job(job, info, default_resolution):
+    start = float(job.get("start", 0))
+    end = float(job["end"]) if job.get("end") is not None else start + float(job["duration"])
+    if info:
+        end = min(end, info["duration"])
+
+    resolution = job.get("resolution") or default_resolution
+    if isinstance(resolution, str):
+        resolution = parse_resolution(resolution)
+    resolution = tuple(resolution)
+
+    crop = job.get("crop")
+    if crop:
+        crop = tuple(int(v) for v in crop)
+    elif info:
+        crop = get_aspect_crop(info["width"], info["height"], resolution[0] / resolution[1])
+
+    return {**job, "start": start, "end": end, "resolution": resolution, "crop": crop}
+
+def group_jobs(jobs, max_gap):
+    """
+    Sort jobs by start and group those whose windows lie within *max_gap*
+    seconds of each other. A group is decoded once; between groups an
+    input-side seek is cheaper than decoding the gap.
+    """
+    groups = []
+    for job in sorted(jobs, key=lambda j: j["start"]):
+        if groups and job["start"] - max(j["end"] for j in groups[-1]) <= max_gap:
+            groups[-1].append(job)
+        else:
+            groups.append([job])
+    return groups
+
+def build_batch_command(ffmpeg, input_path, group, fps, has_audio):
+    """One ffmpeg run: decode the group's span once, split it and give every window its own encoder."""
+    seek = group[0]["start"]
+    span = max(j["end"] for j in group) - seek
+    n = len(group)
+
+    # fps runs once on the shared stream: after a trim it would pad every
+    # output with duplicated frames up to the end of the decoded span
+    graph = [f"[0:v:0]fps={fps},split={n}" + "".join(f"[v{i}]" for i in range(n))]
+    if has_audio:
+        graph.append(f"[0:a:0]asplit={n}" + "".join(f"[a{i}]" for i in range(n)))
+    for i, job in enumerate(group):
+        start, end = job["start"] - seek, job["end"] - seek
+        x1, y1, x2, y2 = job["crop"]
+        target_w, target_h = job["resolution"]
+        graph.append(
+            f"[v{i}]trim=start={start:.3f}:end={end:.3f},setpts=PTS-STARTPTS,"
+            f"crop={x2 - x1}:{y2 - y1}:{x1}:{y1},scale={target_w}:{target_h}:flags=lanczos,setsar=1[vo{i}]"
+        )
+        if has_audio:
+            graph.append(f"[a{i}]atrim=start={start:.3f}:end={end:.3f},asetpts=PTS-STARTPTS[ao{i}]")
+
+    cmd = [ffmpeg, "-y", "-hide_banner", "-loglevel", "error",
+           "-ss", f"{seek:.3f}", "-t", f"{span:.3f}", "-i", input_path,
+           "-filter_complex", ";".join(graph)]
+    for i, job in enumerate(group):
+        cmd += ["-map", f"[vo{i}]"]
+        if has_audio:
+            cmd += ["-map", f"[ao{i}]", "-c:a", "aac"]
+        cmd += ["-c:v", "libx264", "-preset", "medium", "-pix_fmt", "yuv420p",
+                "-movflags", "+faststart", job["output"]]
+    return cmd
+
+def cut_many(input_path, jobs, resolution=(1080, 1920), fps=30, max_gap=30.0, engine="auto"):
+    """
+    Cut several windows out of one source. Each job is a dict with ``start``,
+    ``end`` or ``duration``, ``output`` and optionally ``crop`` (x1, y1, x2, y2),
+    ``resolution``, ``title`` and ``description`` (written to metadata.json
+    next to the output). Returns ``[(output, method), ...]``.
+    """
+    ffmpeg = find_ffmpeg_tool("ffmpeg") if engine in ("auto", "ffmpeg") else None
+    info = probe_media(input_path) if ffmpeg else None
+    if engine == "ffmpeg" and not info:
+        raise RuntimeError("ffmpeg/ffprobe not available for the ffmpeg engine")
+
+    jobs = [_normalize_job(job, info, resolution) for job in jobs]
+    for job in jobs:
+        os.makedirs(os.path.dirname(os.path.abspath(job["output"])), exist_ok=True)
+
+    results = []
+    for group in group_jobs(jobs, max_gap):
+        method = None
+        if info:
+            try:
+                if len(group) == 1:
+                    job = group[0]
+                    method = _cut_with_ffmpeg(input_path, job["output"], job["end"] - job["start"], job["start"],
+                                              job["resolution"], fps, crop_box=job["crop"])
+                else:
+                    subprocess.run(build_batch_command(ffmpeg, input_path, group, fps, info["audio_codec"] is not None), check=True)
+                    method = "batch"
+            except subprocess.CalledProcessError as e:
+                if engine == "ffmpeg":
+                    raise
+                print(f"⚠️  ffmpeg batch cut failed ({e}), falling back to moviepy")
+
+        for job in group:
+            if method is None:
+                _cut_with_moviepy(input_path, job["output"], job["end"] - job["start"], job["start"],
+                                  job["resolution"], fps, crop_box=job["crop"])
+            if job.get("title") is not None or job.get("description") is not None:
+                write_metadata(os.path.join(os.path.dirname(os.path.abspath(job["output"])), "metadata.json"),
+                               job.get("title"), job.get("description"))
+            results.append((job["output"], method or "moviepy"))
+            print(f"✅ Video saved to: {job['output']} ({method or 'moviepy'})")
+
+    return results
+
+def write_metadata(json_path, title, description):
     metadata = {
         "title": title,
         "description": description,
@@ -84,27 +285,95 @@ def cut_and_process_video(
     with open(json_path, "w", encoding="utf-8") as f:
         json.dump(metadata, f, ensure_ascii=False, indent=4)
 
-    clip.reader.close()
-    if clip.audio:
-        clip.audio.close()
+def parse_resolution(res_str):
+    try:
+        w, h = map(int, res_str.lower().split('x'))
+        return w, h
+    except:
+        raise argparse.ArgumentTypeError("Resolution must be in format WIDTHxHEIGHT (e.g. 1080x1920)")
 
-    print(f"\n✅ Video saved to: {output_path}")
+def cut_and_process_video(
+    input_path,
+    output_dir_name,
+    output_name=None,
+    title=None,
+    description=None,
+    duration=60,
+    cut_point="random",
+    resolution=(1080, 1920),
+    fps=30,
+    engine="auto"
+):
+    output_name = output_name or str(int(time.time()))
+    base_dir = os.path.dirname(os.path.abspath(input_path))
+    full_output_dir = os.path.join(base_dir, output_dir_name, output_name)
+    os.makedirs(full_output_dir, exist_ok=True)
+
+    output_path = os.path.join(full_output_dir, output_name + ".mp4")
+    json_path = os.path.join(full_output_dir, "metadata.json")
+
+    # snap the window to shot boundaries, skipping dark/static stretches
+    if cut_point == "scene":
+        shots = analyze_scenes(input_path)
+        window = choose_scene_window(shots, duration) if shots else None
+        if window:
+            cut_point, duration = window[0], window[1] - window[0]
+            print(f"🎞️  Scene window: {window[0]:.2f}s – {window[1]:.2f}s")
+        else:
+            print("⚠️  No suitable scene window, using a random cut")
+            cut_point = "random"
+
+    # ffmpeg stream copy / single-pass encode first, moviepy only as a fallback
+    method = None
+    if engine in ("auto", "ffmpeg"):
+        try:
+            method = _cut_with_ffmpeg(input_path, output_path, duration, cut_point, resolution, fps)
+        except subprocess.CalledProcessError as e:
+            if engine == "ffmpeg":
+                raise
+            print(f"⚠️  ffmpeg cut failed ({e}), falling back to moviepy")
+        if method is None and engine == "ffmpeg":
+            raise RuntimeError("ffmpeg/ffprobe not available for the ffmpeg engine")
+
+    if method is None:
+        _cut_with_moviepy(input_path, output_path, duration, cut_point, resolution, fps)
+        method = "moviepy"
+
+    write_metadata(json_path, title, description)
+
+    print(f"\n✅ Video saved to: {output_path} ({method})")
     print(f"📄 Metadata saved to: {json_path}")
 
 def main():
     parser = argparse.ArgumentParser(description="Cut and crop a video clip")
     parser.add_argument("--input_video", help="Path to input MP4 video")
+    parser.add_argument("--jobs", default=None,
+                        help="JSON file with a list of cuts (start, end/duration, output, crop, resolution, title, description) "
+                             "to produce from --input_video in one pass; --output_dir/--output_name are ignored")
+    parser.add_argument("--max_gap", type=float, default=30.0,
+                        help="Batch mode: windows closer than this many seconds share one decode")
     parser.add_argument("--output_dir", help="Subdirectory name (inside input video's parent dir)")
     parser.add_argument("--output_name", default=datetime.now().strftime("%Y%m%d_%H%M%S"), help="Output file name (default: timestamp)")
     parser.add_argument("--title", default=None, help="Output file name (default: timestamp)")
     parser.add_argument("--description", default=None, help="Output file name (default: timestamp)")
     parser.add_argument("--duration", type=int, default=60, help="Duration of the clip in seconds (default: 60)")
-    parser.add_argument("--cut_point", default="random", help="Start point in seconds or 'random'")
+    parser.add_argument("--cut_point", default="random",
+                        help="Start point in seconds, 'random', or 'scene' (random window snapped to shot boundaries, "
+                             "skipping dark/static parts)")
     parser.add_argument("--resolution", type=parse_resolution, default=(1080, 1920), help="Output resolution (e.g. 1080x1920)")
     parser.add_argument("--fps", type=int, default=30, help="Frames per second (default: 30)")
+    parser.add_argument("--engine", choices=["auto", "ffmpeg", "moviepy"], default="auto",
+                        help="auto = ffmpeg (stream copy when possible) with moviepy fallback")
 
     args = parser.parse_args()
 
+    if args.jobs:
+        with open(args.jobs, "r", encoding="utf-8") as f:
+            jobs = json.load(f)
+        cut_many(args.input_video, jobs, resolution=args.resolution, fps=args.fps,
+                 max_gap=args.max_gap, engine=args.engine)
+        return
+
     cut_and_process_video(
         input_path=args.input_video,
         output_dir_name=args.output_dir,
@@ -114,7 +383,8 @@ def main():
         duration=args.duration,
         cut_point=args.cut_point,
         resolution=args.resolution,
-        fps=args.fps
+        fps=args.fps,
+        engine=args.engine
     )
 
 if __name__ == "__main__":
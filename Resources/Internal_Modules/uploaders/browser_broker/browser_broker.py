@@ -0,0 +1,387 @@
+"""
+browser_broker.py
+~~~~~~~~~~~~~~~~~
+Long-lived local broker that keeps warm, logged-in Chrome sessions so
+uploaders don't pay a cold browser start (profile clone + Chrome launch +
+stealth + first page load) for every clip.
+
+One session is kept per (channel profile, platform, mobile/desktop). An
+uploader *borrows* a session over a local socket, attaches its own
+chromedriver to the running Chrome through the DevTools port, does its
+upload and *returns* the session. The broker
+
+• health-checks sessions (DevTools endpoint + driver) before lending them
+  and periodically while idle, relaunching crashed ones, and keeps the
+  profile-clone leases of live sessions renewed;
+• recycles a session after ``MAX_USES`` uploads or once its Chrome process
+  tree exceeds ``MAX_MEMORY_MB`` (needs ``psutil``; skipped without it);
+• takes a session back when a borrower disappears for ``LEASE_TIMEOUT``;
+• reloads the platform page after each return so the next borrow is warm.
+
+Protocol: one JSON object per line, request → response, on
+``BROKER_HOST:BROKER_PORT``. Ops: ``borrow``, ``return``, ``status``,
+``shutdown``.
+
+Example
+-------
+# terminal 1 – keep running
+python browser_broker.py serve
+
+# uploader side (run_chrome_beta does this when called with platform=...)
+from uploaders.browser_broker.browser_broker import borrow_session, return_session
+
+lease = borrow_session("God Mode Notes", "youtube", user_data_dir, chrome_exe,
+                       url="https://studio.youtube.com/")
+if lease:                                 # None → broker not running, launch locally
+    ...  # attach with options.debugger_address = lease["debugger_address"]
+    return_session(lease["id"])
+
+CLI
+---
+python browser_broker.py serve [--port N]
+python browser_broker.py status | shutdown
+"""
+from __future__ import annotations
+
+import argparse
+import json
+import logging
+import socket
+import socketserver
+import sys
+import threading
+import time
+import urllib.request
+import uuid
+from typing import Callable, Dict, Optional, Tuple
+
+try:
+    import psutil                     # optional – enables the memory recycle rule
+except ImportError:
+    psutil = None
+
+Modules_Dir = "D:\\2025\\Projects\\Presence\\Presence0.1\\Resources\\Internal_Modules"
+sys.path.insert(0, Modules_Dir)
+
+BROKER_HOST = "127.0.0.1"
+BROKER_PORT = 47291
+MAX_USES = 20                 # uploads per session before it is recycled
+MAX_MEMORY_MB = 2500          # Chrome process-tree RSS that triggers a recycle
+LEASE_TIMEOUT = 30 * 60       # seconds a borrower may hold a session
+BORROW_WAIT = 10 * 60         # seconds a borrower waits for a busy session
+HEALTH_INTERVAL = 30          # seconds between idle health checks
+
+SessionKey = Tuple[str, str, bool]
+
+
+# ─────────────────────────────────────────────── client side
+def _request(payload: dict, timeout: float, host: str = BROKER_HOST, port: int = BROKER_PORT) -> Optional[dict]:
+    """Send one request; None when no broker is listening."""
+    try:
+        with socket.create_connection((host, port), timeout=timeout) as sock:
+            sock.sendall((json.dumps(payload) + "\n").encode("utf-8"))
+            with sock.makefile("r", encoding="utf-8") as reader:
+                line = reader.readline()
+    except OSError:
+        return None
+    return json.loads(line) if line else None
+
+
+def broker_running(host: str = BROKER_HOST, port: int = BROKER_PORT) -> bool:
+    return _request({"op": "status"}, timeout=1, host=host, port=port) is not None
+
+
+def borrow_session(channel_name: str, platform: str, chrome_user_data_dir: str, chrome_exe_path: str,
+                   url: str = "", mobile: bool = False, headless: bool = True,
+                   wait: float = BORROW_WAIT, host: str = BROKER_HOST, port: int = BROKER_PORT) -> Optional[dict]:
+    """
+    Borrow a warm session. Returns ``{"id", "debugger_address", "uses"}``,
+    or None if the broker is not running or could not provide one.
+    """
+    reply = _request({
+        "op": "borrow", "channel_name": channel_name, "platform": platform.lower(), "mobile": bool(mobile),
+        "headless": bool(headless), "user_data_dir": chrome_user_data_dir, "exe_path": chrome_exe_path,
+        "url": url, "wait": wait,
+    }, timeout=wait + 120, host=host, port=port)
+    if not reply:
+        return None
+    if not reply.get("ok"):
+        logging.warning("Browser broker refused session: %s", reply.get("error"))
+        return None
+    return reply
+
+
+def return_session(session_id: str, healthy: bool = True,
+                   host: str = BROKER_HOST, port: int = BROKER_PORT) -> None:
+    """Hand a session back; ``healthy=False`` makes the broker recycle it."""
+    _request({"op": "return", "id": session_id, "healthy": bool(healthy)}, timeout=30, host=host, port=port)
+
+
+# ─────────────────────────────────────────────── broker side
+def _launch_chrome(channel_name: str, user_data_dir: str, exe_path: str, headless: bool):
+    """Start a broker-owned Chrome; returns (driver, debugger_address)."""
+    from uploaders.run_chrome_beta.run_chrome_beta import start_browser
+
+    driver = start_browser(channel_name, user_data_dir, exe_path, headless=headless)
+    address = driver.capabilities.get("goog:chromeOptions", {}).get("debuggerAddress")
+    if not address:
+        driver.quit()
+        raise RuntimeError("Chrome did not report a DevTools address.")
+    return driver, address
+
+
+class Session:
+    """One warm Chrome owned by the broker."""
+
+    def __init__(self, key: SessionKey, params: dict, launcher: Callable):
+        self.key = key
+        self.params = params
+        self.launcher = launcher
+        self.id = ""
+        self.driver = None
+        self.address = ""
+        self.uses = 0
+        self.borrowed_at: Optional[float] = None
+
+    # ---------- lifecycle ----------
+    def launch(self) -> None:
+        p = self.params
+        self.driver, self.address = self.launcher(p["channel_name"], p["user_data_dir"], p["exe_path"], p["headless"])
+        self.id = uuid.uuid4().hex
+        self.uses = 0
+        self.warm()
+        logging.info("Broker: launched %s at %s", self.key, self.address)
+
+    def clone_root(self) -> Optional[str]:
+        """The profile clone this session's Chrome runs on (its lease is held by the broker process)."""
+        if self.driver is None:
+            return None
+        root = getattr(self.driver, "_clone_root", None)
+        if root:
+            return root
+        try:
+            return self.driver.capabilities.get("chrome", {}).get("userDataDir")
+        except Exception:
+            return None
+
+    def close(self) -> None:
+        if self.driver is not None:
+            clone_root = self.clone_root()
+            try:
+                self.driver.quit()
+            except Exception:
+                pass
+            if clone_root:
+                # the broker process holds the profile lease until it exits – hand it back now
+                from uploaders.profile_clone.profile_clone import release_clone
+                release_clone(clone_root)
+        self.driver, self.address, self.id = None, "", ""
+
+    def renew_lease(self) -> None:
+        """A warm session outlives LEASE_TTL_SECONDS; keep its clone from being taken as abandoned."""
+        clone_root = self.clone_root()
+        if clone_root:
+            from uploaders.profile_clone.profile_clone import renew_clone
+            if not renew_clone(clone_root):
+                logging.warning("Broker: could not renew the profile lease of %s", self.key)
+
+    def warm(self) -> None:
+        if self.params.get("url"):
+            try:
+                self.driver.get(self.params["url"])
+            except Exception as e:
+                logging.warning("Broker: warm-up of %s failed – %s", self.key, e)
+
+    # ---------- checks ----------
+    def healthy(self) -> bool:
+        if self.driver is None:
+            return False
+        try:
+            with urllib.request.urlopen(f"http://{self.address}/json/version", timeout=3) as r:
+                r.read()
+            self.driver.current_url
+            return True
+        except Exception:
+            return False
+
+    def memory_mb(self) -> Optional[float]:
+        if psutil is None or self.driver is None:
+            return None
+        try:
+            root = psutil.Process(self.driver.service.process.pid)
+            procs = [root] + root.children(recursive=True)
+            return sum(p.memory_info().rss for p in procs) / 1e6
+        except Exception:
+            return None
+
+    def worn_out(self) -> bool:
+        if self.uses >= MAX_USES:
+            return True
+        mem = self.memory_mb()
+        return mem is not None and mem > MAX_MEMORY_MB
+
+
+class BrowserBroker:
+    """Session table + lending rules; transport-agnostic so it can be driven directly."""
+
+    def __init__(self, launcher: Callable = _launch_chrome):
+        self.launcher = launcher
+        self.sessions: Dict[SessionKey, Session] = {}
+        self.cond = threading.Condition()
+
+    def borrow(self, req: dict) -> dict:
+        key: SessionKey = (req["channel_name"], req["platform"], bool(req.get("mobile")))
+        deadline = time.monotonic() + float(req.get("wait", BORROW_WAIT))
+        with self.cond:
+            session = self.sessions.setdefault(key, Session(key, dict(req), self.launcher))
+            while session.borrowed_at is not None:
+                self._reclaim_expired()
+                if session.borrowed_at is None:
+                    break
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    return {"ok": False, "error": f"session {key} busy"}
+                self.cond.wait(min(remaining, 5))
+            session.borrowed_at = time.time()
+
+        # launching / probing happens outside the lock – other keys stay responsive
+        try:
+            if session.params.get("headless") != bool(req.get("headless", True)):
+                session.close()
+            session.params.update(req)
+            if not session.healthy():
+                session.close()
+                session.launch()
+        except Exception as e:
+            self._release(session)
+            return {"ok": False, "error": f"launch failed: {e}"}
+        return {"ok": True, "id": session.id, "debugger_address": session.address, "uses": session.uses}
+
+    def give_back(self, session_id: str, healthy: bool = True) -> dict:
+        session = next((s for s in self.sessions.values() if s.id == session_id), None)
+        if session is None:
+            return {"ok": False, "error": "unknown session"}
+        session.uses += 1
+        if not healthy or session.worn_out():
+            logging.info("Broker: recycling %s after %d uses", session.key, session.uses)
+            session.close()
+        else:
+            session.warm()
+        self._release(session)
+        return {"ok": True}
+
+    def status(self) -> dict:
+        with self.cond:
+            return {"ok": True, "sessions": [
+                {"key": list(s.key), "address": s.address, "uses": s.uses,
+                 "borrowed": s.borrowed_at is not None, "memory_mb": s.memory_mb()}
+                for s in self.sessions.values()
+            ]}
+
+    def health_sweep(self) -> None:
+        """Relaunch-on-demand: drop idle sessions that crashed or wore out; renew the profile leases of the rest."""
+        with self.cond:
+            self._reclaim_expired()
+            for s in self.sessions.values():
+                if s.driver is not None:
+                    s.renew_lease()
+            idle = [s for s in self.sessions.values() if s.borrowed_at is None and s.driver is not None]
+            for s in idle:
+                s.borrowed_at = time.time()          # hold it while probing
+        for s in idle:
+            if not s.healthy() or s.worn_out():
+                logging.info("Broker: dropping unhealthy session %s", s.key)
+                s.close()
+            self._release(s)
+
+    def close_all(self) -> None:
+        for s in self.sessions.values():
+            s.close()
+
+    def _release(self, session: Session) -> None:
+        with self.cond:
+            session.borrowed_at = None
+            self.cond.notify_all()
+
+    def _reclaim_expired(self) -> None:
+        now = time.time()
+        for s in self.sessions.values():
+            if s.borrowed_at is not None and now - s.borrowed_at > LEASE_TIMEOUT:
+                logging.warning("Broker: borrower of %s timed out – recycling", s.key)
+                s.close()
+                s.borrowed_at = None
+
+
+class _Handler(socketserver.StreamRequestHandler):
+    def handle(self):
+        line = self.rfile.readline()
+        if not line:
+            return
+        broker: BrowserBroker = self.server.broker
+        try:
+            req = json.loads(line)
+            op = req.get("op")
+            if op == "borrow":
+                reply = broker.borrow(req)
+            elif op == "return":
+                reply = broker.give_back(req["id"], req.get("healthy", True))
+            elif op == "status":
+                reply = broker.status()
+            elif op == "shutdown":
+                reply = {"ok": True}
+                threading.Thread(target=self.server.shutdown, daemon=True).start()
+            else:
+                reply = {"ok": False, "error": f"unknown op '{op}'"}
+        except Exception as e:
+            reply = {"ok": False, "error": str(e)}
+        self.wfile.write((json.dumps(reply) + "\n").encode("utf-8"))
+
+
+class BrokerServer(socketserver.ThreadingTCPServer):
+    daemon_threads = True
+    allow_reuse_address = True
+
+    def __init__(self, broker: BrowserBroker, host: str = BROKER_HOST, port: int = BROKER_PORT):
+        super().__init__((host, port), _Handler)
+        self.broker = broker
+
+
+def serve(host: str = BROKER_HOST, port: int = BROKER_PORT, launcher: Callable = _launch_chrome) -> None:
+    broker = BrowserBroker(launcher)
+    server = BrokerServer(broker, host, port)
+    stop = threading.Event()
+
+    def _sweeper():
+        while not stop.wait(HEALTH_INTERVAL):
+            broker.health_sweep()
+
+    threading.Thread(target=_sweeper, daemon=True).start()
+    logging.info("Browser broker listening on %s:%d", host, port)
+    try:
+        server.serve_forever()
+    finally:
+        stop.set()
+        server.server_close()
+        broker.close_all()
+
+
+# ─────────────────────────────────────────────── CLI
+def main():
+    parser = argparse.ArgumentParser(description="Warm Chrome session broker for the uploaders")
+    parser.add_argument("command", choices=["serve", "status", "shutdown"])
+    parser.add_argument("--port", type=int, default=BROKER_PORT)
+    args = parser.parse_args()
+
+    logging.basicConfig(format="%(asctime)s [%(levelname)s] %(message)s", level=logging.INFO)
+    if args.command == "serve":
+        serve(port=args.port)
+        return
+    reply = _request({"op": args.command}, timeout=5, port=args.port)
+    if reply is None:
+        print("❌ Broker is not running.")
+    else:
+        print(json.dumps(reply, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,388 @@
+"""
+media_preflight.py
+~~~~~~~~~~~~~~~~~~
+Check a clip against a platform's upload spec before any browser work, and
+fix what can be fixed – as cheaply as possible.
+
+``PLATFORM_SPECS`` lists, per uploader ``PLATFORM`` key, what the platform
+ingests without slow reprocessing or rejection: container, video codec and
+profile, pixel format, frame rate, resolution, duration, video bitrate,
+audio codec / sample rate and integrated loudness. Every MP4 must also be
+*faststart* (``moov`` atom before ``mdat``) so the platform can start
+processing before the last byte arrives.
+
+Each problem found is classed by the cheapest fix that clears it:
+
+* ``remux``  – stream copy into MP4 with ``+faststart`` (no re-encode)
+* ``audio``  – copy the video, re-encode only the audio (AAC, loudnorm)
+* ``video``  – transcode the video (H.264 High, yuv420p, capped fps / size / bitrate)
+* ``reject`` – can't be fixed here (duration out of range, no video) → ``PreflightError``
+
+The conforming file is cached at ``<clip folder>/.preflight/<recipe>/<original name>.mp4``
+next to a ``<name>.manifest.json`` naming the source's size + mtime. Platforms that need
+the same fix share one output, the original file name is kept (uploaders
+match on it), and the hidden sub-folder stays out of the uploaders' media
+lookup and upload-journal fingerprint.
+
+Example
+-------
+from uploaders.media_preflight.media_preflight import preflight, check
+
+result = preflight(r"D:\\...\\Clips\\20250516_021130\\clip.mp4", "tiktok")
+result.path        # original if it conforms, else the cached conforming copy
+result.issues      # [Issue(field="faststart", found=False, expected=True, fix="remux"), ...]
+result.action      # "none" | "unchecked" | "cached" | "remux" | "audio" | "video"
+
+CLI
+---
+python media_preflight.py <file_or_clip_folder> [--platform youtube ...] [--fix]
+"""
+from __future__ import annotations
+
+import argparse
+import hashlib
+import json
+import logging
+import os
+import re
+import struct
+import subprocess
+import sys
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional, Tuple
+
+Modules_Dir = "D:\\2025\\Projects\\Presence\\Presence0.1\\Resources\\Internal_Modules"
+sys.path.insert(0, Modules_Dir)
+from utilities.media_probe.media_probe import find_ffmpeg_tool, probe_media
+
+PREFLIGHT_DIR = ".preflight"
+MANIFEST_SUFFIX = ".manifest.json"
+MP4_EXTENSIONS = (".mp4", ".mov", ".m4v")
+VIDEO_EXTENSIONS = MP4_EXTENSIONS + (".avi", ".mkv", ".webm")
+FIX_ORDER = ("remux", "audio", "video")          # cheapest first; a later fix includes the earlier ones
+
+# ─────────────────────────────────────────────── spec table
+_SHORT_FORM = {
+    "containers": MP4_EXTENSIONS,
+    "video_codecs": ("h264", "hevc"),
+    "profiles": ("Constrained Baseline", "Baseline", "Main", "High"),      # h264 only
+    "pix_fmts": ("yuv420p", "yuvj420p"),
+    "max_fps": 60,
+    "max_long_side": 1920,
+    "max_short_side": 1080,
+    "min_duration": 3,
+    "max_duration": 180,
+    "max_video_kbps": 16000,
+    "audio_codecs": ("aac",),
+    "sample_rates": (44100, 48000),
+    "loudness": (-14.0, 3.0),          # integrated LUFS target, tolerance
+    "faststart": True,
+}
+
+PLATFORM_SPECS: Dict[str, dict] = {
+    "youtube": {**_SHORT_FORM, "max_duration": 180, "video_codecs": ("h264", "hevc", "vp9", "av1"),
+                "max_long_side": 3840, "max_short_side": 2160, "max_video_kbps": 45000, "min_duration": 1},
+    "tiktok": {**_SHORT_FORM, "max_duration": 600},
+    "instagram": {**_SHORT_FORM, "max_duration": 900, "max_video_kbps": 25000},
+    "instagram_story": {**_SHORT_FORM, "max_duration": 60, "min_duration": 1},
+    "facebook": {**_SHORT_FORM, "max_duration": 90, "max_video_kbps": 25000},
+}
+
+# transcode targets – what `video` / `audio` fixes produce
+TARGET_VIDEO = {"codec": "libx264", "profile": "high", "pix_fmt": "yuv420p", "crf": 20, "preset": "medium"}
+TARGET_AUDIO = {"codec": "aac", "bitrate": "192k", "sample_rate": 48000}
+
+
+class PreflightError(RuntimeError):
+    """The clip can't be made to conform (wrong duration, no video stream, ffmpeg failure)."""
+
+
+@dataclass
+class Issue:
+    field: str
+    found: object
+    expected: object
+    fix: str                     # "remux" | "audio" | "video" | "reject"
+
+    def __str__(self) -> str:
+        return f"{self.field}: {self.found!r} (expected {self.expected}) → {self.fix}"
+
+
+@dataclass
+class PreflightResult:
+    source: str
+    path: str                                   # what to upload
+    platform: str
+    issues: List[Issue] = field(default_factory=list)
+    action: str = "none"                         # "none" | "unchecked" | "cached" | "remux" | "audio" | "video"
+
+
+# ─────────────────────────────────────────────── inspection
+def is_faststart(path: str) -> Optional[bool]:
+    """True if the top-level ``moov`` box comes before ``mdat`` (None if not an ISO-BMFF file)."""
+    try:
+        with open(path, "rb") as f:
+            end = os.fstat(f.fileno()).st_size
+            pos = 0
+            while pos + 8 <= end:
+                f.seek(pos)
+                size, box = struct.unpack(">I4s", f.read(8))
+                if size == 1:
+                    size = struct.unpack(">Q", f.read(8))[0]
+                elif size == 0:
+                    size = end - pos
+                if box == b"moov":
+                    return True
+                if box == b"mdat":
+                    return False
+                if size < 8:
+                    return None
+                pos += size
+    except (OSError, struct.error):
+        pass
+    return None
+
+
+def measure_loudness(path: str) -> Optional[float]:
+    """Integrated loudness (LUFS) via ffmpeg's ebur128 filter – one decode of the audio only."""
+    ffmpeg = find_ffmpeg_tool("ffmpeg")
+    if not ffmpeg:
+        return None
+    try:
+        err = subprocess.run(
+            [ffmpeg, "-hide_banner", "-nostats", "-i", path, "-map", "0:a:0", "-vn",
+             "-af", "ebur128", "-f", "null", "-"],
+            capture_output=True, text=True, encoding="utf-8", errors="replace",
+        ).stderr
+    except OSError:
+        return None
+    found = re.findall(r"I:\s+(-?[\d.]+|-inf) LUFS", err)
+    if not found or found[-1] == "-inf":
+        return None
+    return float(found[-1])
+
+
+def _stream(info: dict, kind: str) -> Optional[dict]:
+    return next((s for s in info["streams"] if s.get("codec_type") == kind), None)
+
+
+def _video_kbps(path: str, info: dict) -> Optional[float]:
+    video = _stream(info, "video") or {}
+    if video.get("bit_rate"):
+        return int(video["bit_rate"]) / 1000
+    if info["duration"]:               # whole-file rate as an upper bound
+        return os.path.getsize(path) * 8 / info["duration"] / 1000
+    return None
+
+
+def check(path: str, platform: str, info: Optional[dict] = None,
+          loudness: Optional[float] = None) -> List[Issue]:
+    """Every way *path* misses *platform*'s spec, each with its cheapest fix."""
+    spec = PLATFORM_SPECS[platform]
+    info = info or probe_media(path)
+    if info is None:
+        return [Issue("video_stream", None, "present", "reject")]
+
+    issues: List[Issue] = []
+    ext = os.path.splitext(path)[1].lower()
+    if ext not in spec["containers"]:
+        issues.append(Issue("container", ext, spec["containers"], "remux"))
+    elif spec["faststart"] and is_faststart(path) is False:
+        issues.append(Issue("faststart", False, True, "remux"))
+
+    duration = info["duration"] or 0
+    if not spec["min_duration"] <= duration <= spec["max_duration"]:
+        issues.append(Issue("duration", round(duration, 2),
+                            f"{spec['min_duration']}–{spec['max_duration']} s", "reject"))
+
+    video = _stream(info, "video") or {}
+    if info["video_codec"] not in spec["video_codecs"]:
+        issues.append(Issue("video_codec", info["video_codec"], spec["video_codecs"], "video"))
+    elif info["video_codec"] == "h264" and video.get("profile") and video["profile"] not in spec["profiles"]:
+        issues.append(Issue("profile", video["profile"], spec["profiles"], "video"))
+    if info["pix_fmt"] not in spec["pix_fmts"]:
+        issues.append(Issue("pix_fmt", info["pix_fmt"], spec["pix_fmts"], "video"))
+    if info["fps"] and info["fps"] > spec["max_fps"] + 0.01:
+        issues.append(Issue("fps", round(info["fps"], 3), f"≤ {spec['max_fps']}", "video"))
+    long_side, short_side = max(info["width"], info["height"]), min(info["width"], info["height"])
+    if long_side > spec["max_long_side"] or short_side > spec["max_short_side"]:
+        issues.append(Issue("resolution", f"{info['width']}x{info['height']}",
+                            f"≤ {spec['max_long_side']}x{spec['max_short_side']}", "video"))
+    kbps = _video_kbps(path, info)
+    if kbps and kbps > spec["max_video_kbps"]:
+        issues.append(Issue("video_kbps", round(kbps), f"≤ {spec['max_video_kbps']}", "video"))
+
+    audio = _stream(info, "audio")
+    if audio is not None:
+        if info["audio_codec"] not in spec["audio_codecs"]:
+            issues.append(Issue("audio_codec", info["audio_codec"], spec["audio_codecs"], "audio"))
+        if audio.get("sample_rate") and int(audio["sample_rate"]) not in spec["sample_rates"]:
+            issues.append(Issue("sample_rate", int(audio["sample_rate"]), spec["sample_rates"], "audio"))
+        if spec.get("loudness") and loudness is not None:
+            target, tolerance = spec["loudness"]
+            if abs(loudness - target) > tolerance:
+                issues.append(Issue("loudness", round(loudness, 1), f"{target} ± {tolerance} LUFS", "audio"))
+    return issues
+
+
+# ─────────────────────────────────────────────── fixing
+def _recipe(issues: List[Issue], info: dict, spec: dict) -> Tuple[str, List[str]]:
+    """(fix level, ffmpeg output args) for the cheapest fix that clears every issue."""
+    level = max((i.fix for i in issues), key=FIX_ORDER.index)
+    audio_fix = level == "audio" or (level == "video" and any(i.fix == "audio" for i in issues))
+    args: List[str] = ["-map", "0:v:0", "-map", "0:a:0?", "-map_metadata", "0"]
+
+    if level == "video":
+        filters = []
+        scale = min(1.0, spec["max_long_side"] / max(info["width"], info["height"]),
+                    spec["max_short_side"] / min(info["width"], info["height"]))
+        if scale < 1.0:
+            filters.append(f"scale=trunc(iw*{scale:.6f}/2)*2:trunc(ih*{scale:.6f}/2)*2")
+        if info["fps"] and info["fps"] > spec["max_fps"] + 0.01:
+            filters.append(f"fps={spec['max_fps']}")
+        filters.append(f"format={TARGET_VIDEO['pix_fmt']}")
+        kbps = spec["max_video_kbps"]
+        args += ["-c:v", TARGET_VIDEO["codec"], "-profile:v", TARGET_VIDEO["profile"],
+                 "-preset", TARGET_VIDEO["preset"], "-crf", str(TARGET_VIDEO["crf"]),
+                 "-maxrate", f"{kbps}k", "-bufsize", f"{kbps * 2}k", "-vf", ",".join(filters)]
+    else:
+        args += ["-c:v", "copy"]
+
+    if audio_fix:
+        args += ["-c:a", TARGET_AUDIO["codec"], "-b:a", TARGET_AUDIO["bitrate"],
+                 "-ar", str(TARGET_AUDIO["sample_rate"])]
+        if any(i.field == "loudness" for i in issues):
+            target, _ = spec["loudness"]
+            args += ["-af", f"loudnorm=I={target}:TP=-1.5:LRA=11"]
+    else:
+        args += ["-c:a", "copy"]
+    args += ["-movflags", "+faststart"]
+    return level, args
+
+
+def _source_key(path: str) -> list:
+    st = os.stat(path)
+    return [st.st_size, st.st_mtime_ns]
+
+
+def _cached_loudness(path: str) -> Optional[float]:
+    """ebur128 is a full audio decode, so keep the result per source in .preflight/loudness.json."""
+    cache_path = os.path.join(os.path.dirname(path), PREFLIGHT_DIR, "loudness.json")
+    name, key = os.path.basename(path), _source_key(path)
+    try:
+        with open(cache_path, "r", encoding="utf-8") as f:
+            cache = json.load(f)
+    except (OSError, ValueError):
+        cache = {}
+    entry = cache.get(name)
+    if entry and entry.get("source") == key:
+        return entry.get("lufs")
+
+    lufs = measure_loudness(path)
+    cache[name] = {"source": key, "lufs": lufs}
+    os.makedirs(os.path.dirname(cache_path), exist_ok=True)
+    tmp = f"{cache_path}.{os.getpid()}.tmp"
+    with open(tmp, "w", encoding="utf-8") as f:
+        json.dump(cache, f, indent=1)
+    os.replace(tmp, cache_path)
+    return lufs
+
+
+def _run_ffmpeg(source: str, out_path: str, args: List[str]) -> None:
+    ffmpeg = find_ffmpeg_tool("ffmpeg")
+    if not ffmpeg:
+        raise PreflightError("ffmpeg not found – can't conform media")
+    tmp = f"{os.path.splitext(out_path)[0]}.{os.getpid()}.tmp.mp4"
+    try:
+        proc = subprocess.run([ffmpeg, "-hide_banner", "-loglevel", "error", "-y", "-i", source, *args, tmp],
+                              capture_output=True, text=True, encoding="utf-8", errors="replace")
+        if proc.returncode != 0:
+            raise PreflightError(f"ffmpeg failed: {proc.stderr.strip()[-500:]}")
+        os.replace(tmp, out_path)            # concurrent uploaders of the same clip both end up with one file
+    finally:
+        if os.path.exists(tmp):
+            os.remove(tmp)
+
+
+def preflight(path: str, platform: str, fix: bool = True) -> PreflightResult:
+    """
+    Check *path* for *platform* and return what to upload. With ``fix`` the
+    cheapest conforming copy is produced (or reused from the cache); raises
+    ``PreflightError`` for issues that can't be fixed.
+    """
+    spec = PLATFORM_SPECS[platform]
+    if not find_ffmpeg_tool("ffprobe"):
+        logging.warning("ffprobe not found – %s uploaded unchecked.", os.path.basename(path))
+        return PreflightResult(path, path, platform, action="unchecked")
+    info = probe_media(path)
+    loudness = None
+    if info is not None and info["audio_codec"] and spec.get("loudness"):
+        loudness = _cached_loudness(path)
+    issues = check(path, platform, info, loudness)
+    result = PreflightResult(path, path, platform, issues)
+
+    rejected = [i for i in issues if i.fix == "reject"]
+    if rejected:
+        raise PreflightError(f"{os.path.basename(path)} can't be uploaded to {platform}: "
+                             + "; ".join(map(str, rejected)))
+    if not issues or not fix:
+        return result
+
+    level, args = _recipe(issues, info, spec)
+    recipe_id = hashlib.sha1(json.dumps(args).encode("utf-8")).hexdigest()[:10]
+    out_dir = os.path.join(os.path.dirname(path), PREFLIGHT_DIR, recipe_id)
+    out_path = os.path.join(out_dir, os.path.splitext(os.path.basename(path))[0] + ".mp4")
+    manifest_path = os.path.splitext(out_path)[0] + MANIFEST_SUFFIX
+    manifest = {"source": os.path.basename(path), "source_key": _source_key(path),
+                "level": level, "args": args}
+
+    try:
+        with open(manifest_path, "r", encoding="utf-8") as f:
+            cached = json.load(f)
+        if cached.get("source_key") == manifest["source_key"] and cached.get("args") == args \
+                and os.path.exists(out_path):
+            result.path, result.action = out_path, "cached"
+            return result
+    except (OSError, ValueError):
+        pass
+
+    os.makedirs(out_dir, exist_ok=True)
+    _run_ffmpeg(path, out_path, args)
+    with open(manifest_path, "w", encoding="utf-8") as f:
+        json.dump({**manifest, "issues": [str(i) for i in issues]}, f, indent=1, ensure_ascii=False)
+    result.path, result.action = out_path, level
+    return result
+
+
+# ─────────────────────────────────────────────── CLI
+def main():
+    parser = argparse.ArgumentParser(description="Check / conform clips against platform upload specs")
+    parser.add_argument("target", help="video file or clip folder")
+    parser.add_argument("--platform", action="append", choices=sorted(PLATFORM_SPECS),
+                        help="repeatable; default: all platforms")
+    parser.add_argument("--fix", action="store_true", help="write conforming copies to .preflight/")
+    args = parser.parse_args()
+
+    if os.path.isdir(args.target):
+        files = [os.path.join(args.target, f) for f in sorted(os.listdir(args.target))
+                 if f.lower().endswith(VIDEO_EXTENSIONS)]
+    else:
+        files = [args.target]
+
+    for path in files:
+        for platform in args.platform or sorted(PLATFORM_SPECS):
+            try:
+                result = preflight(path, platform, fix=args.fix)
+            except PreflightError as e:
+                print(f"✗ {platform:<16} {e}")
+                continue
+            state = "ok" if not result.issues else result.action if args.fix else "needs fixing"
+            print(f"{'✓' if not result.issues else '•'} {platform:<16} {os.path.basename(path)}: {state}")
+            for issue in result.issues:
+                print(f"      {issue}")
+            if result.path != path:
+                print(f"      → {result.path}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,696 @@
+"""
+platform_standin.py
+~~~~~~~~~~~~~~~~~~~
+Local stand-in for the upload flows of YouTube Studio, TikTok, Instagram
+(post + mobile story) and Facebook Reels, for trying uploader changes
+offline and benchmarking them end to end on one machine.
+
+Each page reproduces the part of the real flow our uploaders drive – file
+picker, caption / title boxes, progress bar, processing state, Next / Share /
+Post buttons – using the *same selectors* the uploader classes target, and
+talks to a small API with the same shape as the real traffic where an
+uploader reads it (YouTube's resumable upload + creator status polls, see
+studio_network.py). Knobs:
+
+* ``latency_ms`` / ``jitter_ms`` – added to every page and API response
+* ``upload_kbps``               – throttle the media upload (0 = unthrottled)
+* ``processing_seconds``        – server-side processing after the upload
+* ``fail_rate``                 – chance any upload / status / publish call answers 500
+* ``fail_steps``                – steps that always fail: "upload", "processing", "publish"
+
+The server records what was actually published (``/_standin/state``), so a
+run can tell an uploader that *claims* success from a post that exists.
+
+Pointing the uploaders at it needs no uploader changes: with
+``PRESENCE_STANDIN=http://127.0.0.1:8800`` set, run_chrome_beta launches a
+throw-away Chrome (no profile, no broker) whose ``get()`` goes through
+``standin_url()``, which maps the platform hosts onto the stand-in.
+
+Example
+-------
+from uploaders.platform_standin.platform_standin import StandinConfig, StandinServer
+
+server = StandinServer(StandinConfig(latency_ms=150, processing_seconds=4)).start(8800)
+os.environ["PRESENCE_STANDIN"] = server.url
+...                                          # run uploaders
+server.posts()                               # [{"platform": "tiktok", "fields": {...}, ...}]
+server.shutdown()
+
+CLI
+---
+python platform_standin.py serve [--port 8800] [--latency-ms 150] [--fail-rate 0.1] [--fail-step publish] ...
+python platform_standin.py bench <clip_folder> youtube tiktok [--runs 5] [--visible] [same knobs]
+"""
+from __future__ import annotations
+
+import argparse
+import json
+import logging
+import os
+import random
+import shutil
+import statistics
+import sys
+import tempfile
+import threading
+import time
+import uuid
+from dataclasses import asdict, dataclass, field
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, List, Optional, Tuple
+from urllib.parse import parse_qs, urlsplit
+
+from uploaders.upload_spans.upload_spans import percentile
+
+STANDIN_ENV = "PRESENCE_STANDIN"
+DEFAULT_PORT = 8800
+UPLOADER_ROOT_DIR = "D:\\2025\\Projects\\Presence\\Presence0.1\\Uploader"
+FAIL_STEPS = ("upload", "processing", "publish")
+
+# real host → stand-in path prefix
+HOSTS = {
+    "studio.youtube.com": "youtube",
+    "www.youtube.com": "youtube",
+    "youtube.com": "youtube",
+    "youtu.be": "youtube",
+    "www.tiktok.com": "tiktok",
+    "www.instagram.com": "instagram",
+    "business.facebook.com": "facebook",
+    "www.facebook.com": "facebook",
+}
+
+
+def standin_url(url: str, base: Optional[str] = None) -> str:
+    """Map a platform URL onto the stand-in named by `base` / $PRESENCE_STANDIN (unchanged if unset)."""
+    base = base or os.environ.get(STANDIN_ENV)
+    if not base:
+        return url
+    parts = urlsplit(url)
+    prefix = HOSTS.get(parts.hostname or "")
+    if prefix is None:
+        return url
+    return f"{base.rstrip('/')}/{prefix}{parts.path or '/'}" + (f"?{parts.query}" if parts.query else "")
+
+
+@dataclass
+class StandinConfig:
+    latency_ms: float = 0.0
+    jitter_ms: float = 0.0
+    upload_kbps: float = 0.0
+    processing_seconds: float = 5.0
+    fail_rate: float = 0.0
+    fail_steps: Tuple[str, ...] = ()
+    seed: Optional[int] = None
+
+
+# ─────────────────────────────────────────────── pages
+_COMMON_HEAD = """<!doctype html>
+<html><head><meta charset="utf-8"><title>%(title)s – stand-in</title>
+<style>
+body { font-family: sans-serif; margin: 24px; }
+[hidden] { display: none !important; }
+[role=button], button, ytcp-button { display: inline-block; padding: 6px 14px; margin: 4px; border: 1px solid #888;
+                                     border-radius: 4px; cursor: pointer; background: #eee; }
+[role=dialog] { border: 1px solid #444; padding: 16px; margin-top: 12px; }
+[contenteditable] { border: 1px solid #aaa; min-height: 2em; padding: 4px; margin: 4px 0; }
+[role=progressbar] { display: block; height: 8px; background: #ddd; margin: 8px 0; }
+#error { color: #c00; }
+</style></head><body>
+<div id="error"></div>
+"""
+
+# fetch helpers shared by every page; the upload / status URLs match studio_network's patterns
+_COMMON_JS = r"""
+<script>
+const P = location.pathname.split('/')[1];
+async function api(path, opts) {
+  const r = await fetch('/' + P + path, opts);
+  if (!r.ok) throw new Error(path + ': HTTP ' + r.status);
+  return r.json();
+}
+function fail(e) { document.getElementById('error').textContent = 'Something went wrong: ' + e.message; throw e; }
+function setProgress(bar, pct) { bar.setAttribute('aria-valuenow', pct); bar.style.background =
+  'linear-gradient(90deg,#3a3 ' + pct + '%,#ddd ' + pct + '%)'; }
+async function uploadFile(file, bar) {
+  const d = await api('/upload/?upload_id=' + Date.now(), {method: 'PUT', body: file,
+                      headers: {'X-Goog-Upload-Command': 'upload, finalize', 'X-Standin-Name': encodeURIComponent(file.name)}});
+  if (bar) setProgress(bar, 100);
+  return d.videoId;
+}
+function waitProcessing(id, bar) {
+  return new Promise((resolve, reject) => {
+    const tick = async () => {
+      let v;
+      try {
+        v = (await api('/youtubei/v1/creator/get_creator_videos', {method: 'POST',
+                       body: JSON.stringify({videoIds: [id]})})).videos[0];
+      } catch (e) { setTimeout(tick, 1000); return; }       // status polls are retried, like the real clients
+      const pp = v.processingProgress;
+      if (bar) setProgress(bar, pp.percentComplete);
+      if (pp.processingStatus.endsWith('SUCCEEDED')) resolve(v);
+      else if (pp.processingStatus.endsWith('FAILED')) reject(new Error('processing failed'));
+      else setTimeout(tick, 500);
+    };
+    tick();
+  });
+}
+function publish(fields) {
+  return api('/api/publish', {method: 'POST', body: JSON.stringify(fields)});
+}
+function el(html) { const t = document.createElement('template'); t.innerHTML = html.trim(); return t.content.firstChild; }
+</script>
+"""
+
+_YOUTUBE_PAGE = r"""
+<h1>Channel content</h1>
+<ytcp-button id="upload-icon" role="button">Create</ytcp-button>
+<div id="dialog" role="dialog" hidden>
+  <h2 id="step-title">Details</h2>
+  <div id="details">
+    <div id="textbox" contenteditable="true" aria-label="Add a title"></div>
+    <div id="textbox" contenteditable="true" aria-label="Tell viewers about your video"></div>
+  </div>
+  <div id="progress" role="progressbar" aria-valuenow="0" aria-valuemax="100"></div>
+  <div id="buttons"></div>
+</div>
+<div id="published" hidden><h2>Video published</h2><a id="share-url"></a></div>
+<script>
+const STEPS = ['Details', 'Video elements', 'Checks', 'Visibility'];
+let step = 0, videoId = window.DRAFT_ID || null;
+const dialog = document.getElementById('dialog'), buttons = document.getElementById('buttons');
+const boxes = () => document.querySelectorAll('#details [contenteditable]');
+
+function showNext() {
+  buttons.innerHTML = '';
+  if (step < STEPS.length - 1) {
+    buttons.appendChild(el('<ytcp-button id="next-button" role="button">Next</ytcp-button>'))
+      .addEventListener('click', () => { step++; document.getElementById('step-title').textContent = STEPS[step]; showNext(); });
+  } else {
+    buttons.appendChild(el('<ytcp-button id="done-button" role="button">Publish</ytcp-button>'))
+      .addEventListener('click', async () => {
+        try {
+          const [title, description] = [...boxes()].map(b => b.innerText);
+          const r = await publish({videoId, title, description});
+          dialog.hidden = true;
+          document.getElementById('published').hidden = false;
+          document.getElementById('share-url').textContent = r.url;
+        } catch (e) { fail(e); }
+      });
+  }
+}
+
+document.getElementById('upload-icon').addEventListener('click', () => {
+  if (document.querySelector('input[type=file]')) return;
+  const input = dialog.insertBefore(el('<input type="file" accept="video/*">'), dialog.firstChild);
+  dialog.hidden = false;
+  input.addEventListener('change', async () => {
+    const file = input.files[0], bar = document.getElementById('progress');
+    boxes()[0].innerText = file.name.replace(/\.[^.]+$/, '');
+    try {
+      videoId = await uploadFile(file, bar);
+      setProgress(bar, 0);
+      await waitProcessing(videoId, bar);
+      showNext();
+    } catch (e) { fail(e); }
+  });
+});
+
+if (videoId) { dialog.hidden = false; showNext(); }            // /video/<id>/edit – draft wizard
+</script>
+"""
+
+_TIKTOK_PAGE = r"""
+<h1>Upload video</h1>
+<input type="file" accept="video/*" id="file">
+<div id="editor" hidden>
+  <div class="DraftEditor-root"><div contenteditable="true" class="notranslate public-DraftEditor-content" role="combobox">
+    <div data-contents="true"><div><span data-text="true"></span></div></div>
+  </div></div>
+  <div id="progress" role="progressbar" aria-valuenow="0" aria-valuemax="100"></div>
+  <button id="post" disabled>Post</button>
+</div>
+<div id="done" hidden><h2>Your video has been uploaded</h2><a id="share-url"></a></div>
+<script>
+const input = document.getElementById('file'), post = document.getElementById('post');
+let videoId = null;
+input.addEventListener('change', async () => {
+  const file = input.files[0], bar = document.getElementById('progress');
+  document.getElementById('editor').hidden = false;
+  document.querySelector('[data-text]').textContent = file.name.replace(/\.[^.]+$/, '');
+  try {
+    videoId = await uploadFile(file, bar);
+    await waitProcessing(videoId, bar);
+    post.disabled = false;
+  } catch (e) { fail(e); }
+});
+post.addEventListener('click', async () => {
+  try {
+    const r = await publish({videoId, description: document.querySelector('.public-DraftEditor-content').innerText});
+    document.getElementById('editor').hidden = true;
+    document.getElementById('done').hidden = false;
+    document.getElementById('share-url').textContent = r.url;
+  } catch (e) { fail(e); }
+});
+</script>
+"""
+
+_INSTAGRAM_PAGE = r"""
+<nav>
+  <div role="link"><svg aria-label="Home" width="24" height="24"><rect width="24" height="24"></rect></svg></div>
+  <div role="link"><span>Create</span></div>
+</nav>
+<div id="create-menu" hidden><span role="link">Post</span> <span role="link" id="story">Story</span></div>
+<div id="post-dialog" role="dialog" aria-label="Create new post" hidden></div>
+<div id="story-panel" hidden></div>
+<script>
+const dlg = document.getElementById('post-dialog');
+let mediaId = null, uploading = null;
+
+function startUpload(file, bar) {
+  uploading = uploadFile(file, bar).then(id => { mediaId = id; return waitProcessing(id, bar); });
+  return uploading;
+}
+
+// ── desktop post: Create → Select from computer → crop → Edit → caption → Share
+document.querySelector('nav span').addEventListener('click', () => {
+  dlg.hidden = false;
+  dlg.innerHTML = '<h2>Create new post</h2><button>Select from computer</button><input type="file" accept="image/*,video/*">';
+  const input = dlg.querySelector('input');
+  dlg.querySelector('button').addEventListener('click', () => input.click());
+  input.addEventListener('change', () => {
+    dlg.setAttribute('aria-label', 'Crop');
+    dlg.innerHTML = '<h2>Crop</h2><div role="progressbar" aria-valuenow="0" aria-valuemax="100"></div>' +
+      '<div class="x9f619 xjbqb8w"><svg aria-label="Select crop" width="16" height="16"><rect width="16" height="16"></rect></svg></div>' +
+      '<div id="crop-menu" hidden><div role="button" class="crop-option"><div><span>' +
+      '<svg aria-label="Crop portrait icon" width="16" height="16"><rect width="16" height="16"></rect></svg></span></div></div></div>' +
+      '<div role="button" id="next-crop">Next</div>';
+    startUpload(input.files[0], dlg.querySelector('[role=progressbar]')).catch(fail);
+    dlg.querySelector('.x9f619').addEventListener('click', () => dlg.querySelector('#crop-menu').hidden = false);
+    dlg.querySelector('.crop-option').addEventListener('click', () => dlg.querySelector('#crop-menu').hidden = true);
+    dlg.querySelector('#next-crop').addEventListener('click', () => {
+      dlg.setAttribute('aria-label', 'Edit');
+      dlg.innerHTML = '<h2>Edit</h2><div role="button" id="next-edit">Next</div>';
+      dlg.querySelector('#next-edit').addEventListener('click', () => {
+        dlg.setAttribute('aria-label', 'Create new post');
+        dlg.innerHTML = '<h2>Create new post</h2>' +
+          '<div aria-label="Write a caption..." role="textbox" contenteditable="true"></div>' +
+          '<div role="button" id="share">Share</div>';
+        dlg.querySelector('#share').addEventListener('click', async () => {
+          dlg.setAttribute('aria-label', 'Sharing');
+          dlg.innerHTML = '<h2>Sharing</h2><div role="progressbar" aria-valuenow="0" aria-valuemax="100"></div>';
+          const caption = window.__caption || '';
+          try {
+            await uploading;
+            await publish({mediaId, caption, kind: 'post'});
+            dlg.innerHTML = '<h2>Your reel has been shared.</h2><img alt="Animated checkmark" width="32" height="32">';
+          } catch (e) { fail(e); }
+        });
+        dlg.querySelector('[role=textbox]').addEventListener('input', e => window.__caption = e.target.innerText);
+      });
+    });
+  });
+});
+
+// ── mobile story: Home → Story → file → Add to your story
+document.querySelector('svg[aria-label=Home]').addEventListener('click', () => {
+  document.getElementById('create-menu').hidden = false;
+});
+document.getElementById('story').addEventListener('click', () => {
+  const panel = document.getElementById('story-panel');
+  panel.hidden = false;
+  panel.innerHTML = '<input type="file" accept="image/*,video/*"><div role="progressbar" aria-valuenow="0" aria-valuemax="100"></div>';
+  const input = panel.querySelector('input');
+  input.addEventListener('change', async () => {
+    try {
+      await startUpload(input.files[0], panel.querySelector('[role=progressbar]'));
+      const btn = panel.appendChild(el('<button><span>Add to your story</span></button>'));
+      btn.addEventListener('click', async () => {
+        try {
+          await publish({mediaId, kind: 'story'});
+          panel.innerHTML = '<h2>Added to your story</h2>';
+        } catch (e) { fail(e); }
+      });
+    } catch (e) { fail(e); }
+  });
+});
+</script>
+"""
+
+_FACEBOOK_PAGE = r"""
+<h1>Published posts</h1>
+<div role="button" class="x1g2r6go create-reel"><i style="background-image: url(data:,); display: inline-block; width: 12px; height: 12px"></i> Create reel</div>
+<div id="composer" hidden>
+  <div role="button" class="x1g2r6go add-video"><div style="mask-image: url(data:,); display: inline-block; width: 12px; height: 12px"></div> Add video</div>
+  <div id="progress" role="progressbar" aria-valuenow="0" aria-valuemax="100"></div>
+  <div class="_5rp7"><div role="textbox" contenteditable="true" aria-label="Describe your reel"></div></div>
+  <div id="buttons"></div>
+</div>
+<div id="done" hidden><h2>Your reel was published</h2><a id="share-url"></a></div>
+<script>
+const composer = document.getElementById('composer'), buttons = document.getElementById('buttons');
+let mediaId = null, stage = 0;
+
+function showButton() {
+  const label = stage < 2 ? 'Next' : 'Share';
+  buttons.innerHTML = '';
+  buttons.appendChild(el('<div role="button"><div>' + label + '</div></div>')).addEventListener('click', async () => {
+    if (++stage < 3) { showButton(); return; }
+    try {
+      const r = await publish({mediaId, description: composer.querySelector('[role=textbox]').innerText});
+      composer.hidden = true;
+      document.getElementById('done').hidden = false;
+      document.getElementById('share-url').textContent = r.url;
+    } catch (e) { fail(e); }
+  });
+}
+
+document.querySelector('.create-reel').addEventListener('click', () => { composer.hidden = false; });
+document.querySelector('.add-video').addEventListener('click', () => {
+  const input = document.body.appendChild(el('<input type="file" accept="video/*" style="display:none">'));
+  input.addEventListener('change', async () => {
+    const bar = document.getElementById('progress');
+    try {
+      mediaId = await uploadFile(input.files[0], bar);
+      await waitProcessing(mediaId, bar);
+      showButton();
+    } catch (e) { fail(e); }
+  });
+  input.click();
+});
+</script>
+"""
+
+PAGES = {
+    "youtube": ("YouTube Studio", _YOUTUBE_PAGE),
+    "tiktok": ("TikTok Studio", _TIKTOK_PAGE),
+    "instagram": ("Instagram", _INSTAGRAM_PAGE),
+    "facebook": ("Meta Business Suite", _FACEBOOK_PAGE),
+}
+
+
+# ─────────────────────────────────────────────── server
+class StandinServer:
+    def __init__(self, config: Optional[StandinConfig] = None):
+        self.config = config or StandinConfig()
+        self._rng = random.Random(self.config.seed)
+        self._lock = threading.Lock()
+        self.media: Dict[str, dict] = {}
+        self.published: List[dict] = []
+        self.requests: Dict[str, int] = {}
+        self.failures: Dict[str, int] = {}
+        self._httpd: Optional[ThreadingHTTPServer] = None
+
+    # ---------- lifecycle ----------
+    def start(self, port: int = DEFAULT_PORT, host: str = "127.0.0.1") -> "StandinServer":
+        self._httpd = ThreadingHTTPServer((host, port), self._handler())
+        self._httpd.daemon_threads = True
+        threading.Thread(target=self._httpd.serve_forever, daemon=True).start()
+        logging.info("Platform stand-in on %s (%s)", self.url, asdict(self.config))
+        return self
+
+    @property
+    def url(self) -> str:
+        host, port = self._httpd.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def shutdown(self) -> None:
+        if self._httpd:
+            self._httpd.shutdown()
+            self._httpd.server_close()
+
+    # ---------- state ----------
+    def posts(self, platform: Optional[str] = None) -> List[dict]:
+        with self._lock:
+            return [dict(p) for p in self.published if platform in (None, p["platform"])]
+
+    def state(self) -> dict:
+        with self._lock:
+            return {"config": asdict(self.config), "media": dict(self.media), "published": list(self.published),
+                    "requests": dict(self.requests), "failures": dict(self.failures)}
+
+    def _count(self, counter: Dict[str, int], key: str) -> None:
+        with self._lock:
+            counter[key] = counter.get(key, 0) + 1
+
+    def _should_fail(self, step: str) -> bool:
+        with self._lock:
+            failed = step in self.config.fail_steps or self._rng.random() < self.config.fail_rate
+        if failed:
+            self._count(self.failures, step)
+        return failed
+
+    def _delay(self) -> None:
+        cfg = self.config
+        if cfg.latency_ms or cfg.jitter_ms:
+            with self._lock:
+                jitter = self._rng.uniform(-cfg.jitter_ms, cfg.jitter_ms)
+            time.sleep(max(0.0, cfg.latency_ms + jitter) / 1000)
+
+    def _processing(self, media_id: str) -> dict:
+        with self._lock:
+            media = self.media.get(media_id)
+        if media is None:
+            status, pct = "PROCESSING_STATUS_FAILED", 0
+        elif "processing" in self.config.fail_steps:
+            status, pct = "PROCESSING_STATUS_FAILED", 0
+        else:
+            elapsed = time.time() - media["uploaded_at"]
+            pct = 100 if self.config.processing_seconds <= 0 else min(100, int(100 * elapsed / self.config.processing_seconds))
+            status = "PROCESSING_STATUS_SUCCEEDED" if pct >= 100 else "PROCESSING_STATUS_PROCESSING"
+        return {"videoId": media_id, "processingProgress": {"processingStatus": status, "percentComplete": pct}}
+
+    # ---------- HTTP ----------
+    def _handler(self):
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def log_message(self, *args):
+                pass
+
+            def _send(self, code: int, body, ctype: str = "application/json", extra: Optional[dict] = None):
+                data = (body if isinstance(body, str) else json.dumps(body)).encode("utf-8")
+                self.send_response(code)
+                self.send_header("Content-Type", f"{ctype}; charset=utf-8")
+                self.send_header("Content-Length", str(len(data)))
+                self.send_header("Cache-Control", "no-store")
+                for k, v in (extra or {}).items():
+                    self.send_header(k, v)
+                self.end_headers()
+                self.wfile.write(data)
+
+            def _read_body(self, throttle: bool = False) -> bytes:
+                remaining = int(self.headers.get("Content-Length", 0))
+                chunks, kbps = [], server.config.upload_kbps if throttle else 0
+                while remaining > 0:
+                    chunk = self.rfile.read(min(remaining, 64 * 1024))
+                    if not chunk:
+                        break
+                    remaining -= len(chunk)
+                    if throttle:
+                        chunks.append(len(chunk))
+                        if kbps:
+                            time.sleep(len(chunk) * 8 / 1000 / kbps)
+                    else:
+                        chunks.append(chunk)
+                return b"".join(chunks) if not throttle else str(sum(chunks)).encode()
+
+            def _route(self):
+                parts = urlsplit(self.path)
+                segments = [s for s in parts.path.split("/") if s]
+                return parts, (segments[0] if segments else ""), "/" + "/".join(segments[1:])
+
+            def do_GET(self):
+                parts, platform, rest = self._route()
+                if platform == "_standin":
+                    return self._send(200, server.state())
+                server._delay()
+                server._count(server.requests, f"GET {platform}")
+                if platform == "youtube" and rest == "/oembed":
+                    url = parse_qs(parts.query).get("url", [""])[0]
+                    video_id = url.rstrip("/").rsplit("/", 1)[-1]
+                    found = any(p["fields"].get("videoId") == video_id for p in server.posts("youtube"))
+                    return self._send(200 if found else 404, {"title": video_id} if found else {"error": "not found"})
+                if platform not in PAGES:
+                    return self._send(404, "<h1>Not a stand-in platform</h1>", "text/html")
+                title, page = PAGES[platform]
+                boot = ""
+                if platform == "youtube" and rest.startswith("/video/") and rest.endswith("/edit"):
+                    draft = rest.split("/")[2]
+                    published = any(p["fields"].get("videoId") == draft for p in server.posts("youtube"))
+                    if draft in server.media and not published:
+                        boot = f"<script>window.DRAFT_ID = {json.dumps(draft)};</script>"
+                html = _COMMON_HEAD % {"title": title} + boot + _COMMON_JS + page + "</body></html>"
+                self._send(200, html, "text/html")
+
+            def do_PUT(self):
+                self.do_POST()
+
+            def do_POST(self):
+                parts, platform, rest = self._route()
+                if platform == "_standin" and rest == "/reset":
+                    with server._lock:
+                        server.media.clear(), server.published.clear()
+                        server.requests.clear(), server.failures.clear()
+                    return self._send(200, {"ok": True})
+                server._count(server.requests, f"{self.command} {platform}{rest}")
+
+                if rest.startswith("/upload"):
+                    size = int(self._read_body(throttle=True))
+                    server._delay()
+                    if server._should_fail("upload"):
+                        return self._send(503, {"error": "upload failed"})
+                    media_id = uuid.uuid4().hex[:11]
+                    with server._lock:
+                        server.media[media_id] = {"platform": platform, "size": size, "uploaded_at": time.time(),
+                                                  "name": self.headers.get("X-Standin-Name", "")}
+                    return self._send(200, {"videoId": media_id}, extra={"X-Goog-Upload-Status": "final"})
+
+                body = self._read_body()
+                server._delay()
+                try:
+                    data = json.loads(body or b"{}")
+                except ValueError:
+                    data = {}
+
+                if rest.endswith("/get_creator_videos"):
+                    if server.config.fail_rate and server._should_fail("status"):
+                        return self._send(500, {"error": "status unavailable"})
+                    return self._send(200, {"videos": [server._processing(v) for v in data.get("videoIds", [])]})
+
+                if rest == "/api/publish":
+                    if server._should_fail("publish"):
+                        return self._send(500, {"error": "publish failed"})
+                    post_id = uuid.uuid4().hex[:8]
+                    media_id = data.get("videoId") or data.get("mediaId")
+                    with server._lock:
+                        media = dict(server.media.get(media_id) or {})
+                        post = {"id": post_id, "platform": platform, "media": media_id, "media_name": media.get("name"),
+                                "fields": data, "at": time.time(), "url": f"{server.url}/{platform}/post/{post_id}"}
+                        server.published.append(post)
+                    return self._send(200, {"url": post["url"]})
+
+                self._send(404, {"error": f"unknown endpoint {rest}"})
+
+        return Handler
+
+
+# ─────────────────────────────────────────────── bench
+def bench(clip_folder: str, platforms: List[str], runs: int = 3, config: Optional[StandinConfig] = None,
+          port: int = DEFAULT_PORT, headless: bool = True) -> Dict[str, dict]:
+    """
+    Run the real uploader plugins against a fresh stand-in `runs` times (each
+    run on a copy of `clip_folder`, so upload journals start empty) and
+    summarise per platform: claimed vs. confirmed successes, duration p50/p95
+    and mean step timings.
+    """
+    sys.path.insert(0, os.path.join(UPLOADER_ROOT_DIR, "Classes"))
+    from uploader_plugins import make_pool, run_uploads
+
+    server = StandinServer(config).start(port)
+    previous = os.environ.get(STANDIN_ENV)
+    os.environ[STANDIN_ENV] = server.url                      # inherited by the plugin workers
+    platforms_dir = os.path.join(UPLOADER_ROOT_DIR, "Platforms")
+    pool = make_pool(len(platforms), platforms_dir)
+    results: Dict[str, List] = {p: [] for p in platforms}
+    confirmed: Dict[str, int] = dict.fromkeys(platforms, 0)
+    try:
+        for run in range(1, runs + 1):
+            work = tempfile.mkdtemp(prefix="standin_bench_")
+            folder = os.path.join(work, os.path.basename(os.path.normpath(clip_folder)))
+            shutil.copytree(clip_folder, folder)
+            before = {p: len(_posts_of(server, p)) for p in platforms}
+            try:
+                for result in run_uploads(platforms, "standin", folder, platforms_dir, headless=headless, pool=pool):
+                    results[result.platform].append(result)
+                    print(f"run {run}/{runs}  {result.platform:<16} {result.status:<8} {result.duration:6.1f}s"
+                          f"{'  ' + result.error_type + ': ' + result.error if result.error_type else ''}")
+            finally:
+                shutil.rmtree(work, ignore_errors=True)
+            for p in platforms:
+                confirmed[p] += min(1, len(_posts_of(server, p)) - before[p])
+    finally:
+        pool.shutdown()
+        server.shutdown()
+        if previous is None:
+            os.environ.pop(STANDIN_ENV, None)
+        else:
+            os.environ[STANDIN_ENV] = previous
+
+    summary = {}
+    for p, rs in results.items():
+        durations = [r.duration for r in rs]
+        steps: Dict[str, List[float]] = {}
+        for r in rs:
+            for name, seconds in r.timings.items():
+                steps.setdefault(name, []).append(seconds)
+        ok = sum(r.ok for r in rs)
+        summary[p] = {
+            "runs": len(rs),
+            "ok": ok,
+            "confirmed": confirmed[p],
+            "false_ok": max(0, ok - confirmed[p]),
+            "p50": round(percentile(durations, 0.5), 2),
+            "p95": round(percentile(durations, 0.95), 2),
+            "steps": {name: round(statistics.mean(v), 2) for name, v in sorted(steps.items())},
+        }
+    return summary
+
+
+def _posts_of(server: StandinServer, platform: str) -> List[dict]:
+    """Posts published by `platform`; instagram and instagram_story share a page, told apart by `kind`."""
+    if not platform.startswith("instagram"):
+        return server.posts(platform)
+    kind = "story" if platform == "instagram_story" else "post"
+    return [p for p in server.posts("instagram") if p["fields"].get("kind") == kind]
+
+
+# ─────────────────────────────────────────────── CLI
+def _add_knobs(parser: argparse.ArgumentParser) -> None:
+    parser.add_argument("--port", type=int, default=DEFAULT_PORT)
+    parser.add_argument("--latency-ms", type=float, default=0.0)
+    parser.add_argument("--jitter-ms", type=float, default=0.0)
+    parser.add_argument("--upload-kbps", type=float, default=0.0)
+    parser.add_argument("--processing-seconds", type=float, default=5.0)
+    parser.add_argument("--fail-rate", type=float, default=0.0)
+    parser.add_argument("--fail-step", action="append", default=[], choices=FAIL_STEPS)
+    parser.add_argument("--seed", type=int, default=None)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Local stand-in for the platforms' upload flows")
+    sub = parser.add_subparsers(dest="command", required=True)
+    serve = sub.add_parser("serve")
+    _add_knobs(serve)
+    run = sub.add_parser("bench")
+    run.add_argument("clip_folder")
+    run.add_argument("platforms", nargs="+")
+    run.add_argument("--runs", type=int, default=3)
+    run.add_argument("--visible", action="store_true")
+    _add_knobs(run)
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s [%(levelname)s] %(message)s")
+    config = StandinConfig(args.latency_ms, args.jitter_ms, args.upload_kbps, args.processing_seconds,
+                           args.fail_rate, tuple(args.fail_step), args.seed)
+
+    if args.command == "serve":
+        server = StandinServer(config).start(args.port)
+        print(f"set {STANDIN_ENV}={server.url} to point the uploaders here")
+        try:
+            while True:
+                time.sleep(3600)
+        except KeyboardInterrupt:
+            server.shutdown()
+        return
+
+    summary = bench(args.clip_folder, args.platforms, args.runs, config, args.port, headless=not args.visible)
+    print()
+    for platform, s in summary.items():
+        print(f"{platform:<16} ok {s['ok']}/{s['runs']}  confirmed {s['confirmed']}  false-ok {s['false_ok']}  "
+              f"p50 {s['p50']}s  p95 {s['p95']}s")
+        for name, seconds in s["steps"].items():
+            print(f"    {name:<28} {seconds:>7.2f}s")
+
+
+if __name__ == "__main__":
+    main()
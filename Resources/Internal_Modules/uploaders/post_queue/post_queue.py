@@ -0,0 +1,387 @@
+"""
+post_queue.py
+~~~~~~~~~~~~~
+Durable per-brand queue of posts waiting to be uploaded.
+
+One SQLite database (WAL mode) per brand at ``<brand>/MetaData/post_queue.sqlite``
+holds a row per clip folder in ``<brand>/Clips``. A post is ``ready`` →
+``leased`` (by one uploader, until its lease expires) → ``published`` or
+``failed``. Picking the next post is one indexed query inside an IMMEDIATE
+transaction, so two uploaders can never take the same folder, and order is
+priority first (lower = sooner), then enqueue time – not folder ctime,
+which changes on copy/restore. ``publish_at`` holds a post back until then.
+
+Folders are stored by name relative to ``Clips`` so the queue survives the
+brand folder moving. Folders dropped into ``Clips`` by tools that don't
+enqueue are picked up by ``sync_clips()``.
+
+Each post also has a delivery ledger: one row per (post, platform, account)
+with attempts, outcome, post URL and error class. A post is only delivered
+once every required platform ``succeeded`` or was ``waived``; re-leasing a
+post (``retry``) re-runs just the platforms still missing.
+
+Example
+-------
+from uploaders.post_queue.post_queue import PostQueue
+
+queue = PostQueue(r"D:\\...\\Channels\\Zoonami")
+queue.enqueue("20250516_021130", priority=3)          # creators, after writing the folder
+post = queue.lease("uploader-1")                       # uploaders: Post or None
+...
+queue.require(post.id, ["youtube", "tiktok"], "Zoonami")
+queue.record_delivery(post.id, "youtube", "Zoonami", ok=True, post_url="https://youtu.be/…")
+queue.missing(post.id)                                 # [("tiktok", "Zoonami")]
+queue.settle(post.id, "uploader-1")                    # published if nothing missing, else failed
+
+CLI
+---
+python post_queue.py <brand_dir> list [--state ready]
+python post_queue.py <brand_dir> add <folder> [--priority N] [--publish-at 2025-06-01T18:00]
+python post_queue.py <brand_dir> sync | retry <id> | retry-failed | requeue-expired
+python post_queue.py <brand_dir> deliveries <id> | waive <id> <platform> [--account A]
+"""
+from __future__ import annotations
+
+import argparse
+import datetime
+import os
+import socket
+import sqlite3
+import time
+from dataclasses import dataclass
+from typing import Dict, List, Optional
+
+DB_NAME = "post_queue.sqlite"
+CLIPS_DIR = "Clips"
+LEASE_SECONDS = 2 * 3600          # longer than any single clip's uploads
+DEFAULT_PRIORITY = 5
+STATES = ("ready", "leased", "published", "failed")
+DELIVERY_STATES = ("pending", "succeeded", "failed", "waived")
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS posts (
+    id            INTEGER PRIMARY KEY,
+    folder        TEXT    NOT NULL UNIQUE,
+    state         TEXT    NOT NULL DEFAULT 'ready',
+    priority      INTEGER NOT NULL DEFAULT 5,
+    publish_at    REAL,
+    created       REAL    NOT NULL,
+    updated       REAL    NOT NULL,
+    lease_owner   TEXT,
+    lease_expires REAL,
+    attempts      INTEGER NOT NULL DEFAULT 0,
+    error         TEXT
+)
+"""
+_DELIVERIES_SCHEMA = """
+CREATE TABLE IF NOT EXISTS deliveries (
+    post_id    INTEGER NOT NULL REFERENCES posts (id),
+    platform   TEXT    NOT NULL,
+    account    TEXT    NOT NULL,
+    state      TEXT    NOT NULL DEFAULT 'pending',
+    attempts   INTEGER NOT NULL DEFAULT 0,
+    post_url   TEXT,
+    error_type TEXT,
+    error      TEXT,
+    updated    REAL    NOT NULL,
+    PRIMARY KEY (post_id, platform, account)
+)
+"""
+_INDEXES = (
+    "CREATE INDEX IF NOT EXISTS posts_next ON posts (state, priority, created, id)",
+    "CREATE INDEX IF NOT EXISTS posts_lease ON posts (state, lease_expires)",
+)
+
+
+@dataclass
+class Post:
+    id: int
+    folder: str                   # name inside Clips
+    path: str                     # absolute folder path
+    state: str
+    priority: int
+    publish_at: Optional[float]
+    created: float
+    attempts: int
+    lease_owner: Optional[str]
+    lease_expires: Optional[float]
+    error: Optional[str]
+
+
+def default_owner() -> str:
+    return f"{socket.gethostname()}:{os.getpid()}"
+
+
+# ─────────────────────────────────────────────── queue
+class PostQueue:
+    def __init__(self, brand_dir: str, db_path: Optional[str] = None):
+        self.brand_dir = os.path.abspath(brand_dir)
+        self.clips_dir = os.path.join(self.brand_dir, CLIPS_DIR)
+        self.db_path = db_path or os.path.join(self.brand_dir, "MetaData", DB_NAME)
+        os.makedirs(os.path.dirname(self.db_path), exist_ok=True)
+        self.conn = sqlite3.connect(self.db_path, timeout=30, isolation_level=None)
+        self.conn.row_factory = sqlite3.Row
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("PRAGMA synchronous=NORMAL")
+        self.conn.execute(_SCHEMA)
+        self.conn.execute(_DELIVERIES_SCHEMA)
+        for ddl in _INDEXES:
+            self.conn.execute(ddl)
+
+    def close(self) -> None:
+        self.conn.close()
+
+    def __enter__(self) -> "PostQueue":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+    def _post(self, row: sqlite3.Row) -> Post:
+        return Post(
+            id=row["id"], folder=row["folder"], path=os.path.join(self.clips_dir, row["folder"]),
+            state=row["state"], priority=row["priority"], publish_at=row["publish_at"],
+            created=row["created"], attempts=row["attempts"], lease_owner=row["lease_owner"],
+            lease_expires=row["lease_expires"], error=row["error"],
+        )
+
+    # ---------- producers ----------
+    def enqueue(self, folder: str, priority: int = DEFAULT_PRIORITY,
+                publish_at: Optional[float] = None) -> int:
+        """Add a clip folder (name or path inside Clips); returns its id. Re-enqueueing is a no-op."""
+        name = os.path.basename(os.path.normpath(folder))
+        now = time.time()
+        self.conn.execute(
+            "INSERT OR IGNORE INTO posts (folder, priority, publish_at, created, updated) VALUES (?, ?, ?, ?, ?)",
+            (name, priority, publish_at, now, now),
+        )
+        return self.conn.execute("SELECT id FROM posts WHERE folder = ?", (name,)).fetchone()["id"]
+
+    def sync_clips(self) -> int:
+        """Enqueue Clips folders the queue doesn't know yet (oldest mtime first); returns how many."""
+        try:
+            entries = [e for e in os.scandir(self.clips_dir) if e.is_dir()]
+        except FileNotFoundError:
+            return 0
+        known = {row["folder"] for row in self.conn.execute("SELECT folder FROM posts")}
+        added = 0
+        for entry in sorted(entries, key=lambda e: e.stat().st_mtime):
+            if entry.name not in known:
+                self.enqueue(entry.name)
+                added += 1
+        return added
+
+    # ---------- consumers ----------
+    def lease(self, owner: Optional[str] = None, lease_seconds: float = LEASE_SECONDS,
+              post_id: Optional[int] = None) -> Optional[Post]:
+        """
+        Atomically take the next ready post whose folder still exists (or
+        exactly `post_id`, if it is ready); None when there's nothing due.
+        """
+        owner = owner or default_owner()
+        while True:
+            now = time.time()
+            self.conn.execute("BEGIN IMMEDIATE")
+            try:
+                self._requeue_expired(now)
+                if post_id is None:
+                    row = self.conn.execute(
+                        "SELECT * FROM posts WHERE state = 'ready' AND (publish_at IS NULL OR publish_at <= ?) "
+                        "ORDER BY priority, created, id LIMIT 1", (now,)
+                    ).fetchone()
+                else:
+                    row = self.conn.execute(
+                        "SELECT * FROM posts WHERE state = 'ready' AND id = ?", (post_id,)).fetchone()
+                if row is None:
+                    self.conn.execute("COMMIT")
+                    return None
+                if not os.path.isdir(os.path.join(self.clips_dir, row["folder"])):
+                    self.conn.execute(
+                        "UPDATE posts SET state = 'failed', error = 'folder missing', updated = ? WHERE id = ?",
+                        (now, row["id"]),
+                    )
+                    self.conn.execute("COMMIT")
+                    continue
+                self.conn.execute(
+                    "UPDATE posts SET state = 'leased', lease_owner = ?, lease_expires = ?, "
+                    "attempts = attempts + 1, updated = ? WHERE id = ?",
+                    (owner, now + lease_seconds, now, row["id"]),
+                )
+                self.conn.execute("COMMIT")
+            except BaseException:
+                self.conn.execute("ROLLBACK")
+                raise
+            return self.get(row["id"])
+
+    def renew(self, post_id: int, owner: str, lease_seconds: float = LEASE_SECONDS) -> bool:
+        return self._transition(post_id, owner, "leased", lease_expires=time.time() + lease_seconds)
+
+    def complete(self, post_id: int, owner: str) -> bool:
+        return self._transition(post_id, owner, "published", error=None)
+
+    def fail(self, post_id: int, owner: str, error: str = "", retry: bool = False) -> bool:
+        """Mark failed, or put back to ready (keeping the error) with ``retry=True``."""
+        return self._transition(post_id, owner, "ready" if retry else "failed", error=error)
+
+    def release(self, post_id: int, owner: str) -> bool:
+        """Give a leased post back untouched (e.g. the posting window closed)."""
+        return self._transition(post_id, owner, "ready", attempts_delta=-1)
+
+    def _transition(self, post_id: int, owner: str, state: str, attempts_delta: int = 0, **fields) -> bool:
+        """Only the current lease holder may move a leased post."""
+        sets = ["state = ?", "updated = ?", "attempts = attempts + ?"]
+        values: list = [state, time.time(), attempts_delta]
+        if state != "leased":
+            fields.update(lease_owner=None, lease_expires=None)
+        for column, value in fields.items():
+            sets.append(f"{column} = ?")
+            values.append(value)
+        cur = self.conn.execute(
+            f"UPDATE posts SET {', '.join(sets)} WHERE id = ? AND state = 'leased' AND lease_owner = ?",
+            (*values, post_id, owner),
+        )
+        return cur.rowcount == 1
+
+    # ---------- delivery ledger ----------
+    def require(self, post_id: int, platforms: List[str], account: str) -> None:
+        """Declare the platforms this post must reach (existing rows keep their outcome)."""
+        now = time.time()
+        self.conn.executemany(
+            "INSERT OR IGNORE INTO deliveries (post_id, platform, account, updated) VALUES (?, ?, ?, ?)",
+            [(post_id, platform, account, now) for platform in platforms],
+        )
+
+    def record_delivery(self, post_id: int, platform: str, account: str, ok: bool,
+                        post_url: Optional[str] = None, error_type: str = "", error: str = "") -> None:
+        now = time.time()
+        self.conn.execute(
+            "INSERT INTO deliveries (post_id, platform, account, state, attempts, post_url, error_type, error, updated) "
+            "VALUES (?, ?, ?, ?, 1, ?, ?, ?, ?) "
+            "ON CONFLICT (post_id, platform, account) DO UPDATE SET state = excluded.state, "
+            "attempts = attempts + 1, post_url = COALESCE(excluded.post_url, post_url), "
+            "error_type = excluded.error_type, error = excluded.error, updated = excluded.updated",
+            (post_id, platform, account, "succeeded" if ok else "failed", post_url,
+             error_type or None, error or None, now),
+        )
+
+    def waive(self, post_id: int, platform: str, account: Optional[str] = None) -> int:
+        """Stop requiring a platform for this post (all accounts unless `account`)."""
+        sql = "UPDATE deliveries SET state = 'waived', updated = ? WHERE post_id = ? AND platform = ? AND state != 'succeeded'"
+        args: list = [time.time(), post_id, platform]
+        if account:
+            sql += " AND account = ?"
+            args.append(account)
+        return self.conn.execute(sql, args).rowcount
+
+    def missing(self, post_id: int) -> List[tuple]:
+        """(platform, account) pairs still to deliver."""
+        return [(r["platform"], r["account"]) for r in self.conn.execute(
+            "SELECT platform, account FROM deliveries WHERE post_id = ? AND state IN ('pending', 'failed') "
+            "ORDER BY platform, account", (post_id,))]
+
+    def deliveries(self, post_id: int) -> List[dict]:
+        return [dict(r) for r in self.conn.execute(
+            "SELECT * FROM deliveries WHERE post_id = ? ORDER BY platform, account", (post_id,))]
+
+    def settle(self, post_id: int, owner: str) -> bool:
+        """published when no required delivery is missing, else failed (listing what's missing)."""
+        missing = self.missing(post_id)
+        if not missing:
+            self.complete(post_id, owner)
+            return True
+        self.fail(post_id, owner, "missing: " + ", ".join(p for p, _ in missing))
+        return False
+
+    def _requeue_expired(self, now: float) -> int:
+        return self.conn.execute(
+            "UPDATE posts SET state = 'ready', lease_owner = NULL, lease_expires = NULL, updated = ? "
+            "WHERE state = 'leased' AND lease_expires < ?", (now, now),
+        ).rowcount
+
+    # ---------- admin ----------
+    def requeue_expired(self) -> int:
+        return self._requeue_expired(time.time())
+
+    def retry(self, post_id: int) -> bool:
+        """failed → ready (manual retry)."""
+        return self.conn.execute(
+            "UPDATE posts SET state = 'ready', updated = ? WHERE id = ? AND state = 'failed'",
+            (time.time(), post_id),
+        ).rowcount == 1
+
+    def retry_failed(self) -> List[int]:
+        """Every failed post whose folder still exists → ready; returns their ids."""
+        ids = [p.id for p in self.list("failed") if os.path.isdir(p.path)]
+        return [post_id for post_id in ids if self.retry(post_id)]
+
+    def get(self, post_id: int) -> Optional[Post]:
+        row = self.conn.execute("SELECT * FROM posts WHERE id = ?", (post_id,)).fetchone()
+        return self._post(row) if row else None
+
+    def list(self, state: Optional[str] = None) -> List[Post]:
+        if state:
+            rows = self.conn.execute(
+                "SELECT * FROM posts WHERE state = ? ORDER BY priority, created, id", (state,))
+        else:
+            rows = self.conn.execute("SELECT * FROM posts ORDER BY priority, created, id")
+        return [self._post(r) for r in rows]
+
+    def counts(self) -> Dict[str, int]:
+        counts = dict.fromkeys(STATES, 0)
+        for row in self.conn.execute("SELECT state, COUNT(*) AS n FROM posts GROUP BY state"):
+            counts[row["state"]] = row["n"]
+        return counts
+
+
+# ─────────────────────────────────────────────── CLI
+def main():
+    parser = argparse.ArgumentParser(description="Inspect / edit a brand's post queue")
+    parser.add_argument("brand_dir", help="Channels\\<brand> folder")
+    sub = parser.add_subparsers(dest="command", required=True)
+    ls = sub.add_parser("list")
+    ls.add_argument("--state", choices=STATES)
+    add = sub.add_parser("add")
+    add.add_argument("folder")
+    add.add_argument("--priority", type=int, default=DEFAULT_PRIORITY)
+    add.add_argument("--publish-at", default=None, help="ISO local time, e.g. 2025-06-01T18:00")
+    sub.add_parser("sync")
+    retry = sub.add_parser("retry")
+    retry.add_argument("id", type=int)
+    sub.add_parser("retry-failed")
+    sub.add_parser("requeue-expired")
+    dl = sub.add_parser("deliveries")
+    dl.add_argument("id", type=int)
+    waive = sub.add_parser("waive")
+    waive.add_argument("id", type=int)
+    waive.add_argument("platform")
+    waive.add_argument("--account", default=None)
+    args = parser.parse_args()
+
+    with PostQueue(args.brand_dir) as queue:
+        if args.command == "list":
+            for p in queue.list(args.state):
+                due = datetime.datetime.fromtimestamp(p.publish_at).isoformat(" ", "minutes") if p.publish_at else "-"
+                print(f"{p.id:>5}  {p.state:<9} p{p.priority}  due {due:<16}  tries {p.attempts}  {p.folder}"
+                      f"{'  ! ' + p.error if p.error else ''}")
+            print(queue.counts())
+        elif args.command == "add":
+            publish_at = datetime.datetime.fromisoformat(args.publish_at).timestamp() if args.publish_at else None
+            print(queue.enqueue(args.folder, args.priority, publish_at))
+        elif args.command == "sync":
+            print(f"{queue.sync_clips()} folder(s) enqueued")
+        elif args.command == "retry":
+            print("ok" if queue.retry(args.id) else "not a failed post")
+        elif args.command == "retry-failed":
+            print(f"{len(queue.retry_failed())} failed post(s) back to ready")
+        elif args.command == "requeue-expired":
+            print(f"{queue.requeue_expired()} lease(s) expired")
+        elif args.command == "deliveries":
+            for d in queue.deliveries(args.id):
+                print(f"{d['platform']:<16} {d['account']:<20} {d['state']:<9} tries {d['attempts']}  "
+                      f"{d['post_url'] or ''}{d['error_type'] or ''}")
+        elif args.command == "waive":
+            print(f"{queue.waive(args.id, args.platform, args.account)} delivery(ies) waived")
+
+
+if __name__ == "__main__":
+    main()
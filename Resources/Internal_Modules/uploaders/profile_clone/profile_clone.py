@@ -0,0 +1,428 @@
+"""
+profile_clone.py
+~~~~~~~~~~~~~~~~
+Incremental clones of a Chrome user-data profile for automated launches.
+
+Instead of ``copytree``-ing the whole profile on every uploader start, each
+source profile gets a stable clone directory in the temp folder that is
+kept between runs and synchronised rsync-style:
+
+• cache / crash directories are excluded by policy (``EXCLUDED_DIRS``) –
+  the clone grows its own warm cache there instead;
+• files whose size + mtime already match the source are left alone;
+• immutable files (extension bundles, LevelDB tables) are hard-linked
+  when the filesystem allows it, everything else is copied;
+• files that disappeared from the source are removed from the clone.
+
+Concurrent launches of the same profile each lease their own clone slot
+(``<base>``, ``<base>_1``, …). The lease file records the owner PID and its
+creation time; a lease is only broken once that process is gone or the
+lease is older than ``LEASE_TTL_SECONDS``. ``cleanup_stale_profiles``
+applies the same rule to the temp folder and keeps the unleased clones
+under ``MAX_CLONE_BYTES`` (least recently used go first), so parallel
+uploaders never touch each other's live profile.
+
+Example
+-------
+from uploaders.profile_clone.profile_clone import clone_profile
+
+user_data_dir, report = clone_profile(r"C:\\...\\User Data", "Profile 3")
+print(report)      # Profile clone: 12 copied (4.1 MB), 310 linked, ... in 0.84s
+
+CLI
+---
+python profile_clone.py <user_data_root> <profile_dir>
+python profile_clone.py --cleanup
+"""
+from __future__ import annotations
+
+import argparse
+import atexit
+import ctypes
+import hashlib
+import json
+import os
+import re
+import shutil
+import tempfile
+import threading
+import time
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Optional, Tuple
+
+CLONE_PREFIX = "presence_profile_"
+LEASE_FILE = ".presence_clone_lease"
+MAX_SLOTS = 8
+LEASE_TTL_SECONDS = 6 * 3600          # a lease not renewed for this long is considered abandoned
+MAX_CLONE_BYTES = 6 * 1024 ** 3       # cap for all unleased clones in the temp folder
+_SLOT_RE = re.compile(rf"^{re.escape(CLONE_PREFIX)}.+_[0-9a-f]{{8}}(_\d+)?$", re.I)
+
+# Directories (relative to the profile, "/"-separated) that are never cloned.
+EXCLUDED_DIRS = {
+    "Cache",
+    "Code Cache",
+    "GPUCache",
+    "DawnCache",
+    "DawnGraphiteCache",
+    "DawnWebGPUCache",
+    "GrShaderCache",
+    "GraphiteDawnCache",
+    "ShaderCache",
+    "Service Worker/CacheStorage",
+    "Service Worker/ScriptCache",
+    "Application Cache",
+    "Media Cache",
+    "Crashpad",
+    "Crash Reports",
+    "blob_storage",
+    "optimization_guide_model_store",
+    "component_crx_cache",
+}
+# Process lock files Chrome keeps open while the source profile is running.
+EXCLUDED_FILES = {"LOCK", "lockfile", "SingletonLock", "SingletonCookie", "SingletonSocket", LEASE_FILE}
+
+# Files Chrome never rewrites in place – safe to share by hard link.
+IMMUTABLE_DIRS = ("Extensions/",)
+IMMUTABLE_SUFFIXES = (".ldb", ".sst")
+
+
+@dataclass
+class CloneReport:
+    """What one sync did."""
+    copied: int = 0
+    linked: int = 0
+    unchanged: int = 0
+    removed: int = 0
+    bytes_copied: int = 0
+    elapsed: float = 0.0
+
+    def __str__(self) -> str:
+        return (f"Profile clone: {self.copied} copied ({self.bytes_copied / 1e6:.1f} MB), "
+                f"{self.linked} linked, {self.unchanged} unchanged, {self.removed} removed "
+                f"in {self.elapsed:.2f}s")
+
+
+# ─────────────────────────────────────────────── policy
+def _is_excluded(rel: str, is_dir: bool) -> bool:
+    if is_dir:
+        return rel in EXCLUDED_DIRS
+    return rel.rsplit("/", 1)[-1] in EXCLUDED_FILES
+
+
+def _is_immutable(rel: str) -> bool:
+    return rel.startswith(IMMUTABLE_DIRS) or rel.endswith(IMMUTABLE_SUFFIXES)
+
+
+# ─────────────────────────────────────────────── sync
+def _same_file(src: os.stat_result, dst: Path) -> bool:
+    try:
+        st = dst.stat()
+    except OSError:
+        return False
+    return st.st_size == src.st_size and st.st_mtime_ns == src.st_mtime_ns
+
+
+def _place_file(src: Path, dst: Path, rel: str, st: os.stat_result, report: CloneReport) -> None:
+    """Bring one file up to date: hard link when immutable, copy otherwise."""
+    if dst.exists() or dst.is_symlink():
+        dst.unlink()
+    if _is_immutable(rel):
+        try:
+            os.link(src, dst)
+            report.linked += 1
+            return
+        except OSError:
+            pass                              # other volume / FS without links → copy
+    shutil.copy2(src, dst)
+    report.copied += 1
+    report.bytes_copied += st.st_size
+
+
+def _sync_tree(src: Path, dst: Path, report: CloneReport, rel_root: str = "") -> None:
+    dst.mkdir(parents=True, exist_ok=True)
+    seen = set()
+
+    try:
+        entries = list(os.scandir(src))
+    except OSError:
+        return
+
+    for entry in entries:
+        rel = f"{rel_root}{entry.name}"
+        try:
+            is_dir = entry.is_dir(follow_symlinks=False)
+            if _is_excluded(rel, is_dir):
+                continue
+            seen.add(entry.name)
+            target = dst / entry.name
+            if is_dir:
+                _sync_tree(Path(entry.path), target, report, rel + "/")
+            elif entry.is_file(follow_symlinks=False):
+                st = entry.stat(follow_symlinks=False)
+                if _same_file(st, target):
+                    report.unchanged += 1
+                else:
+                    _place_file(Path(entry.path), target, rel, st, report)
+        except OSError:
+            # Files Chrome holds exclusively (running source profile) are skipped;
+            # the previous copy in the clone, if any, stays in place.
+            continue
+
+    # mirror deletions – but keep whatever the clone grew in excluded dirs
+    for entry in list(os.scandir(dst)):
+        rel = f"{rel_root}{entry.name}"
+        is_dir = entry.is_dir(follow_symlinks=False)
+        if entry.name in seen or _is_excluded(rel, is_dir):
+            continue
+        try:
+            if is_dir:
+                shutil.rmtree(entry.path, ignore_errors=True)
+            else:
+                os.remove(entry.path)
+            report.removed += 1
+        except OSError:
+            pass
+
+
+# ─────────────────────────────────────────────── slots
+def _clone_base(user_data_root: str, profile_dir: str) -> str:
+    """Stable, filesystem-safe clone name for one source profile."""
+    digest = hashlib.sha1(os.path.abspath(user_data_root).lower().encode("utf-8")).hexdigest()[:8]
+    safe = re.sub(r"[^A-Za-z0-9]+", "_", profile_dir).strip("_")
+    return f"{CLONE_PREFIX}{safe}_{digest}"
+
+
+def _pid_alive(pid: int) -> bool:
+    if pid <= 0:
+        return False
+    if os.name == "nt":
+        # os.kill(pid, 0) would *terminate* the process on Windows
+        kernel32 = ctypes.WinDLL("kernel32", use_last_error=True)
+        handle = kernel32.OpenProcess(0x1000, False, pid)      # PROCESS_QUERY_LIMITED_INFORMATION
+        if not handle:
+            return False
+        try:
+            code = ctypes.c_ulong()
+            kernel32.GetExitCodeProcess(handle, ctypes.byref(code))
+            return code.value == 259                            # STILL_ACTIVE
+        finally:
+            kernel32.CloseHandle(handle)
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        return True
+    return True
+
+
+def read_lease(clone_root: str) -> Optional[dict]:
+    """Return ``{"pid", "created"}`` of the current lease, ``{}`` if unreadable, None if free."""
+    try:
+        with open(os.path.join(clone_root, LEASE_FILE), "r", encoding="utf-8") as f:
+            return json.load(f)
+    except FileNotFoundError:
+        return None
+    except (OSError, ValueError):
+        return {}
+
+
+def lease_is_live(lease: Optional[dict], ttl: float = LEASE_TTL_SECONDS) -> bool:
+    if not lease:
+        return False
+    if time.time() - float(lease.get("created", 0)) > ttl:
+        return False
+    return _pid_alive(int(lease.get("pid", 0)))
+
+
+def renew_clone(clone_root: str) -> bool:
+    """Restart the TTL of our own lease (long-lived holders like the browser broker); False if not ours."""
+    lease = read_lease(clone_root)
+    if not lease or lease.get("pid") != os.getpid():
+        return False
+    draft = os.path.join(clone_root, f"{LEASE_FILE}.{os.getpid()}.{threading.get_ident()}.new")
+    try:
+        with open(draft, "w", encoding="utf-8") as f:
+            json.dump({"pid": os.getpid(), "created": time.time()}, f)
+        os.replace(draft, os.path.join(clone_root, LEASE_FILE))
+    except OSError:
+        return False
+    return True
+
+
+def release_clone(clone_root: str) -> None:
+    """Give a clone slot back so the next launch can reuse it (own lease only)."""
+    lease = read_lease(clone_root)
+    if lease is not None and lease.get("pid") not in (os.getpid(), None):
+        return
+    try:
+        os.remove(os.path.join(clone_root, LEASE_FILE))
+    except OSError:
+        pass
+
+
+def _break_lease(slot: Path, stale: dict) -> bool:
+    """Atomically take a stale lease away; False if someone renewed it meanwhile."""
+    grave = slot / f"{LEASE_FILE}.{os.getpid()}.{threading.get_ident()}"
+    try:
+        os.replace(slot / LEASE_FILE, grave)
+    except OSError:
+        return False
+    try:
+        with open(grave, "r", encoding="utf-8") as f:
+            taken = json.load(f)
+    except (OSError, ValueError):
+        taken = {}
+    if taken != stale:
+        # lost a race against a fresh claim – put it back
+        try:
+            os.link(grave, slot / LEASE_FILE)
+        except OSError:
+            pass
+        os.remove(grave)
+        return False
+    os.remove(grave)
+    return True
+
+
+def _try_lease(slot: Path, ttl: float) -> bool:
+    # write the lease aside, then link it into place: the link is the atomic
+    # "create if absent", and readers never see a half-written lease
+    draft = slot / f"{LEASE_FILE}.{os.getpid()}.{threading.get_ident()}.new"
+    with open(draft, "w", encoding="utf-8") as f:
+        json.dump({"pid": os.getpid(), "created": time.time()}, f)
+    try:
+        for _ in range(2):
+            try:
+                os.link(draft, slot / LEASE_FILE)
+                return True
+            except FileExistsError:
+                lease = read_lease(str(slot))
+                if lease is None:
+                    continue                  # released between the two calls
+                if lease_is_live(lease, ttl) or not _break_lease(slot, lease):
+                    return False
+        return False
+    finally:
+        os.remove(draft)
+
+
+def _claim_slot(base: str, temp_dir: Path, ttl: float = LEASE_TTL_SECONDS) -> Path:
+    """Lease the first free slot of ``base``; dead or expired leases are broken."""
+    for n in range(MAX_SLOTS):
+        slot = temp_dir / (base if n == 0 else f"{base}_{n}")
+        slot.mkdir(parents=True, exist_ok=True)
+        if _try_lease(slot, ttl):
+            atexit.register(release_clone, str(slot))
+            return slot
+    raise RuntimeError(f"All {MAX_SLOTS} clone slots of '{base}' are leased.")
+
+
+# ─────────────────────────────────────────────── cleanup
+def _tree_bytes(path: str) -> int:
+    total = 0
+    for root, _, files in os.walk(path):
+        for name in files:
+            try:
+                total += os.lstat(os.path.join(root, name)).st_size
+            except OSError:
+                pass
+    return total
+
+
+def cleanup_stale_profiles(temp_dir: Optional[str] = None,
+                           ttl: float = LEASE_TTL_SECONDS,
+                           max_bytes: int = MAX_CLONE_BYTES) -> int:
+    """
+    Tidy the temp folder without touching profiles that are in use:
+
+    • a directory with a live lease (owner running, younger than ``ttl``) is kept;
+    • stale leases are dropped so the slot can be reused;
+    • one-shot clones (not a reusable slot) without a live lease are deleted;
+    • unleased slots are deleted oldest-first until they fit in ``max_bytes``.
+
+    Returns the number of bytes freed.
+    """
+    temp = Path(temp_dir or tempfile.gettempdir())
+    freed = 0
+    idle = []
+    for entry in temp.iterdir():
+        try:
+            if not (entry.is_dir() and entry.name.lower().startswith(CLONE_PREFIX.lower())):
+                continue
+            lease = read_lease(str(entry))
+            if lease_is_live(lease, ttl):
+                continue
+            if lease is not None:
+                _break_lease(entry, lease)
+            size = _tree_bytes(str(entry))
+            if _SLOT_RE.match(entry.name):
+                idle.append((entry.stat().st_mtime, size, entry))
+            else:
+                shutil.rmtree(entry, ignore_errors=True)
+                freed += size
+        except OSError:
+            # in use or no permission – it will be looked at again next run
+            continue
+
+    total = sum(size for _, size, _ in idle)
+    for _, size, entry in sorted(idle, key=lambda t: t[0]):
+        if total <= max_bytes:
+            break
+        if read_lease(str(entry)) is not None:
+            continue                          # leased since we looked
+        shutil.rmtree(entry, ignore_errors=True)
+        total -= size
+        freed += size
+    return freed
+
+
+# ─────────────────────────────────────────────── public API
+def clone_profile(user_data_root: str, profile_dir: str,
+                  temp_dir: Optional[str] = None) -> Tuple[str, CloneReport]:
+    """
+    Sync ``<user_data_root>/<profile_dir>`` plus ``Local State`` into a
+    claimed clone slot and return ``(clone_user_data_dir, report)``.
+    The profile folder keeps its original name inside the clone.
+    """
+    start = time.perf_counter()
+    report = CloneReport()
+    root = Path(user_data_root)
+    slot = _claim_slot(_clone_base(user_data_root, profile_dir), Path(temp_dir or tempfile.gettempdir()))
+
+    # Local State (contains the cookie-encryption key)
+    local_state = root / "Local State"
+    st = local_state.stat()
+    if _same_file(st, slot / "Local State"):
+        report.unchanged += 1
+    else:
+        _place_file(local_state, slot / "Local State", "Local State", st, report)
+
+    _sync_tree(root / profile_dir, slot / profile_dir, report)
+
+    report.elapsed = time.perf_counter() - start
+    return str(slot), report
+
+
+# ─────────────────────────────────────────────── CLI
+def main():
+    parser = argparse.ArgumentParser(description="Incrementally clone a Chrome profile into the temp folder")
+    parser.add_argument("user_data_root", nargs="?", help="Chrome 'User Data' directory")
+    parser.add_argument("profile_dir", nargs="?", help="Profile folder name, e.g. 'Profile 3'")
+    parser.add_argument("--cleanup", action="store_true", help="Only drop stale clones and enforce the disk cap")
+    args = parser.parse_args()
+
+    if args.cleanup:
+        print(f"🧹 Freed {cleanup_stale_profiles() / 1e6:.1f} MB")
+        return
+    if not (args.user_data_root and args.profile_dir):
+        parser.error("user_data_root and profile_dir are required unless --cleanup is given")
+
+    clone_root, report = clone_profile(args.user_data_root, args.profile_dir)
+    print(f"📁 {clone_root}")
+    print(f"INFO: {report}")
+
+
+if __name__ == "__main__":
+    main()
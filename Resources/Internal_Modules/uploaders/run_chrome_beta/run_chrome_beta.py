@@ -17,6 +17,10 @@ from selenium.webdriver.support import expected_conditions as EC
 from selenium.webdriver.support.ui import WebDriverWait
 from selenium_stealth import stealth
 
+from uploaders.profile_clone.profile_clone import cleanup_stale_profiles, clone_profile, release_clone
+from uploaders.browser_broker.browser_broker import borrow_session, return_session
+from uploaders.platform_standin.platform_standin import STANDIN_ENV, standin_url
+
 # ──────────────────────────────────────────────────────────────
 # HELPER FUNCTIONS
 # ──────────────────────────────────────────────────────────────
@@ -32,42 +36,31 @@ def _free_port() -> int:
 # helper – clone profile into temp dir
 def _clone_profile(user_data_root: str, profile_dir: str) -> str:
     """
-    Clone the entire <profile_dir> plus Local State into a temp
-    user‑data directory *without* renaming the profile folder.
+    Incrementally sync <profile_dir> plus Local State into a reusable temp
+    user‑data directory *without* renaming the profile folder
+    (see uploaders/profile_clone for the exclusion and linking policy).
     """
     cleanup_old_temp_profiles()
-    temp_root = pathlib.Path(tempfile.mkdtemp(prefix="presence_profile_"))
-
-    # Local State (contains the cookie‑encryption key)
-    shutil.copy2(pathlib.Path(user_data_root) / "Local State",
-                 temp_root / "Local State")
-
-    # full copy of the chosen profile, keep its original name
-    src = pathlib.Path(user_data_root) / profile_dir
-    dst = temp_root / profile_dir
-    shutil.copytree(src, dst, dirs_exist_ok=True)
+    clone_root, report = clone_profile(user_data_root, profile_dir)
+    print(f"INFO: {report} → {clone_root}")
+    return clone_root
 
-    return str(temp_root)
-
-def cleanup_old_temp_profiles(prefix: str = "presence_profile_") -> None:
+def cleanup_old_temp_profiles() -> None:
     """
-    Remove *all* leftover temp user‑data directories from previous runs.
+    Remove leftover temp user‑data directories from previous runs.
 
-    • Looks in the system temp folder (tempfile.gettempdir())  
-    • Deletes any directory whose name starts with `prefix`  
-    • Silently ignores in‑use or already‑deleted folders
+    Only profiles whose owner process is dead or whose lease outlived the
+    TTL are touched, and unleased clones are capped in total size – a
+    profile another uploader is using right now is never deleted
+    (see uploaders/profile_clone.cleanup_stale_profiles).
     """
-    temp_dir   = pathlib.Path(tempfile.gettempdir())
-    pattern    = re.compile(rf"^{re.escape(prefix)}", re.I)
-
-    for entry in temp_dir.iterdir():
-        try:
-            if entry.is_dir() and pattern.match(entry.name):
-                shutil.rmtree(entry, ignore_errors=True)
-        except Exception:
-            # in case the folder is in use or we lack permissions,
-            # just move on; it will be cleaned up on a future run.
-            pass
+    try:
+        freed = cleanup_stale_profiles()
+        if freed:
+            print(f"INFO: Removed stale temp profiles ({freed / 1e6:.1f} MB)")
+    except Exception as e:
+        # never block a launch on housekeeping; it runs again next time
+        print(f"WARNING: Temp profile cleanup failed: {e}")
 
 # ──────────────────────────────────────────────────────────────
 # BROWSER ACTION FUNCTIONS
@@ -131,6 +124,8 @@ def build_chrome_options(channel_name, chrome_user_data_dir, chrome_exe_path, he
     options.add_argument(f"--remote-debugging-port={_free_port()}")
     options.add_argument(f"--user-data-dir={isolated_user_data}")
     options.add_argument(f"--profile-directory={profile_dir}")
+    # CDP network events for BaseUploader.wait_for("network_idle")
+    options.set_capability("goog:loggingPrefs", {"performance": "ALL"})
 
     if headless:
         options.add_argument("--headless=chrome")
@@ -146,13 +141,7 @@ def build_chrome_options(channel_name, chrome_user_data_dir, chrome_exe_path, he
 # BROWSER START FUNCTIONS
 # ──────────────────────────────────────────────────────────────
 
-def start_browser(channel_name, chrome_user_data_dir, chrome_exe_path, headless=False):
-    """Launch desktop Chrome (optionally headless), using a cloned profile."""
-
-    options = build_chrome_options(channel_name, chrome_user_data_dir, chrome_exe_path, headless)
-
-    driver = webdriver.Chrome(options=options)
-
+def _apply_stealth(driver):
     stealth(
         driver,
         languages=["en-US", "en"],
@@ -163,18 +152,8 @@ def start_browser(channel_name, chrome_user_data_dir, chrome_exe_path, headless=
         fix_hairline=True,
     )
 
-    if not headless:
-        driver.maximize_window()
 
-    time.sleep(1)
-    return driver
-
-
-def start_browser_mobile(channel_name,
-                         chrome_user_data_dir,
-                         chrome_exe_path,
-                         headless=True):
-    """Launch Chrome mobile emulation, isolating profile so multiple runs can coexist."""
+def _apply_mobile_emulation(driver):
     device_metrics = {
         "width": 390, "height": 844, "mobile": True,
         "deviceScaleFactor": 3,
@@ -184,14 +163,153 @@ def start_browser_mobile(channel_name,
                   "AppleWebKit/605.1.15 (KHTML, like Gecko) "
                   "Version/16.0 Mobile/15E148 Safari/604.1")
 
-    options = build_chrome_options(channel_name, chrome_user_data_dir, chrome_exe_path, headless)
+    driver.execute_cdp_cmd("Emulation.setDeviceMetricsOverride", device_metrics)
+    driver.execute_cdp_cmd("Emulation.setUserAgentOverride", {"userAgent": user_agent})
+    driver.execute_cdp_cmd("Emulation.setTouchEmulationEnabled", {"enabled": True})
+
+
+def _borrow_browser(channel_name, chrome_user_data_dir, chrome_exe_path, headless, platform, url, mobile):
+    """Attach to a warm session from the browser broker; None → launch locally."""
+    lease = borrow_session(channel_name, platform, chrome_user_data_dir, chrome_exe_path,
+                           url=url, mobile=mobile, headless=headless)
+    if not lease:
+        return None
+
+    options = webdriver.ChromeOptions()
+    options.debugger_address = lease["debugger_address"]
+    options.binary_location = chrome_exe_path
+    options.set_capability("goog:loggingPrefs", {"performance": "ALL"})
+    try:
+        driver = webdriver.Chrome(options=options)
+    except Exception as e:
+        print(f"WARNING: Could not attach to broker session ({e}) – launching locally.")
+        return_session(lease["id"], healthy=False)
+        return None
+
+    driver._broker_session_id = lease["id"]
+    print(f"INFO: Borrowed warm {platform} session (use #{lease['uses'] + 1}) at {lease['debugger_address']}")
+    return driver
+
+
+def _start_standin_browser(chrome_exe_path, headless):
+    """
+    Throw-away Chrome for runs against the local platform stand-in
+    ($PRESENCE_STANDIN): no channel profile, no broker, no stealth, and every
+    driver.get() is mapped onto the stand-in.
+    """
+    user_data = tempfile.mkdtemp(prefix="presence_standin_")
+    atexit.register(shutil.rmtree, user_data, True)
+
+    options = webdriver.ChromeOptions()
+    options.add_argument("--mute-audio")
+    options.add_argument("--no-first-run")
+    options.add_argument("--no-default-browser-check")
+    options.add_argument(f"--user-data-dir={user_data}")
+    options.set_capability("goog:loggingPrefs", {"performance": "ALL"})
+    if headless:
+        options.add_argument("--headless=new")
+        options.add_argument("--disable-gpu")
+        options.add_argument("--disable-dev-shm-usage")
+    if chrome_exe_path and os.path.exists(chrome_exe_path):
+        options.binary_location = chrome_exe_path
 
-    # ----- start driver -----
     driver = webdriver.Chrome(options=options)
+    get = driver.get
+    driver.get = lambda url: get(standin_url(url))
+    print(f"INFO: Using platform stand-in at {os.environ[STANDIN_ENV]}")
+    return driver
+
+
+def release_browser(driver, healthy=True):
+    """Give a borrowed session back to the broker, or quit a locally launched browser."""
+    session_id = getattr(driver, "_broker_session_id", None)
+    clone_root = getattr(driver, "_clone_root", None)
+    try:
+        # for an attached session this only ends our chromedriver, Chrome keeps running
+        driver.quit()
+    except Exception:
+        pass
+    if session_id:
+        return_session(session_id, healthy=healthy)
+    if clone_root:
+        # hand the profile slot back now instead of when this process exits
+        release_clone(clone_root)
+
+
+def _timed_launch(timings, name, fn, *args, **kwargs):
+    """Call fn, storing its wall time under `timings[name]` (read by BaseUploader as launch spans)."""
+    start = time.perf_counter()
+    try:
+        return fn(*args, **kwargs)
+    finally:
+        timings[name] = round(time.perf_counter() - start, 3)
+
+
+def _launch_cloned(timings, channel_name, chrome_user_data_dir, chrome_exe_path, headless):
+    """Start Chrome on a fresh clone of the channel profile; the clone root is kept on the driver."""
+    options = _timed_launch(timings, "profile_clone", build_chrome_options,
+                            channel_name, chrome_user_data_dir, chrome_exe_path, headless)
+    clone_root = next(a.split("=", 1)[1] for a in options.arguments if a.startswith("--user-data-dir="))
+    try:
+        driver = _timed_launch(timings, "chrome_start", webdriver.Chrome, options=options)
+    except Exception:
+        release_clone(clone_root)
+        raise
+    driver._clone_root = clone_root
+    return driver
+
+
+def start_browser(channel_name, chrome_user_data_dir, chrome_exe_path, headless=False, platform=None, url=""):
+    """
+    Launch desktop Chrome (optionally headless), using a cloned profile.
+    With `platform` set, a warm session is borrowed from the browser broker
+    first (release it with `release_browser`).
+    """
+    timings = {}
+    if os.environ.get(STANDIN_ENV):
+        driver = _timed_launch(timings, "chrome_start", _start_standin_browser, chrome_exe_path, headless)
+        driver.launch_timings = timings
+        return driver
+
+    if platform:
+        driver = _timed_launch(timings, "broker_borrow", _borrow_browser, channel_name, chrome_user_data_dir,
+                               chrome_exe_path, headless, platform, url, False)
+        if driver:
+            _apply_stealth(driver)
+            driver.launch_timings = timings
+            return driver
+
+    driver = _launch_cloned(timings, channel_name, chrome_user_data_dir, chrome_exe_path, headless)
+
+    _apply_stealth(driver)
+
+    if not headless:
+        driver.maximize_window()
+
+    time.sleep(1)
+    driver.launch_timings = timings
+    return driver
+
+
+def start_browser_mobile(channel_name,
+                         chrome_user_data_dir,
+                         chrome_exe_path,
+                         headless=True,
+                         platform=None,
+                         url=""):
+    """Launch Chrome mobile emulation, isolating profile so multiple runs can coexist."""
+    driver, timings = None, {}
+    if os.environ.get(STANDIN_ENV):
+        driver = _timed_launch(timings, "chrome_start", _start_standin_browser, chrome_exe_path, headless)
+    elif platform:
+        driver = _timed_launch(timings, "broker_borrow", _borrow_browser, channel_name, chrome_user_data_dir,
+                               chrome_exe_path, headless, platform, url, True)
+
+    if driver is None:
+        driver = _launch_cloned(timings, channel_name, chrome_user_data_dir, chrome_exe_path, headless)
 
     # mobile emulation
-    driver.execute_cdp_cmd("Emulation.setDeviceMetricsOverride", device_metrics)
-    driver.execute_cdp_cmd("Emulation.setUserAgentOverride", {"userAgent": user_agent})
-    driver.execute_cdp_cmd("Emulation.setTouchEmulationEnabled", {"enabled": True})
+    _apply_mobile_emulation(driver)
 
+    driver.launch_timings = timings
     return driver
@@ -0,0 +1,229 @@
+"""
+upload_log.py
+~~~~~~~~~~~~~
+Append-only history of every upload attempt, shared by all uploaders.
+
+Replaces ``Uploader/Logs/global_uploader_logs.json``, which every writer
+loaded whole, edited and rewrote – O(file) per upload, and two uploaders
+finishing together silently dropped one entry. Here each attempt is one
+INSERT into a SQLite table (WAL mode, so readers never block the writer and
+concurrent writers queue on the database lock instead of overwriting each
+other). Rows are never updated or deleted.
+
+Queries by channel / platform / date range use the ``(channel, platform, ts)``
+and ``(ts)`` indexes. ``latest()`` returns the old JSON shape
+(``{channel: {platform: {last_uploaded, status, exception, log_file}}}``)
+for readers that only want the last result per platform.
+
+The legacy JSON is imported once, the first time the store is opened next to
+it (recorded in the ``meta`` table); the JSON file itself is left untouched.
+
+Example
+-------
+from uploaders.upload_log.upload_log import UploadLog
+
+with UploadLog() as log:
+    log.append("Zoonami", "youtube", "success", log_file=path, post_url="https://youtu.be/…")
+    log.query(channel="Zoonami", since="2025-06-01")     # newest first
+    log.latest()["Zoonami"]["youtube"]["status"]
+
+CLI
+---
+python upload_log.py [--channel C] [--platform P] [--since 2025-06-01] [--until …] [--status failure] [--limit 50]
+python upload_log.py --latest
+python upload_log.py --migrate <global_uploader_logs.json>
+"""
+from __future__ import annotations
+
+import argparse
+import datetime
+import json
+import os
+import sqlite3
+from typing import Dict, List, Optional, Union
+
+LOGS_DIR = "D:\\2025\\Projects\\Presence\\Presence0.1\\Uploader\\Logs"
+DEFAULT_DB = os.path.join(LOGS_DIR, "upload_log.sqlite")
+LEGACY_JSON = os.path.join(LOGS_DIR, "global_uploader_logs.json")
+TS_FORMAT = "%Y-%m-%d %H:%M:%S"   # same as the legacy "last_uploaded"; sorts as text
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS uploads (
+    id        INTEGER PRIMARY KEY,
+    ts        TEXT    NOT NULL,
+    channel   TEXT    NOT NULL,
+    platform  TEXT    NOT NULL,
+    status    TEXT    NOT NULL,
+    exception TEXT    NOT NULL DEFAULT '',
+    log_file  TEXT    NOT NULL DEFAULT '',
+    post_url  TEXT,
+    duration  REAL,
+    clip      TEXT
+)
+"""
+_META_SCHEMA = "CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value TEXT)"
+_INDEXES = (
+    "CREATE INDEX IF NOT EXISTS uploads_channel ON uploads (channel, platform, ts)",
+    "CREATE INDEX IF NOT EXISTS uploads_platform ON uploads (platform, ts)",
+    "CREATE INDEX IF NOT EXISTS uploads_ts ON uploads (ts)",
+)
+_COLUMNS = ("ts", "channel", "platform", "status", "exception", "log_file", "post_url", "duration", "clip")
+
+DateLike = Union[str, datetime.date, datetime.datetime, None]
+
+
+def _ts(value: DateLike) -> Optional[str]:
+    """Normalise a date / datetime / ISO string to the stored text format."""
+    if value is None:
+        return None
+    if isinstance(value, str):
+        value = datetime.datetime.fromisoformat(value)
+    elif not isinstance(value, datetime.datetime):
+        value = datetime.datetime.combine(value, datetime.time())
+    return value.strftime(TS_FORMAT)
+
+
+# ─────────────────────────────────────────────── store
+class UploadLog:
+    def __init__(self, db_path: Optional[str] = None, legacy_json: Optional[str] = LEGACY_JSON):
+        self.db_path = db_path or DEFAULT_DB
+        os.makedirs(os.path.dirname(self.db_path), exist_ok=True)
+        self.conn = sqlite3.connect(self.db_path, timeout=30, isolation_level=None)
+        self.conn.row_factory = sqlite3.Row
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("PRAGMA synchronous=FULL")     # an acknowledged entry survives power loss
+        self.conn.execute(_SCHEMA)
+        self.conn.execute(_META_SCHEMA)
+        for ddl in _INDEXES:
+            self.conn.execute(ddl)
+        if legacy_json and os.path.exists(legacy_json):
+            self.migrate_json(legacy_json)
+
+    def close(self) -> None:
+        self.conn.close()
+
+    def __enter__(self) -> "UploadLog":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+    # ---------------------------------------------------------- writes
+    def append(self, channel: str, platform: str, status: str, exception: str = "", log_file: str = "",
+               post_url: Optional[str] = None, duration: Optional[float] = None, clip: Optional[str] = None,
+               ts: DateLike = None) -> int:
+        """Record one upload attempt; returns its row id."""
+        cur = self.conn.execute(
+            f"INSERT INTO uploads ({', '.join(_COLUMNS)}) VALUES ({', '.join('?' * len(_COLUMNS))})",
+            (_ts(ts) or datetime.datetime.now().strftime(TS_FORMAT), channel, platform, status,
+             exception or "", log_file or "", post_url, duration, clip),
+        )
+        return cur.lastrowid
+
+    def migrate_json(self, path: str) -> int:
+        """Import a legacy global_uploader_logs.json once; returns rows imported (0 if already done)."""
+        key = f"migrated:{os.path.abspath(path).lower()}"
+        self.conn.execute("BEGIN IMMEDIATE")
+        try:
+            if self.conn.execute("SELECT 1 FROM meta WHERE key = ?", (key,)).fetchone():
+                self.conn.execute("COMMIT")
+                return 0
+            try:
+                with open(path, "r", encoding="utf-8") as f:
+                    legacy = json.load(f)
+            except (OSError, ValueError):
+                legacy = {}
+            rows = [
+                (entry.get("last_uploaded") or "1970-01-01 00:00:00", channel, platform,
+                 entry.get("status", ""), entry.get("exception") or "", entry.get("log_file") or "",
+                 None, None, None)
+                for channel, platforms in legacy.items() if isinstance(platforms, dict)
+                for platform, entry in platforms.items() if isinstance(entry, dict)
+            ]
+            self.conn.executemany(
+                f"INSERT INTO uploads ({', '.join(_COLUMNS)}) VALUES ({', '.join('?' * len(_COLUMNS))})", rows)
+            self.conn.execute("INSERT INTO meta (key, value) VALUES (?, ?)",
+                              (key, datetime.datetime.now().strftime(TS_FORMAT)))
+            self.conn.execute("COMMIT")
+            return len(rows)
+        except Exception:
+            self.conn.execute("ROLLBACK")
+            raise
+
+    # ---------------------------------------------------------- reads
+    def query(self, channel: Optional[str] = None, platform: Optional[str] = None, since: DateLike = None,
+              until: DateLike = None, status: Optional[str] = None, limit: Optional[int] = None) -> List[dict]:
+        """Upload attempts matching every given filter, newest first (`until` is exclusive)."""
+        where, params = [], []
+        for column, op, value in (("channel", "=", channel), ("platform", "=", platform),
+                                  ("ts", ">=", _ts(since)), ("ts", "<", _ts(until)), ("status", "=", status)):
+            if value is not None:
+                where.append(f"{column} {op} ?")
+                params.append(value)
+        sql = "SELECT * FROM uploads"
+        if where:
+            sql += " WHERE " + " AND ".join(where)
+        sql += " ORDER BY ts DESC, id DESC"
+        if limit:
+            sql += " LIMIT ?"
+            params.append(int(limit))
+        return [dict(r) for r in self.conn.execute(sql, params)]
+
+    def latest(self, channel: Optional[str] = None, status: Optional[str] = None) -> Dict[str, Dict[str, dict]]:
+        """Last attempt (with `status`, if given) per (channel, platform), shaped like the legacy JSON."""
+        where, params = [], []
+        for column, value in (("channel", channel), ("status", status)):
+            if value is not None:
+                where.append(f"{column} = ?")
+                params.append(value)
+        sql = ("SELECT * FROM uploads WHERE id IN "
+               "(SELECT MAX(id) FROM uploads {} GROUP BY channel, platform) ORDER BY channel, platform")
+        rows = self.conn.execute(sql.format("WHERE " + " AND ".join(where) if where else ""), params)
+        out: Dict[str, Dict[str, dict]] = {}
+        for r in rows:
+            out.setdefault(r["channel"], {})[r["platform"]] = {
+                "last_uploaded": r["ts"],
+                "status": r["status"],
+                "exception": r["exception"],
+                "log_file": r["log_file"],
+                "post_url": r["post_url"],
+                "duration": r["duration"],
+            }
+        return out
+
+
+def log_upload(channel: str, platform: str, status: str, db_path: Optional[str] = None, **fields) -> int:
+    """One-shot append for callers that don't keep a store open."""
+    with UploadLog(db_path) as log:
+        return log.append(channel, platform, status, **fields)
+
+
+# ─────────────────────────────────────────────── CLI
+def main():
+    parser = argparse.ArgumentParser(description="Query the shared upload log")
+    parser.add_argument("--db", default=None, help=f"default: {DEFAULT_DB}")
+    parser.add_argument("--channel")
+    parser.add_argument("--platform")
+    parser.add_argument("--since", help="ISO date/time, inclusive")
+    parser.add_argument("--until", help="ISO date/time, exclusive")
+    parser.add_argument("--status")
+    parser.add_argument("--limit", type=int, default=50)
+    parser.add_argument("--latest", action="store_true", help="last result per channel/platform")
+    parser.add_argument("--migrate", metavar="JSON", help="import a legacy global_uploader_logs.json")
+    args = parser.parse_args()
+
+    with UploadLog(args.db, legacy_json=None) as log:
+        if args.migrate:
+            print(f"{log.migrate_json(args.migrate)} entry(ies) imported")
+        elif args.latest:
+            for channel, platforms in log.latest(args.channel).items():
+                for platform, e in platforms.items():
+                    print(f"{e['last_uploaded']}  {channel:<20} {platform:<12} {e['status']:<8} {e['exception']}")
+        else:
+            for e in log.query(args.channel, args.platform, args.since, args.until, args.status, args.limit):
+                print(f"{e['ts']}  {e['channel']:<20} {e['platform']:<12} {e['status']:<8} "
+                      f"{e['post_url'] or e['exception']}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,245 @@
+"""
+upload_spans.py
+~~~~~~~~~~~~~~~
+Machine-readable timing of every step inside an upload run.
+
+BaseUploader records one *span* per phase (preflight, setup, browser launch,
+profile clone, navigation, execute_steps, teardown), per step-button click,
+per text entry and per event-driven wait – each with its start time,
+duration, outcome ("ok" / "timeout" / "error") and retry count – and appends
+the run's spans here when it finishes. Same storage model as upload_log.py:
+one SQLite file in WAL mode, insert-only, so parallel uploaders never
+overwrite each other.
+
+The summarizer answers "which waits actually cost us" and "did this step get
+slower": p50 / p95 per platform and span, optionally bucketed by day / week /
+month, plus a regression check comparing the latest window against the one
+before it.
+
+Example
+-------
+from uploaders.upload_spans.upload_spans import SpanStore
+
+with SpanStore() as store:
+    store.record([{"run": "…", "platform": "tiktok", "name": "wait:STEP 3 Post", "kind": "wait",
+                   "start": "2025-06-01 12:00:00", "duration": 4.2, "outcome": "ok"}])
+    store.summary(platform="tiktok", since="2025-06-01", period="week")
+    store.regressions(days=7)
+
+CLI
+---
+python upload_spans.py [--platform P] [--kind wait] [--since 2025-06-01] [--period week] [--min-count 3]
+python upload_spans.py --regressions [--days 7] [--ratio 1.5]
+python upload_spans.py --run <run id>
+"""
+from __future__ import annotations
+
+import argparse
+import datetime
+import os
+import sqlite3
+from typing import Dict, Iterable, List, Optional
+
+from uploaders.upload_log.upload_log import LOGS_DIR, TS_FORMAT, DateLike, _ts
+
+DEFAULT_DB = os.path.join(LOGS_DIR, "upload_spans.sqlite")
+KINDS = ("phase", "step", "wait", "text")
+PERIODS = {                                   # SQLite expression bucketing the text timestamp
+    "day": "substr(start, 1, 10)",
+    "week": "strftime('%Y-W%W', start)",
+    "month": "substr(start, 1, 7)",
+}
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS spans (
+    id        INTEGER PRIMARY KEY,
+    run       TEXT    NOT NULL,
+    start     TEXT    NOT NULL,
+    channel   TEXT    NOT NULL DEFAULT '',
+    platform  TEXT    NOT NULL,
+    name      TEXT    NOT NULL,
+    kind      TEXT    NOT NULL,
+    duration  REAL    NOT NULL,
+    outcome   TEXT    NOT NULL DEFAULT 'ok',
+    attempt   INTEGER NOT NULL DEFAULT 1,
+    retries   INTEGER NOT NULL DEFAULT 0
+)
+"""
+_INDEXES = (
+    "CREATE INDEX IF NOT EXISTS spans_platform ON spans (platform, name, start)",
+    "CREATE INDEX IF NOT EXISTS spans_start ON spans (start)",
+    "CREATE INDEX IF NOT EXISTS spans_run ON spans (run)",
+)
+_COLUMNS = ("run", "start", "channel", "platform", "name", "kind", "duration", "outcome", "attempt", "retries")
+
+
+def percentile(values: List[float], q: float) -> float:
+    """Linear-interpolated percentile, q in [0, 1]."""
+    ordered = sorted(values)
+    if not ordered:
+        return 0.0
+    k = (len(ordered) - 1) * q
+    lo = int(k)
+    hi = min(lo + 1, len(ordered) - 1)
+    return ordered[lo] + (ordered[hi] - ordered[lo]) * (k - lo)
+
+
+# ─────────────────────────────────────────────── store
+class SpanStore:
+    def __init__(self, db_path: Optional[str] = None):
+        self.db_path = db_path or DEFAULT_DB
+        os.makedirs(os.path.dirname(self.db_path), exist_ok=True)
+        self.conn = sqlite3.connect(self.db_path, timeout=30, isolation_level=None)
+        self.conn.row_factory = sqlite3.Row
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute(_SCHEMA)
+        for ddl in _INDEXES:
+            self.conn.execute(ddl)
+
+    def close(self) -> None:
+        self.conn.close()
+
+    def __enter__(self) -> "SpanStore":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+    # ---------------------------------------------------------- writes
+    def record(self, spans: Iterable[dict]) -> int:
+        """Append one run's spans in a single transaction; returns the number written."""
+        rows = [
+            (s["run"], _ts(s["start"]), s.get("channel") or "", s["platform"], s["name"], s.get("kind", "step"),
+             float(s["duration"]), s.get("outcome", "ok"), int(s.get("attempt", 1)), int(s.get("retries", 0)))
+            for s in spans
+        ]
+        if rows:
+            self.conn.execute("BEGIN IMMEDIATE")
+            try:
+                self.conn.executemany(
+                    f"INSERT INTO spans ({', '.join(_COLUMNS)}) VALUES ({', '.join('?' * len(_COLUMNS))})", rows)
+                self.conn.execute("COMMIT")
+            except Exception:
+                self.conn.execute("ROLLBACK")
+                raise
+        return len(rows)
+
+    # ---------------------------------------------------------- reads
+    def query(self, platform: Optional[str] = None, name: Optional[str] = None, kind: Optional[str] = None,
+              since: DateLike = None, until: DateLike = None, run: Optional[str] = None) -> List[dict]:
+        """Spans matching every given filter, in start order (`until` is exclusive)."""
+        where, params = [], []
+        for column, op, value in (("platform", "=", platform), ("name", "=", name), ("kind", "=", kind),
+                                  ("start", ">=", _ts(since)), ("start", "<", _ts(until)), ("run", "=", run)):
+            if value is not None:
+                where.append(f"{column} {op} ?")
+                params.append(value)
+        sql = "SELECT * FROM spans"
+        if where:
+            sql += " WHERE " + " AND ".join(where)
+        return [dict(r) for r in self.conn.execute(sql + " ORDER BY start, id", params)]
+
+    def summary(self, platform: Optional[str] = None, kind: Optional[str] = None, since: DateLike = None,
+                until: DateLike = None, period: Optional[str] = None, min_count: int = 1) -> List[dict]:
+        """
+        p50 / p95 / max / total seconds per (platform, span name[, period]),
+        with how often the span timed out or failed and how many retries it took.
+        Sorted by total time spent, largest first.
+        """
+        bucket = PERIODS[period] if period else "''"
+        where, params = [], []
+        for column, op, value in (("platform", "=", platform), ("kind", "=", kind),
+                                  ("start", ">=", _ts(since)), ("start", "<", _ts(until))):
+            if value is not None:
+                where.append(f"{column} {op} ?")
+                params.append(value)
+        sql = f"SELECT {bucket} AS period, platform, name, kind, duration, outcome, retries FROM spans"
+        if where:
+            sql += " WHERE " + " AND ".join(where)
+
+        groups: Dict[tuple, List[sqlite3.Row]] = {}
+        for r in self.conn.execute(sql, params):
+            groups.setdefault((r["period"], r["platform"], r["name"], r["kind"]), []).append(r)
+
+        out = []
+        for (bucket_value, plat, name, span_kind), rows in groups.items():
+            if len(rows) < min_count:
+                continue
+            durations = [r["duration"] for r in rows]
+            out.append({
+                "period": bucket_value or None,
+                "platform": plat,
+                "name": name,
+                "kind": span_kind,
+                "count": len(rows),
+                "p50": round(percentile(durations, 0.5), 3),
+                "p95": round(percentile(durations, 0.95), 3),
+                "max": round(max(durations), 3),
+                "total": round(sum(durations), 3),
+                "not_ok": sum(r["outcome"] != "ok" for r in rows),
+                "retries": sum(r["retries"] for r in rows),
+            })
+        out.sort(key=lambda s: (s["period"] or "", -s["total"]))
+        return out
+
+    def regressions(self, days: float = 7, ratio: float = 1.5, min_count: int = 3,
+                    now: Optional[datetime.datetime] = None) -> List[dict]:
+        """
+        Spans whose p95 over the last `days` is at least `ratio`× their p95 in
+        the `days` before that (both windows need `min_count` samples).
+        """
+        now = now or datetime.datetime.now()
+        window = datetime.timedelta(days=days)
+        recent = {(s["platform"], s["name"]): s
+                  for s in self.summary(since=now - window, until=now, min_count=min_count)}
+        before = {(s["platform"], s["name"]): s
+                  for s in self.summary(since=now - 2 * window, until=now - window, min_count=min_count)}
+        out = []
+        for key, cur in recent.items():
+            prev = before.get(key)
+            if prev and prev["p95"] > 0 and cur["p95"] >= ratio * prev["p95"]:
+                out.append({"platform": key[0], "name": key[1], "before_p95": prev["p95"],
+                            "recent_p95": cur["p95"], "ratio": round(cur["p95"] / prev["p95"], 2)})
+        return sorted(out, key=lambda r: -r["ratio"])
+
+
+def record_spans(spans: List[dict], db_path: Optional[str] = None) -> int:
+    """One-shot append for callers that don't keep a store open."""
+    with SpanStore(db_path) as store:
+        return store.record(spans)
+
+
+# ─────────────────────────────────────────────── CLI
+def main():
+    parser = argparse.ArgumentParser(description="Summarise per-step upload timings")
+    parser.add_argument("--db", default=None, help=f"default: {DEFAULT_DB}")
+    parser.add_argument("--platform")
+    parser.add_argument("--kind", choices=KINDS)
+    parser.add_argument("--since", help="ISO date/time, inclusive")
+    parser.add_argument("--until", help="ISO date/time, exclusive")
+    parser.add_argument("--period", choices=sorted(PERIODS), help="bucket the summary over time")
+    parser.add_argument("--min-count", type=int, default=1)
+    parser.add_argument("--regressions", action="store_true", help="p95 of the last --days vs. the days before")
+    parser.add_argument("--days", type=float, default=7)
+    parser.add_argument("--ratio", type=float, default=1.5)
+    parser.add_argument("--run", help="list the spans of one run")
+    args = parser.parse_args()
+
+    with SpanStore(args.db) as store:
+        if args.run:
+            for s in store.query(run=args.run):
+                print(f"{s['start']}  {s['kind']:<5} {s['name']:<40} {s['duration']:>8.2f}s  {s['outcome']}"
+                      f"{'  retries ' + str(s['retries']) if s['retries'] else ''}")
+        elif args.regressions:
+            for r in store.regressions(args.days, args.ratio, max(args.min_count, 3)):
+                print(f"{r['platform']:<16} {r['name']:<40} p95 {r['before_p95']:>7.2f}s → "
+                      f"{r['recent_p95']:>7.2f}s  ×{r['ratio']}")
+        else:
+            print(f"{'period':<10} {'platform':<16} {'span':<40} {'n':>4} {'p50':>8} {'p95':>8} {'total':>9} not-ok")
+            for s in store.summary(args.platform, args.kind, args.since, args.until, args.period, args.min_count):
+                print(f"{s['period'] or '-':<10} {s['platform']:<16} {s['name']:<40} {s['count']:>4} "
+                      f"{s['p50']:>7.2f}s {s['p95']:>7.2f}s {s['total']:>8.1f}s {s['not_ok']:>5}")
+
+
+if __name__ == "__main__":
+    main()
@@ -5,13 +5,15 @@ import json
 import os
 
 
-def create_json(text, description, output_dir):
+def create_json(text, description, output_dir, extra=None):
     creation_timestamp = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
     metadata = {
         "title": text,
         "description": description,
         "creation_timestamp": creation_timestamp,
     }
+    if extra:
+        metadata.update(extra)
     with open(output_dir / "metadata.json", "w", encoding="utf-8") as f:
         json.dump(metadata, f, indent=4)
 
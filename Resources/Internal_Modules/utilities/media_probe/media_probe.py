@@ -0,0 +1,388 @@
+"""
+media_probe.py
+~~~~~~~~~~~~~~
+Shared, persistent index of video metadata (duration, resolution, fps,
+rotation, codecs, streams and – on request – keyframe timestamps), plus
+per-source shot boundaries with brightness/motion stats for cut selection.
+
+Every file is probed with a single ``ffprobe`` JSON call and the result is
+stored in a local SQLite database keyed by absolute path + size + mtime, so
+a file is only probed again after it changes. Tools that scan large media
+libraries ask the index instead of opening each video.
+
+Example
+-------
+from utilities.media_probe.media_probe import probe_media, probe_directory
+
+info = probe_media(r"D:\\Videos\\lion.mp4")                # dict or None
+print(info["duration"], info["width"], info["height"])
+
+kf = probe_media(r"D:\\Videos\\lion.mp4", keyframes=True)["keyframes"]
+probe_directory(r"D:\\Videos", workers=8)                  # warm the index
+
+shots = analyze_scenes(r"D:\\Videos\\lion.mp4")          # [{start, end, brightness, motion}, ...]
+
+CLI
+---
+python media_probe.py <directory> [--keyframes] [--scenes] [--workers N]
+"""
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import shutil
+import sqlite3
+import subprocess
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional
+
+import numpy as np
+
+DEFAULT_DB_PATH = Path(__file__).parent / "media_probe_index.sqlite"
+PACKAGED_FFMPEG_DIR = Path(__file__).resolve().parents[3] / "Packages" / "ffmpeg" / "bin"
+VIDEO_EXTENSIONS = (".mp4", ".mov", ".avi", ".mkv", ".webm")
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS probes (
+    path        TEXT PRIMARY KEY,
+    size        INTEGER NOT NULL,
+    mtime_ns    INTEGER NOT NULL,
+    duration    REAL,
+    width       INTEGER,
+    height      INTEGER,
+    fps         REAL,
+    rotation    INTEGER,
+    video_codec TEXT,
+    pix_fmt     TEXT,
+    audio_codec TEXT,
+    streams     TEXT NOT NULL,   -- raw ffprobe stream list (JSON)
+    keyframes   TEXT             -- JSON list of seconds, NULL until requested
+)
+"""
+_SCENES_SCHEMA = """
+CREATE TABLE IF NOT EXISTS scenes (
+    path        TEXT PRIMARY KEY,
+    size        INTEGER NOT NULL,
+    mtime_ns    INTEGER NOT NULL,
+    params      TEXT NOT NULL,   -- analysis settings the shots were computed with
+    shots       TEXT NOT NULL    -- JSON list of {start, end, brightness, motion}
+)
+"""
+_COLUMNS = ("duration", "width", "height", "fps", "rotation", "video_codec", "pix_fmt", "audio_codec")
+
+
+# ─────────────────────────────────────────────── ffmpeg tools
+def find_ffmpeg_tool(name: str) -> Optional[str]:
+    """
+    Locate ffmpeg/ffprobe: PATH first, then Resources/Packages/ffmpeg/bin;
+    ffmpeg finally falls back to the binary bundled with moviepy.
+    """
+    path = shutil.which(name) or shutil.which(name, path=str(PACKAGED_FFMPEG_DIR))
+    if path or name != "ffmpeg":
+        return path
+    try:
+        import imageio_ffmpeg
+        return imageio_ffmpeg.get_ffmpeg_exe()
+    except Exception:
+        return None
+
+
+def _parse_rate(rate: Optional[str]) -> float:
+    num, _, den = (rate or "0/1").partition("/")
+    den = float(den or 1)
+    return float(num) / den if den else 0.0
+
+
+def parse_probe(data: dict) -> Optional[dict]:
+    """Flatten ffprobe JSON into the fields the tools care about (None if there's no video stream)."""
+    streams = data.get("streams", [])
+    video = next((s for s in streams if s.get("codec_type") == "video"), None)
+    audio = next((s for s in streams if s.get("codec_type") == "audio"), None)
+    if video is None:
+        return None
+
+    rotation = int(float(video.get("tags", {}).get("rotate", 0)))
+    for side in video.get("side_data_list", []):
+        if "rotation" in side:
+            rotation = int(float(side["rotation"]))
+    rotation %= 360
+
+    width, height = int(video["width"]), int(video["height"])
+    if rotation in (90, 270):      # report the displayed frame, like ffmpeg/moviepy do
+        width, height = height, width
+
+    info = {
+        "duration": float(data.get("format", {}).get("duration") or video.get("duration") or 0),
+        "width": width,
+        "height": height,
+        "fps": _parse_rate(video.get("avg_frame_rate")) or _parse_rate(video.get("r_frame_rate")),
+        "rotation": rotation,
+        "video_codec": video.get("codec_name"),
+        "pix_fmt": video.get("pix_fmt"),
+        "audio_codec": audio.get("codec_name") if audio else None,
+        "streams": streams,
+        "keyframes": None,
+    }
+
+    if "packets" in data:
+        index = video.get("index", 0)
+        info["keyframes"] = sorted(
+            float(p["pts_time"]) for p in data["packets"]
+            if p.get("stream_index") == index and "K" in p.get("flags", "") and p.get("pts_time") not in (None, "N/A")
+        )
+    return info
+
+
+def run_ffprobe(path: str, keyframes: bool = False) -> Optional[dict]:
+    """One ffprobe call (headers only; keyframes come from packet flags, no decoding)."""
+    ffprobe = find_ffmpeg_tool("ffprobe")
+    if not ffprobe:
+        return None
+
+    entries = "format:stream"
+    if keyframes:
+        entries += ":packet=stream_index,pts_time,flags"
+    try:
+        out = subprocess.run(
+            [ffprobe, "-v", "error", "-print_format", "json", "-show_entries", entries, path],
+            capture_output=True, check=True, text=True, encoding="utf-8",
+        ).stdout
+    except (OSError, subprocess.CalledProcessError):
+        return None
+    return parse_probe(json.loads(out))
+
+
+# ─────────────────────────────────────────────── index
+def _connect(db_path: Optional[os.PathLike]) -> sqlite3.Connection:
+    conn = sqlite3.connect(str(db_path or DEFAULT_DB_PATH), timeout=30)
+    conn.execute("PRAGMA journal_mode=WAL")
+    conn.execute(_SCHEMA)
+    conn.execute(_SCENES_SCHEMA)
+    return conn
+
+
+def _file_key(path: str):
+    st = os.stat(path)
+    return os.path.abspath(path), st.st_size, st.st_mtime_ns
+
+
+def _row_to_info(row: sqlite3.Row) -> dict:
+    info = {col: row[col] for col in _COLUMNS}
+    info["streams"] = json.loads(row["streams"])
+    info["keyframes"] = json.loads(row["keyframes"]) if row["keyframes"] is not None else None
+    return info
+
+
+def _lookup(conn: sqlite3.Connection, key, keyframes: bool) -> Optional[dict]:
+    conn.row_factory = sqlite3.Row
+    row = conn.execute(
+        "SELECT * FROM probes WHERE path = ? AND size = ? AND mtime_ns = ?", key
+    ).fetchone()
+    if row is None or (keyframes and row["keyframes"] is None):
+        return None
+    return _row_to_info(row)
+
+
+def _store(conn: sqlite3.Connection, key, info: dict) -> None:
+    with conn:
+        conn.execute(
+            "INSERT OR REPLACE INTO probes (path, size, mtime_ns, " + ", ".join(_COLUMNS) + ", streams, keyframes) "
+            "VALUES (?, ?, ?, " + ", ".join("?" for _ in _COLUMNS) + ", ?, ?)",
+            (*key, *(info[col] for col in _COLUMNS), json.dumps(info["streams"]),
+             json.dumps(info["keyframes"]) if info["keyframes"] is not None else None),
+        )
+
+
+def probe_media(path: str, keyframes: bool = False, db_path: Optional[os.PathLike] = None) -> Optional[dict]:
+    """
+    Return cached metadata for *path*, probing (and caching) it on a miss.
+    With ``keyframes=True`` the entry is guaranteed to include keyframe times.
+    Returns None if the file has no video stream or ffprobe is unavailable.
+    """
+    try:
+        key = _file_key(path)
+    except OSError:
+        return None
+
+    conn = _connect(db_path)
+    try:
+        info = _lookup(conn, key, keyframes)
+        if info is None:
+            info = run_ffprobe(key[0], keyframes)
+            if info is not None:
+                _store(conn, key, info)
+        return info
+    finally:
+        conn.close()
+
+
+def probe_directory(
+    directory: str,
+    extensions: Iterable[str] = VIDEO_EXTENSIONS,
+    keyframes: bool = False,
+    workers: Optional[int] = None,
+    recursive: bool = True,
+    db_path: Optional[os.PathLike] = None,
+) -> Dict[str, dict]:
+    """
+    Probe every video under *directory* in parallel and return ``{path: info}``.
+    Unchanged files are answered from the index without spawning ffprobe.
+    """
+    extensions = tuple(e.lower() for e in extensions)
+    pattern = "**/*" if recursive else "*"
+    paths = [os.path.abspath(p) for p in Path(directory).glob(pattern) if p.is_file() and p.suffix.lower() in extensions]
+
+    conn = _connect(db_path)
+    results: Dict[str, dict] = {}
+    misses: List[tuple] = []
+    gone = 0
+    try:
+        for path in paths:
+            try:
+                key = _file_key(path)
+            except OSError:            # deleted / moved since the listing
+                gone += 1
+                continue
+            info = _lookup(conn, key, keyframes)
+            if info is None:
+                misses.append(key)
+            else:
+                results[path] = info
+
+        # ffprobe runs in threads; all SQLite writes stay on this thread
+        with ThreadPoolExecutor(max_workers=workers or os.cpu_count() or 4) as pool:
+            for key, info in zip(misses, pool.map(lambda k: run_ffprobe(k[0], keyframes), misses)):
+                if info is not None:
+                    _store(conn, key, info)
+                    results[key[0]] = info
+    finally:
+        conn.close()
+
+    print(f"📼 {len(paths)} videos in {directory}: {len(paths) - len(misses) - gone} cached, {len(misses)} probed"
+          + (f", {gone} gone" if gone else ""))
+    return results
+
+
+# ─────────────────────────────────────────────── scene analysis
+SCENE_WIDTH = 160          # analysis frame width in pixels
+SCENE_SAMPLE_FPS = 10      # analysed frames per second of video
+SCENE_THRESHOLD = 0.35     # histogram distance (0..1) that counts as a cut
+MIN_SHOT_SECONDS = 0.5     # ignore cuts closer together than this (flashes, flicker)
+
+
+def _detect_shots(frames: Iterable[np.ndarray], sample_fps: float, threshold: float) -> List[dict]:
+    """Split a stream of small grayscale frames into shots with mean brightness/motion (0..255)."""
+    shots: List[dict] = []
+    cur = {"start": 0.0, "brightness": [], "motion": []}
+    prev, prev_hist, t = None, None, 0.0
+
+    for i, frame in enumerate(frames):
+        t = i / sample_fps
+        hist = np.bincount(frame.ravel() >> 3, minlength=32) / frame.size   # 32-bin luma histogram
+        if prev is not None:
+            if 0.5 * np.abs(hist - prev_hist).sum() >= threshold and t - cur["start"] >= MIN_SHOT_SECONDS:
+                shots.append(cur)
+                cur = {"start": t, "brightness": [], "motion": []}
+            else:
+                cur["motion"].append(float(np.abs(frame.astype(np.int16) - prev).mean()))
+        cur["brightness"].append(float(frame.mean()))
+        prev, prev_hist = frame.astype(np.int16), hist
+
+    if prev is not None:
+        shots.append(cur)
+
+    end = t + 1 / sample_fps
+    for shot, nxt in zip(shots, shots[1:] + [None]):
+        shot["end"] = nxt["start"] if nxt else end
+        shot["brightness"] = round(sum(shot["brightness"]) / len(shot["brightness"]), 2)
+        shot["motion"] = round(sum(shot["motion"]) / len(shot["motion"]), 3) if shot["motion"] else 0.0
+    return shots
+
+
+def _read_frames(path: str, width: int, height: int, sample_fps: float):
+    ffmpeg = find_ffmpeg_tool("ffmpeg")
+    if not ffmpeg:
+        return
+    cmd = [ffmpeg, "-v", "error", "-i", path, "-an", "-sn",
+           "-vf", f"fps={sample_fps},scale={width}:{height},format=gray",
+           "-f", "rawvideo", "pipe:1"]
+    frame_bytes = width * height
+    with subprocess.Popen(cmd, stdout=subprocess.PIPE, stderr=subprocess.DEVNULL) as proc:
+        while True:
+            buf = proc.stdout.read(frame_bytes)
+            if len(buf) < frame_bytes:
+                break
+            yield np.frombuffer(buf, dtype=np.uint8).reshape(height, width)
+        # a failed decode stops early – its frames are not the whole video
+        if proc.wait() != 0:
+            raise subprocess.CalledProcessError(proc.returncode, cmd)
+
+
+def analyze_scenes(
+    path: str,
+    sample_fps: float = SCENE_SAMPLE_FPS,
+    threshold: float = SCENE_THRESHOLD,
+    db_path: Optional[os.PathLike] = None,
+) -> Optional[List[dict]]:
+    """
+    Shot boundaries of *path* as ``[{start, end, brightness, motion}, ...]``.
+
+    Runs once per source (and analysis settings): a single downscaled
+    grayscale ffmpeg pass, compared frame-to-frame with luma histograms.
+    Later calls are answered from the index. Returns None without ffmpeg or
+    when the ffmpeg pass fails; nothing is cached then.
+    """
+    try:
+        key = _file_key(path)
+    except OSError:
+        return None
+    params = json.dumps({"width": SCENE_WIDTH, "fps": sample_fps, "threshold": threshold})
+
+    conn = _connect(db_path)
+    try:
+        row = conn.execute(
+            "SELECT shots FROM scenes WHERE path = ? AND size = ? AND mtime_ns = ? AND params = ?", (*key, params)
+        ).fetchone()
+        if row is not None:
+            return json.loads(row[0])
+
+        info = probe_media(key[0], db_path=db_path)
+        height = 90
+        if info and info["width"]:
+            height = max(2, round(SCENE_WIDTH * info["height"] / info["width"] / 2) * 2)
+
+        try:
+            shots = _detect_shots(_read_frames(key[0], SCENE_WIDTH, height, sample_fps), sample_fps, threshold)
+        except subprocess.CalledProcessError:
+            return None
+        if not shots:
+            return None
+        with conn:
+            conn.execute("INSERT OR REPLACE INTO scenes (path, size, mtime_ns, params, shots) VALUES (?, ?, ?, ?, ?)",
+                         (*key, params, json.dumps(shots)))
+        return shots
+    finally:
+        conn.close()
+
+
+# ─────────────────────────────────────────────── CLI
+def main():
+    parser = argparse.ArgumentParser(description="Probe a media directory into the shared probe index")
+    parser.add_argument("directory", help="Folder to scan (recursively)")
+    parser.add_argument("--keyframes", action="store_true", help="Also index keyframe timestamps")
+    parser.add_argument("--scenes", action="store_true", help="Also run scene analysis (one decode per new video)")
+    parser.add_argument("--workers", type=int, default=None, help="Parallel ffprobe processes (default: CPU count)")
+    parser.add_argument("--db", default=None, help=f"Index database (default: {DEFAULT_DB_PATH})")
+    args = parser.parse_args()
+
+    probed = probe_directory(args.directory, keyframes=args.keyframes, workers=args.workers, db_path=args.db)
+    if args.scenes:
+        with ThreadPoolExecutor(max_workers=args.workers or os.cpu_count() or 4) as pool:
+            for path, shots in zip(probed, pool.map(lambda p: analyze_scenes(p, db_path=args.db), probed)):
+                print(f"🎞️  {path}: {len(shots or [])} shots")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,25 +1,53 @@
 import os
+import re
 import json
 import shutil
 import time
 import sys
 import subprocess
+from collections import deque
 from datetime import datetime
 from send2trash import send2trash
 from PyQt5.QtWidgets import (QApplication, QMainWindow, QWidget, QVBoxLayout, QHBoxLayout, 
                             QLabel, QPushButton, QListWidget, QCheckBox, QTableWidget, 
                             QTableWidgetItem, QScrollArea, QFrame, QSplitter, QHeaderView, 
-                            QMessageBox, QGroupBox, QGridLayout, QTextEdit)
+                            QMessageBox, QGroupBox, QGridLayout, QTextEdit, QProgressBar, QDockWidget,
+                            QTableView, QLineEdit)
 from PyQt5.QtGui import QFont, QIcon, QClipboard, QColor, QTextCursor
-from PyQt5.QtCore import Qt, QSize, QTimer, QThread, pyqtSignal
+from PyQt5.QtCore import (Qt, QSize, QTimer, QThread, QObject, QProcess, QProcessEnvironment,
+                          pyqtSignal, QAbstractTableModel, QModelIndex, QSortFilterProxyModel,
+                          QFileSystemWatcher)
+
+INTERNAL_MODULES_DIR = "D:\\2025\\Projects\\Presence\\Presence0.1\\Resources\\Internal_Modules"
+sys.path.insert(0, INTERNAL_MODULES_DIR)
+from uploaders.upload_log.upload_log import UploadLog, log_upload
 
 # Constants
 CHANNELS_DIR = "D:/2025/Projects/Presence/Presence0.1/Channels"  # This can be changed as needed
 
+UPLOAD_HISTORY_ROWS = 10
+CLIP_SCAN_DEBOUNCE_MS = 300         # coalesce bursts of filesystem events into one rescan
+
 # Uploader script paths
-YOUTUBE_UPLOADER = r"D:\\2025\\Projects\\Presence\\Presence0.1\\Uploader\\Platforms\\Youtube\\Uploader_Youtube\\Code\\Uploader_YouTube.py"
-TIKTOK_UPLOADER = r"D:\\2025\\Projects\\Presence\\Presence0.1\\Uploader\\Platforms\\Tiktok\\Uploader_Tiktok\\Code\\Uploader_TikTok.py"
-INSTAGRAM_UPLOADER = r"D:\\2025\\Projects\\Presence\\Presence0.1\\Uploader\\Platforms\\Instagram\\Uploader_Instagram\\Code\\Uploader_Instagram.py"
+YOUTUBE_UPLOADER = r"D:\\2025\\Projects\\Presence\\Presence0.1\\Uploader\\Platforms\\Youtube\\Uploader_Youtube\\Code\\Uploader_YouTube_Post.py"
+TIKTOK_UPLOADER = r"D:\\2025\\Projects\\Presence\\Presence0.1\\Uploader\\Platforms\\Tiktok\\Uploader_Tiktok\\Code\\Uploader_TikTok_Post.py"
+INSTAGRAM_UPLOADER = r"D:\\2025\\Projects\\Presence\\Presence0.1\\Uploader\\Platforms\\Instagram\\Uploader_Instagram\\Code\\Uploader_Instagram_Post.py"
+
+# Upload queue
+MAX_CONCURRENT_UPLOADS = 2          # uploader processes running at once; never two for one channel + platform
+UPLOAD_OUTPUT_LINES = 200           # uploader output lines kept per job
+UPLOAD_CANCEL_GRACE_MS = 5000       # terminate → kill
+# uploader log line → (progress %, stage); matched in order, progress never goes back
+UPLOAD_PROGRESS_MARKERS = [
+    (re.compile(r"Logging initialized"), 5, "Starting"),
+    (re.compile(r"PREFLIGHT"), 10, "Checking media"),
+    (re.compile(r"WAIT|STEP 1\b"), 20, None),
+    (re.compile(r"CHECKPOINT media_uploaded"), 50, "Uploaded"),
+    (re.compile(r"CHECKPOINT metadata_filled"), 70, "Details filled"),
+    (re.compile(r"CHECKPOINT publishing"), 90, "Publishing"),
+    (re.compile(r"CHECKPOINT published"), 100, "Published"),
+]
+UPLOAD_STEP_LINE = re.compile(r"(STEP [\d\-]+:.*)$")
 
 class ModernStyle:
     """Class to define modern UI styling constants"""
@@ -208,16 +236,16 @@ class ModernStyle:
     """
     
     TABLE_STYLE = f"""
-        QTableWidget {{
+        QTableView {{
             background-color: {CARD_COLOR};
             border-radius: {BORDER_RADIUS};
             border: 1px solid {BORDER_COLOR};
             gridline-color: {BORDER_COLOR};
         }}
-        QTableWidget::item {{
+        QTableView::item {{
             padding: 5px;
         }}
-        QTableWidget::item:selected {{
+        QTableView::item:selected {{
             background-color: {PRIMARY_COLOR};
             color: white;
         }}
@@ -419,14 +447,203 @@ class CredentialsWidget(QWidget):
                 ToastNotification(main_parent, "Credentials copied to clipboard!")
 
 
+class ClipScanThread(QThread):
+    """Lists the clip folders of one directory off the GUI thread"""
+    scanned = pyqtSignal(str, int, dict, dict)
+    
+    def __init__(self, root, generation, cache, parent=None):
+        super().__init__(parent)
+        self.root = root
+        self.generation = generation
+        self.cache = cache
+    
+    def run(self):
+        """Thread run method"""
+        entries, cache = {}, {}
+        try:
+            with os.scandir(self.root) as it:
+                for item in it:
+                    if not item.is_dir():
+                        continue
+                    stat = item.stat()          # from the directory listing on Windows, no extra call
+                    cached = self.cache.get(item.name)
+                    if cached and cached[0] == stat.st_mtime_ns:
+                        entry = cached[1]
+                    else:
+                        entry = {"name": item.name, "created": stat.st_ctime, "files": self.count_files(item.path)}
+                    entries[item.name] = entry
+                    cache[item.name] = (stat.st_mtime_ns, entry)
+        except OSError as e:
+            print(f"Error scanning {self.root}: {e}")
+        self.scanned.emit(self.root, self.generation, entries, cache)
+    
+    @staticmethod
+    def count_files(path):
+        try:
+            with os.scandir(path) as it:
+                return sum(1 for item in it if item.is_file())
+        except OSError:
+            return 0
+
+
+class ClipFolderModel(QAbstractTableModel):
+    """
+    The folders of one directory (Clips / Clips_Archive) as table rows.
+    
+    Scans run on a ClipScanThread and are diffed against the current rows, so
+    a refresh only inserts, removes or updates what changed; per-folder
+    metadata is cached by the folder's mtime. A QFileSystemWatcher on the
+    directory triggers the refresh. Sorting and filtering are left to a
+    QSortFilterProxyModel (SORT_ROLE holds the raw values).
+    """
+    COLUMNS = ["Folder Name", "Created", "Files"]
+    SORT_ROLE = Qt.UserRole
+    
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.root = None
+        self.rows = []
+        self.row_of = {}                # folder name → row
+        self.cache = {}                 # folder name → (mtime_ns, entry)
+        self.generation = 0             # bumped on set_root; stale scan results are dropped
+        self.scan_thread = None
+        self.rescan_pending = False
+        
+        self.debounce = QTimer(self)
+        self.debounce.setSingleShot(True)
+        self.debounce.setInterval(CLIP_SCAN_DEBOUNCE_MS)
+        self.debounce.timeout.connect(self.refresh)
+        
+        self.watcher = QFileSystemWatcher(self)
+        self.watcher.directoryChanged.connect(lambda path: self.debounce.start())
+    
+    # ---------- model API ----------
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self.rows)
+    
+    def columnCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self.COLUMNS)
+    
+    def headerData(self, section, orientation, role=Qt.DisplayRole):
+        if orientation == Qt.Horizontal and role == Qt.DisplayRole:
+            return self.COLUMNS[section]
+        return None
+    
+    def data(self, index, role=Qt.DisplayRole):
+        if not index.isValid():
+            return None
+        entry = self.rows[index.row()]
+        column = index.column()
+        if role == Qt.DisplayRole:
+            if column == 0:
+                return entry["name"]
+            if column == 1:
+                return datetime.fromtimestamp(entry["created"]).strftime("%Y-%m-%d %H:%M")
+            return str(entry["files"])
+        if role == self.SORT_ROLE:
+            return (entry["name"].lower(), entry["created"], entry["files"])[column]
+        return None
+    
+    # ---------- refresh ----------
+    def set_root(self, path):
+        """Show the folders of `path`; the same path just refreshes"""
+        if path == self.root:
+            self.refresh()
+            return
+        if self.watcher.directories():
+            self.watcher.removePaths(self.watcher.directories())
+        self.beginResetModel()
+        self.rows, self.row_of, self.cache = [], {}, {}
+        self.endResetModel()
+        self.root = path
+        self.generation += 1
+        if os.path.isdir(path):
+            self.watcher.addPath(path)
+        self.refresh()
+    
+    def refresh(self):
+        """Rescan in the background; rows change when the scan comes back"""
+        if not self.root:
+            return
+        if self.scan_thread is not None:
+            self.rescan_pending = True
+            return
+        self.scan_thread = ClipScanThread(self.root, self.generation, dict(self.cache), self)
+        self.scan_thread.scanned.connect(self.apply_scan)
+        self.scan_thread.finished.connect(self.scan_finished)
+        self.scan_thread.start()
+    
+    def scan_finished(self):
+        self.scan_thread.deleteLater()
+        self.scan_thread = None
+        if self.rescan_pending:
+            self.rescan_pending = False
+            self.refresh()
+    
+    def apply_scan(self, root, generation, entries, cache):
+        """Apply the difference between the scan and the current rows"""
+        if generation != self.generation:
+            return
+        self.cache = cache
+        if self.root not in self.watcher.directories() and os.path.isdir(self.root):
+            self.watcher.addPath(self.root)     # created after set_root
+        
+        removed = sorted((self.row_of[name] for name in self.row_of if name not in entries), reverse=True)
+        for row in removed:
+            self.beginRemoveRows(QModelIndex(), row, row)
+            del self.rows[row]
+            self.endRemoveRows()
+        if removed:
+            self.row_of = {entry["name"]: row for row, entry in enumerate(self.rows)}
+        
+        for name, entry in entries.items():
+            row = self.row_of.get(name)
+            if row is not None and self.rows[row] != entry:
+                self.rows[row] = entry
+                self.dataChanged.emit(self.index(row, 0), self.index(row, len(self.COLUMNS) - 1))
+        
+        added = [entry for name, entry in entries.items() if name not in self.row_of]
+        if added:
+            first = len(self.rows)
+            self.beginInsertRows(QModelIndex(), first, first + len(added) - 1)
+            for offset, entry in enumerate(added):
+                self.rows.append(entry)
+                self.row_of[entry["name"]] = first + offset
+            self.endInsertRows()
+    
+    def stop(self):
+        """Wait for a running scan (call before the application quits)"""
+        if self.scan_thread is not None:
+            self.scan_thread.wait()
+
+
+class ClipTableView(QTableView):
+    """Table view that drops the selection when the selected folder goes away"""
+    def rowsAboutToBeRemoved(self, parent, start, end):
+        # QTableView would move the selection to the next row – i.e. silently pick another clip
+        current = self.currentIndex()
+        if current.isValid() and start <= current.row() <= end:
+            self.clearSelection()
+            self.setCurrentIndex(QModelIndex())
+        super().rowsAboutToBeRemoved(parent, start, end)
+
+
 class ChannelManagerWidget(QWidget):
     """Central widget for managing channels, their media platforms, and clip directories"""
     def __init__(self, parent=None):
         super().__init__(parent)
-        self.initUI()
-        self.load_channels()
         self.current_channel_name = None
         self.selected_clip_folder = None
+        self.upload_queue = UploadQueue(self)
+        self.upload_queue.job_finished.connect(self.upload_finished)
+        
+        # Clip models outlive the per-channel widgets; each channel load points them at new folders
+        self.clips_model = ClipFolderModel(self)
+        self.clips_proxy = self.create_clip_proxy(self.clips_model)
+        self.archive_model = ClipFolderModel(self)
+        self.archive_proxy = self.create_clip_proxy(self.archive_model)
+        self.initUI()
+        self.load_channels()
     
     def initUI(self):
         """Initialize the UI components"""
@@ -560,6 +777,11 @@ class ChannelManagerWidget(QWidget):
         # Add spacing between sections
         self.details_layout.addSpacing(20)
         
+        self.create_upload_history_section(channel_name)
+        
+        # Add spacing between sections
+        self.details_layout.addSpacing(20)
+        
         self.create_clips_section(channel_path)
         
         # Add spacing between sections
@@ -682,6 +904,46 @@ class ChannelManagerWidget(QWidget):
         
         self.details_layout.addWidget(upload_group)
     
+    def create_upload_history_section(self, channel_name):
+        """Create the recent uploads section (read from the shared upload log)"""
+        history_group = QGroupBox("Recent Uploads")
+        history_group.setStyleSheet(ModernStyle.GROUP_BOX_STYLE)
+        history_layout = QVBoxLayout(history_group)
+        
+        self.history_table = QTableWidget(0, 4)
+        self.history_table.setHorizontalHeaderLabels(["Time", "Platform", "Status", "Details"])
+        self.history_table.setStyleSheet(ModernStyle.TABLE_STYLE)
+        self.history_table.horizontalHeader().setSectionResizeMode(3, QHeaderView.Stretch)
+        self.history_table.verticalHeader().setVisible(False)
+        self.history_table.setEditTriggers(QTableWidget.NoEditTriggers)
+        self.history_table.setSelectionBehavior(QTableWidget.SelectRows)
+        self.history_table.setMinimumHeight(200)
+        
+        history_layout.addWidget(self.history_table)
+        self.details_layout.addWidget(history_group)
+        
+        self.load_upload_history(channel_name)
+    
+    def load_upload_history(self, channel_name):
+        """Load the channel's latest upload attempts into the history table"""
+        self.history_table.setRowCount(0)
+        try:
+            with UploadLog() as log:
+                entries = log.query(channel=channel_name, limit=UPLOAD_HISTORY_ROWS)
+        except Exception as e:
+            print(f"Error loading upload log: {e}")
+            return
+        
+        for row, entry in enumerate(entries):
+            self.history_table.insertRow(row)
+            status_item = QTableWidgetItem(entry["status"])
+            ok = entry["status"] == "success"
+            status_item.setForeground(QColor(ModernStyle.SECONDARY_COLOR if ok else ModernStyle.ERROR_COLOR))
+            self.history_table.setItem(row, 0, QTableWidgetItem(entry["ts"]))
+            self.history_table.setItem(row, 1, QTableWidgetItem(entry["platform"]))
+            self.history_table.setItem(row, 2, status_item)
+            self.history_table.setItem(row, 3, QTableWidgetItem(entry["post_url"] or entry["exception"] or ""))
+    
     def create_clips_section(self, channel_path):
         """Create the clips section"""
         # Group box for clips
@@ -717,20 +979,8 @@ class ChannelManagerWidget(QWidget):
             os.makedirs(clips_path)
         
         # Create table for clips
-        self.clips_table = QTableWidget(0, 2)
-        self.clips_table.setHorizontalHeaderLabels(["Folder Name", "Created"])
-        self.clips_table.setStyleSheet(ModernStyle.TABLE_STYLE)
-        self.clips_table.horizontalHeader().setSectionResizeMode(0, QHeaderView.Stretch)
-        self.clips_table.verticalHeader().setVisible(False)
-        self.clips_table.setSelectionBehavior(QTableWidget.SelectRows)
-        self.clips_table.setSelectionMode(QTableWidget.SingleSelection)
-        self.clips_table.itemSelectionChanged.connect(self.clip_selection_changed)
-        
-        # Set minimum height to show approximately 10 rows
-        self.clips_table.setMinimumHeight(380)  # Allows for about 10 rows plus header
-        
-        # Ensure the scroll bar appears when needed
-        self.clips_table.setVerticalScrollBarPolicy(Qt.ScrollBarAsNeeded)
+        self.clips_table = self.create_clip_view(self.clips_proxy)
+        self.clips_table.selectionModel().selectionChanged.connect(self.clip_selection_changed)
         
         # Buttons layout
         buttons_layout = QHBoxLayout()
@@ -751,6 +1001,7 @@ class ChannelManagerWidget(QWidget):
         buttons_layout.addWidget(archive_button)
         buttons_layout.addWidget(open_selected_button)
         
+        clips_layout.addWidget(self.create_filter_box(self.clips_proxy))
         clips_layout.addWidget(self.clips_table)
         clips_layout.addLayout(buttons_layout)
         
@@ -772,19 +1023,7 @@ class ChannelManagerWidget(QWidget):
             os.makedirs(archive_path)
         
         # Create table for archive
-        self.archive_table = QTableWidget(0, 2)
-        self.archive_table.setHorizontalHeaderLabels(["Folder Name", "Created"])
-        self.archive_table.setStyleSheet(ModernStyle.TABLE_STYLE)
-        self.archive_table.horizontalHeader().setSectionResizeMode(0, QHeaderView.Stretch)
-        self.archive_table.verticalHeader().setVisible(False)
-        self.archive_table.setSelectionBehavior(QTableWidget.SelectRows)
-        self.archive_table.setSelectionMode(QTableWidget.SingleSelection)
-        
-        # Set minimum height to show approximately 10 rows
-        self.archive_table.setMinimumHeight(380)  # Allows for about 10 rows plus header
-        
-        # Ensure the scroll bar appears when needed
-        self.archive_table.setVerticalScrollBarPolicy(Qt.ScrollBarAsNeeded)
+        self.archive_table = self.create_clip_view(self.archive_proxy)
         
         # Buttons layout
         buttons_layout = QHBoxLayout()
@@ -805,6 +1044,7 @@ class ChannelManagerWidget(QWidget):
         buttons_layout.addWidget(unarchive_button)
         buttons_layout.addWidget(open_selected_button)
         
+        archive_layout.addWidget(self.create_filter_box(self.archive_proxy))
         archive_layout.addWidget(self.archive_table)
         archive_layout.addLayout(buttons_layout)
         
@@ -813,85 +1053,67 @@ class ChannelManagerWidget(QWidget):
         # Load archive data
         self.load_archive_table(archive_path)
     
-    def load_clips_table(self, clips_path):
-        """Load clip folders into the table"""
-        self.clips_table.setRowCount(0)
-        self.selected_clip_folder = None
+    def create_clip_proxy(self, model):
+        """Sort / filter proxy over a ClipFolderModel (newest first, filter on folder name)"""
+        proxy = QSortFilterProxyModel(self)
+        proxy.setSourceModel(model)
+        proxy.setSortRole(ClipFolderModel.SORT_ROLE)
+        proxy.setFilterKeyColumn(0)
+        proxy.setFilterCaseSensitivity(Qt.CaseInsensitive)
+        proxy.setDynamicSortFilter(True)
+        return proxy
+    
+    def create_clip_view(self, proxy):
+        """Table view for a clip folder proxy"""
+        view = ClipTableView()
+        view.setModel(proxy)
+        view.setStyleSheet(ModernStyle.TABLE_STYLE)
+        view.horizontalHeader().setSectionResizeMode(0, QHeaderView.Stretch)
+        view.verticalHeader().setVisible(False)
+        view.setEditTriggers(QTableView.NoEditTriggers)
+        view.setSelectionBehavior(QTableView.SelectRows)
+        view.setSelectionMode(QTableView.SingleSelection)
+        view.setSortingEnabled(True)
+        view.sortByColumn(1, Qt.DescendingOrder)
         
-        # Disable upload buttons when loading a new clips table
-        if hasattr(self, 'upload_buttons'):
-            for button in self.upload_buttons.values():
-                button.setEnabled(False)
-        
-        if os.path.exists(clips_path):
-            folders = []
-            for item in os.listdir(clips_path):
-                item_path = os.path.join(clips_path, item)
-                if os.path.isdir(item_path):
-                    created_time = os.path.getctime(item_path)
-                    folders.append((item, created_time))
-            
-            # Sort by creation time (newest first)
-            folders.sort(key=lambda x: x[1], reverse=True)
-            
-            for row, (folder_name, created_time) in enumerate(folders):
-                self.clips_table.insertRow(row)
-                
-                folder_item = QTableWidgetItem(folder_name)
-                folder_item.setFlags(folder_item.flags() & ~Qt.ItemIsEditable)
-                
-                date_str = datetime.fromtimestamp(created_time).strftime("%Y-%m-%d %H:%M")
-                date_item = QTableWidgetItem(date_str)
-                date_item.setFlags(date_item.flags() & ~Qt.ItemIsEditable)
-                
-                self.clips_table.setItem(row, 0, folder_item)
-                self.clips_table.setItem(row, 1, date_item)
+        # Set minimum height to show approximately 10 rows
+        view.setMinimumHeight(380)  # Allows for about 10 rows plus header
+        
+        # Ensure the scroll bar appears when needed
+        view.setVerticalScrollBarPolicy(Qt.ScrollBarAsNeeded)
+        return view
+    
+    def create_filter_box(self, proxy):
+        """Filter line edit for a clip folder table"""
+        proxy.setFilterFixedString("")
+        filter_box = QLineEdit()
+        filter_box.setPlaceholderText("Filter folders…")
+        filter_box.setClearButtonEnabled(True)
+        filter_box.textChanged.connect(proxy.setFilterFixedString)
+        return filter_box
+    
+    def selected_folder(self, table):
+        """Folder name of the selected row in a clip table, or None"""
+        selected_rows = table.selectionModel().selectedRows()
+        if not selected_rows:
+            return None
+        return selected_rows[0].data()
+    
+    def load_clips_table(self, clips_path):
+        """Show the clip folders of `clips_path` (scanned in the background, only changes are applied)"""
+        self.clips_model.set_root(clips_path)
     
     def load_archive_table(self, archive_path):
-        """Load archived folders into the table"""
-        self.archive_table.setRowCount(0)
-        
-        if os.path.exists(archive_path):
-            folders = []
-            for item in os.listdir(archive_path):
-                item_path = os.path.join(archive_path, item)
-                if os.path.isdir(item_path):
-                    created_time = os.path.getctime(item_path)
-                    folders.append((item, created_time))
-            
-            # Sort by creation time (newest first)
-            folders.sort(key=lambda x: x[1], reverse=True)
-            
-            for row, (folder_name, created_time) in enumerate(folders):
-                self.archive_table.insertRow(row)
-                
-                folder_item = QTableWidgetItem(folder_name)
-                folder_item.setFlags(folder_item.flags() & ~Qt.ItemIsEditable)
-                
-                date_str = datetime.fromtimestamp(created_time).strftime("%Y-%m-%d %H:%M")
-                date_item = QTableWidgetItem(date_str)
-                date_item.setFlags(date_item.flags() & ~Qt.ItemIsEditable)
-                
-                self.archive_table.setItem(row, 0, folder_item)
-                self.archive_table.setItem(row, 1, date_item)
+        """Show the archived folders of `archive_path` (scanned in the background, only changes are applied)"""
+        self.archive_model.set_root(archive_path)
     
     def clip_selection_changed(self):
         """Handle clip selection change to enable/disable upload buttons"""
-        selected_rows = self.clips_table.selectionModel().selectedRows()
+        self.selected_clip_folder = self.selected_folder(self.clips_table)
         
-        if selected_rows:
-            row = selected_rows[0].row()
-            self.selected_clip_folder = self.clips_table.item(row, 0).text()
-            
-            # Enable upload buttons
-            for button in self.upload_buttons.values():
-                button.setEnabled(True)
-        else:
-            self.selected_clip_folder = None
-            
-            # Disable upload buttons
-            for button in self.upload_buttons.values():
-                button.setEnabled(False)
+        # Enable upload buttons only while a clip is selected
+        for button in self.upload_buttons.values():
+            button.setEnabled(self.selected_clip_folder is not None)
     
     def upload_clip(self, platform):
         """Upload a clip to the specified platform"""
@@ -916,44 +1138,51 @@ class ChannelManagerWidget(QWidget):
             QMessageBox.warning(self, "Error", f"{platform} uploader script not found.")
             return
         
+        # Runs in the background (see UploadQueue); upload_finished logs the result
+        job = self.upload_queue.submit(self.current_channel_name, self.selected_clip_folder, clip_path,
+                                       platform, uploader_script)
+        if job is None:
+            ToastNotification(self.parent(), f"'{self.selected_clip_folder}' is already queued for {platform}.")
+        else:
+            ToastNotification(self.parent(), f"Queued '{self.selected_clip_folder}' for {platform}.")
+    
+    def upload_finished(self, job):
+        """Log a finished upload job and refresh the channel's tables if it is on screen"""
+        if job.state == "cancelled":
+            ToastNotification(self.parent(), f"{job.platform} upload of '{job.clip_folder}' cancelled.")
+            return
+        
+        self.log_manual_upload(job.channel_name, job.clip_folder, job.platform, job.state,
+                               "" if job.state == "success" else job.error_summary())
+        if job.state == "success":
+            ToastNotification(self.parent(), f"Uploaded '{job.clip_folder}' to {job.platform}.")
+        else:
+            ToastNotification(self.parent(), f"{job.platform} upload of '{job.clip_folder}' failed.", 4000)
+        
+        if job.channel_name == self.current_channel_name:
+            self.clips_model.refresh()
+            self.archive_model.refresh()
+    
+    def log_manual_upload(self, channel_name, clip_folder, platform, status, stderr=""):
+        """Record a manual upload in the shared upload log and refresh the history table"""
+        lines = (stderr or "").strip().splitlines()
         try:
-            # Run the uploader script with the channel name and clip path as arguments
-            process = subprocess.run(
-                [sys.executable, uploader_script, self.current_channel_name, clip_path],
-                capture_output=True,
-                text=True,
-                check=True
-            )
-            
-            # Disable upload buttons
-            for button in self.upload_buttons.values():
-                button.setEnabled(False)
-            
-            self.selected_clip_folder = None
-            
-        except subprocess.CalledProcessError as e:
-            QMessageBox.critical(
-                self,
-                "Upload Failed",
-                f"Failed to upload to {platform}.\n\nError: {e.stderr}"
-            )
+            log_upload(channel_name, platform.lower(), status,
+                       exception=lines[-1] if lines else "", clip=clip_folder)
         except Exception as e:
-            QMessageBox.critical(
-                self,
-                "Error",
-                f"An error occurred: {str(e)}"
-            )
+            print(f"Error writing upload log: {e}")
+            return
+        if hasattr(self, 'history_table') and channel_name == self.current_channel_name:
+            self.load_upload_history(channel_name)
     
     def delete_clip(self, base_path, is_archive=False):
         """Delete the selected clip folder by sending it to the trash"""
         table = self.archive_table if is_archive else self.clips_table
-        selected_rows = table.selectionModel().selectedRows()
+        folder_name = self.selected_folder(table)
         
-        if not selected_rows:
+        if not folder_name:
             return
         
-        row = selected_rows[0].row()
-        folder_name = table.item(row, 0).text()
         folder_path = os.path.join(base_path, folder_name)
         
         reply = QMessageBox.question(
@@ -983,12 +1212,10 @@ class ChannelManagerWidget(QWidget):
         clips_path = os.path.join(channel_path, "Clips")
         archive_path = os.path.join(channel_path, "Clips_Archive")
         
-        selected_rows = self.clips_table.selectionModel().selectedRows()
-        if not selected_rows:
+        folder_name = self.selected_folder(self.clips_table)
+        if not folder_name:
             return
         
-        row = selected_rows[0].row()
-        folder_name = self.clips_table.item(row, 0).text()
         src_path = os.path.join(clips_path, folder_name)
         dst_path = os.path.join(archive_path, folder_name)
         
@@ -1011,12 +1238,10 @@ class ChannelManagerWidget(QWidget):
         clips_path = os.path.join(channel_path, "Clips")
         archive_path = os.path.join(channel_path, "Clips_Archive")
         
-        selected_rows = self.archive_table.selectionModel().selectedRows()
-        if not selected_rows:
+        folder_name = self.selected_folder(self.archive_table)
+        if not folder_name:
             return
         
-        row = selected_rows[0].row()
-        folder_name = self.archive_table.item(row, 0).text()
         src_path = os.path.join(archive_path, folder_name)
         dst_path = os.path.join(clips_path, folder_name)
         
@@ -1037,13 +1262,11 @@ class ChannelManagerWidget(QWidget):
     def open_selected_folder(self, base_path, is_archive=False):
         """Open the selected folder in Windows Explorer"""
         table = self.archive_table if is_archive else self.clips_table
-        selected_rows = table.selectionModel().selectedRows()
+        folder_name = self.selected_folder(table)
         
-        if not selected_rows:
+        if not folder_name:
             return
         
-        row = selected_rows[0].row()
-        folder_name = table.item(row, 0).text()
         folder_path = os.path.join(base_path, folder_name)
         
         try:
@@ -1123,6 +1346,35 @@ class MainWindow(QMainWindow):
         # Set central widget
         self.channel_manager = ChannelManagerWidget(self)
         self.setCentralWidget(self.channel_manager)
+        
+        # Upload jobs stay visible whichever channel is selected
+        jobs_dock = QDockWidget("Upload Jobs", self)
+        jobs_dock.setFeatures(QDockWidget.DockWidgetMovable | QDockWidget.DockWidgetFloatable)
+        jobs_dock.setWidget(UploadJobsPanel(self.channel_manager.upload_queue, jobs_dock))
+        self.addDockWidget(Qt.BottomDockWidgetArea, jobs_dock)
+    
+    def closeEvent(self, event):
+        """Ask before closing while uploads are queued or running"""
+        queue = self.channel_manager.upload_queue
+        active = [job for job in queue.jobs if job.active]
+        if active:
+            reply = QMessageBox.question(
+                self,
+                "Uploads in Progress",
+                f"{len(active)} upload(s) are still queued or running. Cancel them and quit?",
+                QMessageBox.Yes | QMessageBox.No,
+                QMessageBox.No
+            )
+            if reply != QMessageBox.Yes:
+                event.ignore()
+                return
+            queue.cancel_all()
+            for job in queue.running():
+                if job.process and not job.process.waitForFinished(UPLOAD_CANCEL_GRACE_MS):
+                    job.process.kill()
+        self.channel_manager.clips_model.stop()
+        self.channel_manager.archive_model.stop()
+        event.accept()
 
 
 class ExecutionOutputWindow(QMainWindow):
@@ -1298,6 +1550,263 @@ class StdoutReaderThread(QThread):
             self.output_received.emit(line, self.is_error)
 
 
+class UploadJob:
+    """One queued / running / finished uploader run"""
+    def __init__(self, job_id, channel_name, clip_folder, clip_path, platform, script):
+        self.id = job_id
+        self.channel_name = channel_name
+        self.clip_folder = clip_folder
+        self.clip_path = clip_path
+        self.platform = platform
+        self.script = script
+        self.state = "queued"           # queued → running → success / failure / cancelled
+        self.progress = 0
+        self.stage = "Queued"
+        self.output = deque(maxlen=UPLOAD_OUTPUT_LINES)
+        self.process = None
+        self.started = None
+        self.finished = None
+        self.cancel_requested = False
+    
+    @property
+    def active(self):
+        return self.state in ("queued", "running")
+    
+    def error_summary(self):
+        """Last error-looking output line, for the upload log and the failure toast"""
+        for line in reversed(self.output):
+            if "error" in line.lower() or "exception" in line.lower():
+                return line
+        return self.output[-1] if self.output else ""
+
+
+class UploadQueue(QObject):
+    """
+    Runs uploader scripts as QProcess children so the GUI never blocks.
+    
+    At most MAX_CONCURRENT_UPLOADS run at once and never two for the same
+    channel + platform (same account / Chrome profile); the rest wait in FIFO
+    order. Progress comes from the uploader's log lines (see
+    UPLOAD_PROGRESS_MARKERS).
+    """
+    job_added = pyqtSignal(object)
+    job_changed = pyqtSignal(object)
+    job_finished = pyqtSignal(object)
+    
+    def __init__(self, parent=None, max_concurrent=MAX_CONCURRENT_UPLOADS):
+        super().__init__(parent)
+        self.max_concurrent = max_concurrent
+        self.jobs = []
+        self._next_id = 1
+    
+    def submit(self, channel_name, clip_folder, clip_path, platform, script):
+        """Queue an upload; returns the job, or None if the same upload is already queued/running"""
+        for job in self.jobs:
+            if (job.active and job.channel_name == channel_name and job.clip_folder == clip_folder
+                    and job.platform == platform):
+                return None
+        job = UploadJob(self._next_id, channel_name, clip_folder, clip_path, platform, script)
+        self._next_id += 1
+        self.jobs.append(job)
+        self.job_added.emit(job)
+        self._dispatch()
+        return job
+    
+    def running(self):
+        return [job for job in self.jobs if job.state == "running"]
+    
+    def cancel(self, job):
+        """Drop a queued job or stop a running one (terminate, then kill after a grace period)"""
+        if job.state == "queued":
+            self._finish(job, "cancelled")
+        elif job.state == "running" and job.process and not job.cancel_requested:
+            job.cancel_requested = True
+            job.stage = "Cancelling…"
+            self.job_changed.emit(job)
+            job.process.terminate()
+            QTimer.singleShot(UPLOAD_CANCEL_GRACE_MS, lambda: self._kill(job))
+    
+    def cancel_all(self):
+        for job in list(self.jobs):
+            if job.active:
+                self.cancel(job)
+    
+    def clear_finished(self):
+        self.jobs = [job for job in self.jobs if job.active]
+    
+    def _kill(self, job):
+        if job.process and job.process.state() != QProcess.NotRunning:
+            job.process.kill()
+    
+    def _dispatch(self):
+        """Start queued jobs while there is a free slot"""
+        busy = {(job.channel_name, job.platform) for job in self.running()}
+        for job in self.jobs:
+            if len(busy) >= self.max_concurrent:
+                break
+            if job.state == "queued" and (job.channel_name, job.platform) not in busy:
+                busy.add((job.channel_name, job.platform))
+                self._start(job)
+    
+    def _start(self, job):
+        process = QProcess(self)
+        env = QProcessEnvironment.systemEnvironment()
+        env.insert("PYTHONUNBUFFERED", "1")             # stream log lines as they happen
+        env.insert("PYTHONIOENCODING", "utf-8")
+        process.setProcessEnvironment(env)
+        process.setProcessChannelMode(QProcess.MergedChannels)
+        process.setWorkingDirectory(os.path.dirname(job.script))
+        process.readyReadStandardOutput.connect(lambda: self._read_output(job))
+        process.finished.connect(lambda code, status: self._process_finished(job, code, status))
+        process.errorOccurred.connect(lambda error: self._process_error(job, error))
+        
+        job.process = process
+        job.state = "running"
+        job.stage = "Starting"
+        job.started = time.time()
+        self.job_changed.emit(job)
+        process.start(sys.executable, [job.script, job.channel_name, job.clip_path])
+    
+    def _read_output(self, job):
+        text = bytes(job.process.readAllStandardOutput()).decode("utf-8", errors="replace")
+        changed = False
+        for line in text.splitlines():
+            line = line.strip()
+            if not line:
+                continue
+            job.output.append(line)
+            for pattern, progress, stage in UPLOAD_PROGRESS_MARKERS:
+                if pattern.search(line) and progress > job.progress:
+                    job.progress = progress
+                    if stage:
+                        job.stage = stage
+                    changed = True
+            step = UPLOAD_STEP_LINE.search(line)
+            if step:
+                job.stage = step.group(1)[:80]
+                changed = True
+        if changed:
+            self.job_changed.emit(job)
+    
+    def _process_finished(self, job, exit_code, exit_status):
+        if job.state != "running":
+            return
+        self._read_output(job)
+        if job.cancel_requested:
+            self._finish(job, "cancelled")
+        elif exit_status == QProcess.NormalExit and exit_code == 0:
+            job.progress = 100
+            self._finish(job, "success")
+        else:
+            self._finish(job, "failure")
+    
+    def _process_error(self, job, error):
+        # FailedToStart never emits finished(); crashes and kills do, and are handled there
+        if error == QProcess.FailedToStart and job.state == "running":
+            job.output.append(f"Could not start uploader: {job.process.errorString()}")
+            self._finish(job, "failure")
+    
+    def _finish(self, job, state):
+        job.state = state
+        job.stage = {"success": "Done", "failure": "Failed", "cancelled": "Cancelled"}[state]
+        job.finished = time.time()
+        if job.process:
+            job.process.deleteLater()
+            job.process = None
+        self.job_changed.emit(job)
+        self.job_finished.emit(job)
+        self._dispatch()
+
+
+class UploadJobsPanel(QWidget):
+    """Table of upload jobs with progress and cancel buttons"""
+    COLUMNS = ["Channel", "Clip", "Platform", "Progress", "Status", ""]
+    
+    def __init__(self, queue, parent=None):
+        super().__init__(parent)
+        self.queue = queue
+        self.rows = {}                  # job id → table row
+        self.initUI()
+        self.queue.job_added.connect(self.add_job)
+        self.queue.job_changed.connect(self.update_job)
+    
+    def initUI(self):
+        """Initialize the UI components"""
+        layout = QVBoxLayout(self)
+        
+        self.table = QTableWidget(0, len(self.COLUMNS))
+        self.table.setHorizontalHeaderLabels(self.COLUMNS)
+        self.table.setStyleSheet(ModernStyle.TABLE_STYLE)
+        self.table.horizontalHeader().setSectionResizeMode(4, QHeaderView.Stretch)
+        self.table.verticalHeader().setVisible(False)
+        self.table.setEditTriggers(QTableWidget.NoEditTriggers)
+        self.table.setSelectionBehavior(QTableWidget.SelectRows)
+        self.table.setMinimumHeight(150)
+        
+        buttons_layout = QHBoxLayout()
+        
+        clear_button = QPushButton("CLEAR FINISHED")
+        clear_button.setStyleSheet(ModernStyle.BUTTON_STYLE)
+        clear_button.clicked.connect(self.clear_finished)
+        
+        cancel_all_button = QPushButton("CANCEL ALL")
+        cancel_all_button.setStyleSheet(ModernStyle.DANGER_BUTTON_STYLE)
+        cancel_all_button.clicked.connect(self.queue.cancel_all)
+        
+        buttons_layout.addWidget(clear_button)
+        buttons_layout.addWidget(cancel_all_button)
+        
+        layout.addWidget(self.table)
+        layout.addLayout(buttons_layout)
+    
+    def add_job(self, job):
+        row = self.table.rowCount()
+        self.table.insertRow(row)
+        self.rows[job.id] = row
+        
+        self.table.setItem(row, 0, QTableWidgetItem(job.channel_name))
+        self.table.setItem(row, 1, QTableWidgetItem(job.clip_folder))
+        self.table.setItem(row, 2, QTableWidgetItem(job.platform))
+        
+        progress_bar = QProgressBar()
+        progress_bar.setRange(0, 100)
+        self.table.setCellWidget(row, 3, progress_bar)
+        self.table.setItem(row, 4, QTableWidgetItem(job.stage))
+        
+        cancel_button = QPushButton("Cancel")
+        cancel_button.setStyleSheet(ModernStyle.WARNING_BUTTON_STYLE)
+        cancel_button.clicked.connect(lambda: self.queue.cancel(job))
+        self.table.setCellWidget(row, 5, cancel_button)
+        
+        self.update_job(job)
+    
+    def update_job(self, job):
+        row = self.rows.get(job.id)
+        if row is None:
+            return
+        self.table.cellWidget(row, 3).setValue(job.progress)
+        
+        status_item = self.table.item(row, 4)
+        status_item.setText(job.stage)
+        status_item.setToolTip("\n".join(list(job.output)[-20:]))
+        if job.state == "success":
+            status_item.setForeground(QColor(ModernStyle.SECONDARY_COLOR))
+        elif job.state == "failure":
+            status_item.setForeground(QColor(ModernStyle.ERROR_COLOR))
+            status_item.setText(f"Failed: {job.error_summary()}"[:200])
+        elif job.state == "cancelled":
+            status_item.setForeground(QColor(ModernStyle.INACTIVE_COLOR))
+        
+        self.table.cellWidget(row, 5).setEnabled(job.active)
+    
+    def clear_finished(self):
+        self.queue.clear_finished()
+        self.table.setRowCount(0)
+        self.rows = {}
+        for job in self.queue.jobs:
+            self.add_job(job)
+
+
 def main():
     """Application entry point"""
     app = QApplication([])
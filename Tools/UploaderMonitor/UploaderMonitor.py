@@ -1,19 +1,25 @@
-import json
+import sys
 import tkinter as tk
 from tkinter import ttk
 import os
-from datetime import datetime
+from datetime import datetime, timedelta
 import matplotlib.pyplot as plt
 from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg
 import matplotlib.dates as mdates
 from matplotlib.figure import Figure
 from PIL import Image, ImageTk
 
+INTERNAL_MODULES_DIR = "D:\\2025\\Projects\\Presence\\Presence0.1\\Resources\\Internal_Modules"
+sys.path.insert(0, INTERNAL_MODULES_DIR)
+from uploaders.upload_log.upload_log import UploadLog
+
+TIMELINE_DAYS = 30
+
 class UploaderLogViewer:
-    def __init__(self, root, json_path):
+    def __init__(self, root, db_path=None):
         self.root = root
-        self.json_path = json_path
-        self.log_data = self.load_json()
+        self.db_path = db_path
+        self.log_data, self.history = self.load_logs()
 
         self.root.title("Presence Uploader Logs")
         self.root.geometry("1200x800")
@@ -54,16 +60,18 @@ class UploaderLogViewer:
 
         self.tab_control.bind("<<NotebookTabChanged>>", self.on_tab_change)
 
-    def load_json(self):
+    def load_logs(self):
+        """Latest result per channel/platform, plus every attempt of the last TIMELINE_DAYS."""
         try:
-            with open(self.json_path, 'r') as f:
-                return json.load(f)
-        except (FileNotFoundError, json.JSONDecodeError) as e:
-            print(f"Error loading JSON: {e}")
-            return {}
+            with UploadLog(self.db_path) as log:
+                since = datetime.now() - timedelta(days=TIMELINE_DAYS)
+                return log.latest(), log.query(since=since)
+        except Exception as e:
+            print(f"Error loading upload log: {e}")
+            return {}, []
 
     def refresh_data(self):
-        self.log_data = self.load_json()
+        self.log_data, self.history = self.load_logs()
         for widget in self.dashboard_tab.winfo_children():
             widget.destroy()
         for widget in self.details_tab.winfo_children():
@@ -229,20 +237,18 @@ class UploaderLogViewer:
         scrollable_canvas.pack(side="left", fill="both", expand=True)
         scrollbar.pack(side="right", fill="y")
 
-        if not self.log_data:
+        if not self.history:
             ttk.Label(scrollable_frame, text="No data available", font=("Arial", 14)).pack(pady=20)
             return
 
         upload_data = []
-        for channel, platforms_data in self.log_data.items():
-            for platform, data in platforms_data.items():
-                if "last_uploaded" in data and data["last_uploaded"]:
-                    try:
-                        timestamp = datetime.strptime(data["last_uploaded"], "%Y-%m-%d %H:%M:%S")
-                        status = data.get("status", "unknown")
-                        upload_data.append({"channel": channel, "platform": platform, "timestamp": timestamp, "status": status})
-                    except ValueError:
-                        continue
+        for entry in self.history:
+            try:
+                timestamp = datetime.strptime(entry["ts"], "%Y-%m-%d %H:%M:%S")
+            except ValueError:
+                continue
+            upload_data.append({"channel": entry["channel"], "platform": entry["platform"],
+                                "timestamp": timestamp, "status": entry["status"] or "unknown"})
 
         upload_data.sort(key=lambda x: x["timestamp"])
 
@@ -321,9 +327,8 @@ class UploaderLogViewer:
         print(f"Switched to {tab_name} tab")
 
 if __name__ == "__main__":
-    json_path = r"D:\\2025\\Projects\\Presence\\Presence0.1\\Uploader\\Logs\\global_uploader_logs.json"
     root = tk.Tk()
-    app = UploaderLogViewer(root, json_path)
+    app = UploaderLogViewer(root)
 
     try:
         icon = tk.PhotoImage(data="""R0lGODlhIAAgAPcAAP///...AAA7""")
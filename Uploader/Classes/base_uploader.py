@@ -4,18 +4,24 @@ Reusable abstract uploader.
 Each concrete uploader:
 1.  Inherits from `BaseUploader`.
 2.  Implements `setup()` and `execute_steps()`.
-3.  (Optionally) overrides `add_extra_arguments()` or any hook.
+3.  Sets `PLATFORM` so the plugin runner can discover it.
+4.  (Optionally) overrides `add_extra_arguments()` or any hook.
 """
 
 from __future__ import annotations
 import argparse
 import datetime
+import json
 import os
+import re
 import sys
 import logging
 from abc import ABC, abstractmethod
 import time
-from typing import Callable, List, Tuple, Optional
+import uuid
+from contextlib import contextmanager
+from dataclasses import dataclass, field, asdict
+from typing import Callable, Dict, List, Tuple, Optional
 
 import pyautogui
 from selenium.webdriver.remote.webdriver import WebDriver
@@ -26,7 +32,193 @@ from selenium.webdriver.remote.webelement import WebElement
 from selenium.webdriver.support import expected_conditions as EC
 from selenium.common import exceptions as se
 
+INTERNAL_MODULES_DIR = "D:\\2025\\Projects\\Presence\\Presence0.1\\Resources\\Internal_Modules"
+sys.path.insert(0, INTERNAL_MODULES_DIR)
+from uploaders.media_preflight.media_preflight import PLATFORM_SPECS, preflight
+from uploaders.upload_spans.upload_spans import record_spans
+
 Strategy = Tuple[str, Callable[[], WebElement]]
+Locator = Tuple[str, str]
+
+# ── event-driven waits ─────────────────────────────────────────
+WAIT_POLL = 0.1                 # seconds between condition checks
+WAIT_TIMEOUT = 30               # default ceiling for any wait
+WAIT_FLOOR = 2                  # adaptive timeouts never go below this
+WAIT_HISTORY_SIZE = 20          # durations kept per (platform, step)
+LONG_POLL_SECONDS = 10          # requests open longer than this don't block "network idle"
+SETTLE_CONDITIONS = {"dom_settled", "network_idle"}   # best-effort: a timeout just moves on
+WAIT_HISTORY_DIR = os.path.dirname(os.path.abspath(__file__))
+
+_MUTATION_JS = r"""
+if (!window.__presenceMutations__) {
+    const state = window.__presenceMutations__ = {count: 0, last: performance.now()};
+    new MutationObserver(m => { state.count += m.length; state.last = performance.now(); })
+        .observe(document.documentElement,
+                 {childList: true, subtree: true, attributes: true, characterData: true});
+}
+return [window.__presenceMutations__.count, (performance.now() - window.__presenceMutations__.last) / 1000];
+"""
+
+_PROGRESS_JS = r"""
+const scope = arguments[0] || document;
+const vals = [];
+scope.querySelectorAll('[role=progressbar]').forEach(e => {
+    const now = parseFloat(e.getAttribute('aria-valuenow'));
+    const max = parseFloat(e.getAttribute('aria-valuemax') || '100') || 100;
+    if (!isNaN(now)) vals.push(100 * now / max);
+});
+scope.querySelectorAll('progress').forEach(e => { if (e.max) vals.push(100 * e.value / e.max); });
+const m = (scope.innerText || '').match(/(\d{1,3})\s*%/);
+if (arguments[0] && m) vals.push(parseFloat(m[1]));
+return vals.length ? Math.min(...vals) : null;
+"""
+
+# ── bulk text entry ────────────────────────────────────────────
+TEXT_STRATEGIES = ("insert_text", "exec_command", "send_keys")
+TEXT_CHUNK_SIZE = 64            # characters per ActionChains round trip in the fallback
+
+# focus the box and (optionally) select its current content so the insert replaces it
+_FOCUS_TEXT_JS = r"""
+const el = arguments[0], replace = arguments[1];
+el.scrollIntoView({block: 'center'});
+el.focus();
+if ('value' in el && el.tagName !== 'DIV') {
+    if (replace) el.select(); else el.setSelectionRange(el.value.length, el.value.length);
+} else {
+    const range = document.createRange();
+    range.selectNodeContents(el);
+    if (!replace) range.collapse(false);
+    const sel = window.getSelection();
+    sel.removeAllRanges();
+    sel.addRange(range);
+}
+"""
+
+# insertText goes through the editor's beforeinput/input handlers (React, Draft.js, Lexical)
+_EXEC_INSERT_JS = r"""
+return document.execCommand('insertText', false, arguments[0]);
+"""
+
+_READ_TEXT_JS = r"""
+const el = arguments[0];
+return ('value' in el && el.tagName !== 'DIV') ? el.value : el.innerText;
+"""
+
+# put the box back to arguments[2] (empty → cleared) after a strategy that didn't verify
+_RESET_TEXT_JS = _FOCUS_TEXT_JS + r"""
+if (arguments[2]) document.execCommand('insertText', false, arguments[2]);
+else document.execCommand('delete');
+"""
+
+
+def _normalize_text(text: str) -> str:
+    return re.sub(r"\s+", " ", (text or "").replace("\u00a0", " ")).strip()
+
+
+@dataclass
+class UploadResult:
+    """Structured outcome of one uploader run (in-process or subprocess)."""
+    platform: str
+    channel_name: str
+    status: str                                   # "success" | "failure"
+    post_url: Optional[str] = None
+    duration: float = 0.0
+    timings: Dict[str, float] = field(default_factory=dict)
+    attempts: int = 0
+    error_type: str = ""
+    error: str = ""
+
+    @property
+    def ok(self) -> bool:
+        return self.status == "success"
+
+    def to_dict(self) -> dict:
+        return asdict(self)
+
+class UploadJournal:
+    """
+    Per-upload checkpoint journal, `<folder>/.upload_journal_<platform>.ckpt` (JSON;
+    not `.json`, which the uploaders read as clip metadata).
+
+    Checkpoints (in order): media_uploaded, metadata_filled, publishing,
+    published – each with a timestamp and optional data (draft id, URL…).
+    Written with an fsync + atomic replace on every checkpoint so it survives
+    a crash mid-upload. A journal written for different folder contents is
+    discarded on load.
+    """
+
+    PREFIX = ".upload_journal_"
+
+    def __init__(self, folder_path: str, platform: str) -> None:
+        self.path = os.path.join(folder_path, f"{self.PREFIX}{platform}.ckpt")
+        self.fingerprint = self._fingerprint(folder_path)
+        self.checkpoints: Dict[str, dict] = {}
+        try:
+            with open(self.path, "r", encoding="utf-8") as f:
+                data = json.load(f)
+            if data.get("fingerprint") == self.fingerprint:
+                self.checkpoints = data.get("checkpoints", {})
+            else:
+                logging.info("Upload journal %s is for other media – starting fresh.", self.path)
+        except (OSError, ValueError):
+            pass
+
+    @classmethod
+    def _fingerprint(cls, folder_path: str) -> List[list]:
+        entries = []
+        for name in sorted(os.listdir(folder_path)):
+            full = os.path.join(folder_path, name)
+            if name.startswith(cls.PREFIX) or not os.path.isfile(full):
+                continue
+            entries.append([name, os.path.getsize(full)])
+        return entries
+
+    def reached(self, name: str) -> bool:
+        return name in self.checkpoints
+
+    def get(self, name: str) -> dict:
+        return self.checkpoints.get(name, {})
+
+    def mark(self, name: str, **data) -> None:
+        self.checkpoints[name] = {"at": datetime.datetime.now().isoformat(timespec="seconds"), **data}
+        self._write()
+
+    def unmark(self, name: str) -> None:
+        """Withdraw a checkpoint that turned out not to hold (e.g. the click never happened)."""
+        if self.checkpoints.pop(name, None) is not None:
+            self._write()
+
+    def _write(self) -> None:
+        tmp = f"{self.path}.{os.getpid()}.tmp"
+        try:
+            with open(tmp, "w", encoding="utf-8") as f:
+                json.dump({"fingerprint": self.fingerprint, "checkpoints": self.checkpoints},
+                          f, indent=1, ensure_ascii=False)
+                f.flush()
+                os.fsync(f.fileno())
+            os.replace(tmp, self.path)
+        except OSError as e:
+            logging.warning("Could not write upload journal – %s", e)
+
+
+class PublishUnverifiedError(RuntimeError):
+    """An earlier attempt clicked publish and whether the post went live can't be told."""
+
+
+def resolve_publish(folder_path: str, platform: str, posted: bool) -> bool:
+    """
+    Settle a publish click an earlier run couldn't verify, after checking the
+    account by hand: `posted` records it as published, otherwise the next run
+    publishes again. False when no publish was pending.
+    """
+    journal = UploadJournal(folder_path, platform)
+    if not journal.reached("publishing") or journal.reached("published"):
+        return False
+    if posted:
+        journal.mark("published", recovered="manual")
+    else:
+        journal.unmark("publishing")
+    return True
 
 logging.basicConfig(
     format="%(asctime)s [%(levelname)s] %(name)s: %(message)s",
@@ -40,6 +232,8 @@ class BaseUploader(ABC):
     # Construction / CLI
     # ────────────────────────────────
     CLI_DESCRIPTION: str = "Generic Uploader"
+    PLATFORM: str = ""                 # media_list.txt key, e.g. "youtube"
+    PREFLIGHT: bool = True             # conform video to PLATFORM_SPECS before the browser starts
 
     def __init__(self,
                  channel_name: str,
@@ -52,7 +246,24 @@ class BaseUploader(ABC):
         self.media_type = media_type
         self.headless = headless
         self.debug = debug
+        self.post_url: Optional[str] = None          # set by execute_steps when known
+        self.timings: Dict[str, float] = {}
+        self.spans: List[dict] = []                  # per-step timing records, see upload_spans
+        self.run_id = uuid.uuid4().hex[:12]
+        self.attempts = 0
+        self._armed_url: Optional[str] = None        # state captured by arm_waits()
+        self._armed_mutations = 0
+        self._net_inflight: Dict[str, float] = {}
+        self._net_last = time.monotonic()
+        self._progress_seen = False
+        self._text_strategy: Optional[str] = None    # first strategy that verified this run
+        self._conformed_media: Optional[Tuple[str, str]] = None   # (original, conforming copy)
         self._validate_folder()
+        self.journal = UploadJournal(folder_path, self.journal_name())
+
+    @classmethod
+    def journal_name(cls) -> str:
+        return cls.PLATFORM or re.sub(r"\W+", "_", cls.CLI_DESCRIPTION).lower()
 
     # ---------- CLI ----------
     @classmethod
@@ -64,6 +275,9 @@ class BaseUploader(ABC):
         parser.add_argument("--media_type", type=str, default="video", help="Media type of the media file (video, image, text)")
         parser.add_argument("--headless", type=lambda s: s.lower() in {"true", "1", "yes"}, default=True, help="Run in headless mode (default: True)")
         parser.add_argument("--debug", type=lambda s: s.lower() in {"true", "1", "yes"}, default=False, help="Run in debug mode (default: False)")
+        parser.add_argument("--resolve-publish", choices=["posted", "retry"],
+                            help="An earlier publish click couldn't be verified and you checked the account: "
+                                 "'posted' records it as published, 'retry' publishes again")
         cls.add_extra_arguments(parser)                 # optional hook
         return parser.parse_args()
 
@@ -102,7 +316,26 @@ class BaseUploader(ABC):
         # 3️⃣ Pick the newest by creation time
         latest = max(files,
                     key=lambda f: os.path.getctime(os.path.join(self.folder_path, f)))
-        return os.path.join(self.folder_path, latest)
+        path = os.path.join(self.folder_path, latest)
+
+        # 4️⃣ Upload the preflight's conforming copy in its place
+        if self._conformed_media and self._conformed_media[0] == path:
+            return self._conformed_media[1]
+        return path
+
+    def preflight_media(self) -> None:
+        """
+        Check the clip against the platform spec and switch to a conforming
+        copy if needed (see media_preflight); raises `PreflightError` for
+        clips that can't be fixed, before any browser work.
+        """
+        source = self.get_latest_media()
+        result = preflight(source, self.PLATFORM)
+        for issue in result.issues:
+            logging.info("PREFLIGHT %s", issue)
+        if result.path != source:
+            logging.info("PREFLIGHT %s → %s (%s)", os.path.basename(source), result.path, result.action)
+            self._conformed_media = (source, result.path)
 
     # ────────────────────────────────
     # Workflow
@@ -111,24 +344,160 @@ class BaseUploader(ABC):
         """Main workflow; retry once on failure."""
         self.setup_logging()
         print(f"\n📢 {self.CLI_DESCRIPTION}{' [DEBUG]' if self.debug else ''}\n")
+        try:
+            with self.span("run", "phase"):
+                self._run_attempts()
+        finally:
+            self.save_spans()
 
+    def _run_attempts(self) -> None:
         attempts = 1 if self.debug else 2
 
+        if self.journal.reached("published"):
+            self.post_url = self.journal.get("published").get("post_url")
+            logging.info("Already published (%s) – nothing to do.", self.post_url or self.journal.path)
+            return
+
+        if self.PREFLIGHT and self.media_type == "video" and self.PLATFORM in PLATFORM_SPECS:
+            self._timed("preflight", self.preflight_media)
+
         for attempt in range(1, attempts + 1):
-            self.setup()
+            self.attempts = attempt
+            # before setup: an unverifiable publish must not launch Chrome, and retrying won't settle it
+            if not self._publish_pending():
+                return  # an earlier attempt's publish went through
+            self._timed("setup", self.setup)
+            self._record_launch_spans()
             try:
-                if self.execute_steps() is False:
+                if self._timed("execute_steps", self.execute_steps) is False:
                     raise RuntimeError("execute_steps() reported failure")
                 break  # Success
             except Exception as e:
                 logging.error(f"Attempt {attempt}/{attempts} failed: {e}", exc_info=True)
-                self.teardown()
+                self._timed("teardown", self.teardown)
                 if attempt == attempts:
                     logging.error("All retries exhausted. Aborting.")
                     raise
                 logging.info("Retrying…")
 
-        self.teardown()
+        self._timed("teardown", self.teardown)
+        self.save_wait_history()
+
+    # ---------- checkpoints ----------
+    def checkpoint(self, name: str, **data) -> None:
+        """Record a verified step in the upload journal (see `UploadJournal`)."""
+        if name == "published":
+            data.setdefault("post_url", self.post_url)
+        self.journal.mark(name, **data)
+        logging.info("CHECKPOINT %s %s", name, data or "")
+
+    def resume_point(self, name: str) -> dict:
+        """Data of checkpoint `name` from an earlier attempt, or {} if it wasn't reached."""
+        return self.journal.get(name)
+
+    def find_existing_post(self) -> Optional[object]:
+        """
+        Hook, called when an earlier attempt clicked publish but never saw it
+        confirmed. Return the post URL (or True) if the post exists, False if
+        it verifiably does not, None if it can't be told.
+        """
+        return None
+
+    def _publish_pending(self) -> bool:
+        """False when the post already exists; raises rather than risk a double post."""
+        if not self.journal.reached("publishing") or self.journal.reached("published"):
+            return not self.journal.reached("published")
+        found = self.find_existing_post()
+        if found:
+            if isinstance(found, str):
+                self.post_url = found
+            self.checkpoint("published", recovered=True)
+            return False
+        if found is None:
+            raise PublishUnverifiedError(
+                "Publish was clicked on an earlier attempt and can't be verified – check the account, "
+                "then re-run with --resolve-publish posted (it is live) or --resolve-publish retry (it is not).")
+        logging.info("Earlier publish did not go through – publishing again.")
+        self.journal.unmark("publishing")
+        return True
+
+    def run_for_result(self) -> UploadResult:
+        """Run the workflow and report it as an `UploadResult` instead of raising."""
+        start = time.perf_counter()
+        result = UploadResult(self.PLATFORM, self.channel_name, "success")
+        try:
+            self.run()
+        except BaseException as e:                 # SystemExit from helpers included
+            if isinstance(e, KeyboardInterrupt):
+                raise
+            result.status = "failure"
+            result.error_type = type(e).__name__
+            result.error = str(e)
+        result.post_url = self.post_url
+        result.timings = dict(self.timings)
+        result.attempts = self.attempts
+        result.duration = round(time.perf_counter() - start, 3)
+        return result
+
+    def _timed(self, name: str, fn: Callable):
+        """Call `fn` inside a "phase" span, adding its wall time (seconds) to `self.timings[name]`."""
+        start = time.perf_counter()
+        try:
+            with self.span(name, "phase"):
+                return fn()
+        finally:
+            self.timings[name] = round(self.timings.get(name, 0.0) + time.perf_counter() - start, 3)
+
+    # ---------- span timing ----------
+    @contextmanager
+    def span(self, name: str, kind: str = "step"):
+        """
+        Time the block as one span record (start, duration, outcome, retries).
+        The yielded dict may be updated – e.g. `rec["retries"] = 2` or
+        `rec["outcome"] = "timeout"`; an exception marks it "error".
+        """
+        rec = {"outcome": "ok", "retries": 0}
+        start_wall, start = datetime.datetime.now(), time.perf_counter()
+        try:
+            yield rec
+        except BaseException:
+            rec["outcome"] = "error"
+            raise
+        finally:
+            self._record_span(name, kind, start_wall, time.perf_counter() - start, rec["outcome"], rec["retries"])
+
+    def _record_span(self, name: str, kind: str, start: datetime.datetime, duration: float,
+                     outcome: str = "ok", retries: int = 0) -> None:
+        self.spans.append({
+            "run": self.run_id, "channel": self.channel_name,
+            "platform": self.PLATFORM or re.sub(r"\W+", "_", self.CLI_DESCRIPTION).lower(),
+            "name": name, "kind": kind, "start": start.strftime("%Y-%m-%d %H:%M:%S"),
+            "duration": round(duration, 3), "outcome": outcome, "attempt": max(self.attempts, 1), "retries": retries,
+        })
+
+    def _record_launch_spans(self) -> None:
+        """Browser-side phases measured by run_chrome_beta (profile clone, broker borrow, Chrome start)."""
+        launch = getattr(getattr(self, "bot", None), "launch_timings", None) or {}
+        for name, seconds in launch.items():
+            self._record_span(f"launch:{name}", "phase",
+                              datetime.datetime.now() - datetime.timedelta(seconds=seconds), seconds)
+            self.timings[f"launch:{name}"] = round(self.timings.get(f"launch:{name}", 0.0) + seconds, 3)
+        if launch:
+            self.bot.launch_timings = {}          # a retry's setup reports its own launch
+
+    def open_page(self, url: str) -> None:
+        """`self.bot.get(url)` as a "navigate" span."""
+        with self.span("navigate", "phase"):
+            self.bot.get(url)
+
+    def save_spans(self) -> None:
+        """Append this run's spans to the shared metrics store (see upload_spans)."""
+        if not self.spans:
+            return
+        try:
+            record_spans(self.spans)
+        except Exception as e:
+            logging.warning("Could not save step timings – %s", e)
 
     @abstractmethod
     def setup(self) -> None:
@@ -148,6 +517,253 @@ class BaseUploader(ABC):
     # Steps Event Handlers
     # ────────────────────────────────
 
+    # ────────────────────────────────
+    # Event-driven waits
+    # ────────────────────────────────
+    def wait_for(self, condition: str, step: str = "", locator: Optional[Locator] = None,
+                 timeout: Optional[float] = None, quiet: float = 0.5, required: Optional[bool] = None):
+        """
+        Block until the page is ready instead of sleeping a fixed time.
+
+        condition:
+            "clickable" / "present" – element at `locator` (returned)
+            "url_change"            – URL differs from the one seen at `arm_waits()`
+            "dom_mutation"          – DOM changed since `arm_waits()`
+            "dom_settled"           – no DOM mutation for `quiet` seconds
+            "network_idle"          – no request in flight for `quiet` seconds (CDP performance log)
+            "upload_complete"       – progress bar (inside `locator`, if given) reached 100 %
+
+        The timeout adapts to this step's history (3× p95, between WAIT_FLOOR and
+        `timeout`); a required wait that outlives the adaptive bound carries on up
+        to the full `timeout` before failing. Settle conditions are best-effort and
+        return None on timeout. Every wait lands in `self.timings` and as a "wait" span.
+        """
+        ceiling = float(timeout or WAIT_TIMEOUT)
+        required = condition not in SETTLE_CONDITIONS if required is None else required
+        name = step or condition
+        check = self._wait_condition(condition, locator, quiet)
+
+        start, start_wall = time.perf_counter(), datetime.datetime.now()
+        result, outcome, extended = None, "ok", 0
+        try:
+            bound = self._adaptive_timeout(name, ceiling)
+            try:
+                result = WebDriverWait(self.bot, bound, poll_frequency=WAIT_POLL).until(check)
+            except se.TimeoutException:
+                if bound >= ceiling:
+                    raise
+                logging.info("WAIT %s: slower than usual (> %.1fs) – extending to %.0fs", name, bound, ceiling)
+                extended = 1
+                result = WebDriverWait(self.bot, ceiling - bound, poll_frequency=WAIT_POLL).until(check)
+        except se.TimeoutException:
+            outcome = "timeout"
+            if required:
+                raise RuntimeError(f"{name}: '{condition}' not reached within {ceiling:g}s")
+        finally:
+            elapsed = time.perf_counter() - start
+            self.timings[f"wait:{name}"] = round(self.timings.get(f"wait:{name}", 0.0) + elapsed, 3)
+            self._record_span(f"wait:{name}", "wait", start_wall, elapsed, outcome, extended)
+            if outcome == "ok":
+                self._wait_history.setdefault(name, []).append(round(elapsed, 3))
+            logging.info("WAIT %s: %s after %.2fs (%s)", name, outcome, elapsed, condition)
+        return result
+
+    def arm_waits(self) -> None:
+        """Snapshot URL, DOM and network state right before an action (for change-based waits)."""
+        try:
+            self._armed_url = self.bot.current_url
+            self._armed_mutations = self.bot.execute_script(_MUTATION_JS)[0]
+        except Exception:
+            self._armed_url, self._armed_mutations = None, 0
+        self._net_inflight = {}
+        self._net_last = time.monotonic()
+        self._progress_seen = False
+        self._drain_performance_log()
+
+    def _wait_condition(self, condition: str, locator: Optional[Locator], quiet: float) -> Callable:
+        if condition == "clickable":
+            return EC.element_to_be_clickable(locator)
+        if condition == "present":
+            return EC.presence_of_element_located(locator)
+        if condition == "url_change":
+            return lambda d: d.current_url != self._armed_url
+        if condition == "dom_mutation":
+            # count < armed → the page navigated and a fresh observer started: also a change
+            return lambda d: d.execute_script(_MUTATION_JS)[0] != self._armed_mutations
+        if condition == "dom_settled":
+            return lambda d: d.execute_script(_MUTATION_JS)[1] >= quiet
+        if condition == "network_idle":
+            return lambda d: self._network_idle(quiet)
+        if condition == "upload_complete":
+            return lambda d: self._upload_complete(locator)
+        raise ValueError(f"Unknown wait condition '{condition}'")
+
+    def _drain_performance_log(self) -> Optional[list]:
+        try:
+            entries = self.bot.get_log("performance")
+        except Exception:
+            return None                      # driver started without performance logging
+        if entries:
+            self.on_performance_entries(entries)
+        return entries
+
+    def on_performance_entries(self, entries: list) -> None:
+        """Hook: every drained CDP log batch passes through here (the log is read-once)."""
+
+    def _network_idle(self, quiet: float) -> bool:
+        now = time.monotonic()
+        entries = self._drain_performance_log()
+        if entries is None:
+            # no CDP log: fall back to "no new resource entries for `quiet` seconds"
+            count = self.bot.execute_script("return performance.getEntriesByType('resource').length;")
+            if count != getattr(self, "_net_resource_count", None):
+                self._net_resource_count, self._net_last = count, now
+            return now - self._net_last >= quiet
+
+        for entry in entries:
+            try:
+                msg = json.loads(entry["message"])["message"]
+            except (KeyError, ValueError):
+                continue
+            method = msg.get("method", "")
+            request_id = msg.get("params", {}).get("requestId")
+            if method == "Network.requestWillBeSent":
+                self._net_inflight[request_id] = now
+                self._net_last = now
+            elif method in ("Network.loadingFinished", "Network.loadingFailed"):
+                self._net_inflight.pop(request_id, None)
+                self._net_last = now
+
+        pending = [t for t in self._net_inflight.values() if now - t < LONG_POLL_SECONDS]
+        return not pending and now - self._net_last >= quiet
+
+    def _upload_complete(self, locator: Optional[Locator]) -> bool:
+        scope = self.bot.find_element(*locator) if locator else None
+        pct = self.bot.execute_script(_PROGRESS_JS, scope)
+        if pct is None:
+            # bar gone after we saw it → finished; never seen → keep waiting
+            return self._progress_seen
+        self._progress_seen = True
+        return pct >= 100
+
+    # ---------- adaptive timeouts ----------
+    @property
+    def _wait_history(self) -> Dict[str, List[float]]:
+        if not hasattr(self, "_wait_history_cache"):
+            try:
+                with open(self._wait_history_path(), "r", encoding="utf-8") as f:
+                    self._wait_history_cache = json.load(f)
+            except (OSError, ValueError):
+                self._wait_history_cache = {}
+        return self._wait_history_cache
+
+    def _wait_history_path(self) -> str:
+        platform = self.PLATFORM or re.sub(r"\W+", "_", self.CLI_DESCRIPTION).lower()
+        return os.path.join(WAIT_HISTORY_DIR, f"wait_history_{platform}.json")
+
+    def _adaptive_timeout(self, name: str, ceiling: float) -> float:
+        samples = sorted(self._wait_history.get(name, [])[-WAIT_HISTORY_SIZE:])
+        if len(samples) < 5:
+            return ceiling
+        p95 = samples[min(len(samples) - 1, int(0.95 * len(samples)))]
+        return min(ceiling, max(WAIT_FLOOR, 3 * p95))
+
+    def save_wait_history(self) -> None:
+        """Persist the last WAIT_HISTORY_SIZE durations per step (atomic replace)."""
+        if not hasattr(self, "_wait_history_cache"):
+            return
+        history = {k: v[-WAIT_HISTORY_SIZE:] for k, v in self._wait_history_cache.items()}
+        path = self._wait_history_path()
+        tmp = f"{path}.{os.getpid()}.tmp"     # parallel uploaders of one platform share the file
+        try:
+            with open(tmp, "w", encoding="utf-8") as f:
+                json.dump(history, f, indent=1)
+            os.replace(tmp, path)
+        except OSError as e:
+            logging.warning("Could not save wait history – %s", e)
+
+    # ---------- text entry ----------
+    def enter_text(self, element: WebElement, text: str, step: str = "", replace: bool = True) -> str:
+        """
+        Put `text` into an input / textarea / contenteditable in O(1) round trips.
+
+        Tries CDP `Input.insertText`, then `execCommand('insertText')`, then
+        chunked send_keys, checking after each one that the box holds exactly
+        `text` (or its original content + `text` when `replace` is False) and
+        resetting it before the next. The strategy that works is remembered
+        for the rest of the run. Returns the name of the strategy used.
+        """
+        start, start_wall = time.monotonic(), datetime.datetime.now()
+        strategies = list(TEXT_STRATEGIES)
+        if self._text_strategy:
+            strategies.remove(self._text_strategy)
+            strategies.insert(0, self._text_strategy)
+
+        original = "" if replace else self._read_text(element)
+        expected = _normalize_text(text if replace else (original or "") + text)
+        used, outcome, tried = strategies[-1], "unverified", 0
+        for i, strategy in enumerate(strategies):
+            tried = i + 1
+            try:
+                if i > 0 and original is not None:    # drop whatever the failed attempt left behind
+                    self.bot.execute_script(_RESET_TEXT_JS, element, True, original)
+                self.bot.execute_script(_FOCUS_TEXT_JS, element, replace)
+                if strategy == "insert_text":
+                    self.bot.execute_cdp_cmd("Input.insertText", {"text": text})
+                elif strategy == "exec_command":
+                    if not self.bot.execute_script(_EXEC_INSERT_JS, text):
+                        continue
+                else:
+                    self._send_keys_chunked(text)
+            except Exception as e:
+                logging.info("%s: text strategy %s failed – %s", step or "TEXT", strategy, e)
+                continue
+
+            if _normalize_text(self._read_text(element)) == expected:
+                used = self._text_strategy = strategy
+                outcome = "ok"
+                break
+            logging.info("%s: text strategy %s did not verify.", step or "TEXT", strategy)
+        else:
+            logging.warning("%s: entered text could not be verified.", step or "TEXT")
+
+        elapsed = time.monotonic() - start
+        self.timings[f"text:{step or 'TEXT'}"] = round(elapsed, 3)
+        self._record_span(f"text:{step or 'TEXT'}", "text", start_wall, elapsed, outcome, max(tried - 1, 0))
+        logging.info("%s: %d chars via %s in %.2fs", step or "TEXT", len(text), used, elapsed)
+        return used
+
+    def _read_text(self, element: WebElement) -> Optional[str]:
+        try:
+            return self.bot.execute_script(_READ_TEXT_JS, element)
+        except Exception:
+            return None
+
+    def _send_keys_chunked(self, text: str) -> None:
+        """ChromeDriver can't type non-BMP characters (most emoji): insert those directly."""
+        for piece in re.split(r"([\U00010000-\U0010FFFF]+)", text):
+            if not piece:
+                continue
+            if ord(piece[0]) > 0xFFFF:
+                try:
+                    self.bot.execute_cdp_cmd("Input.insertText", {"text": piece})
+                except Exception:
+                    self.bot.execute_script(_EXEC_INSERT_JS, piece)
+                continue
+            for i in range(0, len(piece), TEXT_CHUNK_SIZE):
+                ActionChains(self.bot).send_keys(piece[i:i + TEXT_CHUNK_SIZE]).perform()
+
+    def click_checkpointed(self, element, checkpoint_name: str) -> bool:
+        """
+        `try_click` with `checkpoint_name` (e.g. "publishing") recorded right
+        before the click, and withdrawn again when the click verifiably failed.
+        """
+        self.checkpoint(checkpoint_name)
+        if self.try_click(element):
+            return True
+        self.journal.unmark(checkpoint_name)
+        return False
+
     def try_click(self, element) -> bool:
         """Try clicking the element via ActionChains, then JS if needed."""
         try:
@@ -245,35 +861,46 @@ class BaseUploader(ABC):
     def _step_button_handler(
             self, element_name: str, step_num: int, xpath: str,
             screenshots_dir: str, finish_delay: int = 1,
-            detect_dialog: bool = False):
-
-        if detect_dialog:
-            self._install_file_dialog_detector()   # must happen *before* click
+            detect_dialog: bool = False, wait_after: str = "dom_settled",
+            checkpoint_name: str = ""):
+        """
+        Click a button and wait for the page to react. `finish_delay` is now
+        only the upper bound of the `wait_after` condition (it used to be a
+        fixed sleep before and after the click's effects). `checkpoint_name`
+        is recorded right before the click (e.g. "publishing") and withdrawn
+        if the click fails.
+        """
 
-        # click the button
-        element = WebDriverWait(self.bot, 10).until(EC.element_to_be_clickable((By.XPATH, xpath)))
-        if not self.try_click(element):
-            raise RuntimeError(fr"STEP {step_num}: Couldn't click {element_name} Button.")
+        with self.span(fr"STEP {step_num} {element_name}"):
+            if detect_dialog:
+                self._install_file_dialog_detector()   # must happen *before* click
 
-        # diagnostics
-        self.save_screenshot(self.bot, self.debug, self.headless, screenshots_dir, fr"STEP {step_num} - {element_name} clicked")
+            # click the button
+            element = self.wait_for("clickable", fr"STEP {step_num} {element_name}", (By.XPATH, xpath), timeout=10)
+            self.arm_waits()
+            clicked = (self.click_checkpointed(element, checkpoint_name) if checkpoint_name
+                       else self.try_click(element))
+            if not clicked:
+                raise RuntimeError(fr"STEP {step_num}: Couldn't click {element_name} Button.")
 
-        if finish_delay > 0:
-            time.sleep(finish_delay)
+            # diagnostics
+            self.save_screenshot(self.bot, self.debug, self.headless, screenshots_dir, fr"STEP {step_num} - {element_name} clicked")
 
-        # wait for the dialog + optionally upload
-        if detect_dialog:
-            events = self._wait_file_dialog_events()
-            logging.info(f"STEP {step_num}: File-dialog events: {events}")
+            # wait for the dialog + optionally upload
+            if detect_dialog:
+                events = self._wait_file_dialog_events()
+                logging.info(f"STEP {step_num}: File-dialog events: {events}")
 
-            media_path = self.get_latest_media()
-            abs_path = os.path.abspath(media_path)
-            if abs_path:
-                self._send_file_to_latest_input(abs_path)
-                logging.info(f"STEP {step_num}: Send file into File-dialog: {abs_path}")
+                media_path = self.get_latest_media()
+                abs_path = os.path.abspath(media_path)
+                if abs_path:
+                    self.arm_waits()
+                    self._send_file_to_latest_input(abs_path)
+                    logging.info(f"STEP {step_num}: Send file into File-dialog: {abs_path}")
 
-        if finish_delay > 0:
-            time.sleep(finish_delay)
+            if finish_delay > 0 and wait_after:
+                self.wait_for(wait_after, fr"STEP {step_num} {element_name} settle",
+                              timeout=max(2 * finish_delay, WAIT_FLOOR), quiet=0.3)
 
 
     # def _step_file_input_handler(self, step_num: int, screenshots_dir: str):
@@ -303,30 +930,31 @@ class BaseUploader(ABC):
     
 
     def _step_textbox_handler(self, text: str, step_num: int, xpath: str, screenshots_dir: str):
-        if not text:
-            err_msg = fr"STEP {step_num}: No text found."
-            logging.error(err_msg)
-            raise RuntimeError(err_msg)
-        
-        try:
-            element = WebDriverWait(self.bot, 10).until(EC.element_to_be_clickable((By.XPATH, xpath)))
-
-            if not self.try_click(element):
-                err_msg = fr"STEP {step_num}: Could not click on textbox."
+        with self.span(fr"STEP {step_num} textbox"):
+            if not text:
+                err_msg = fr"STEP {step_num}: No text found."
                 logging.error(err_msg)
                 raise RuntimeError(err_msg)
+        
+            try:
+                element = WebDriverWait(self.bot, 10).until(EC.element_to_be_clickable((By.XPATH, xpath)))
 
-            ActionChains(self.bot).send_keys(text).perform()
-            logging.info(fr"STEP {step_num}: Text pasted.")
+                if not self.try_click(element):
+                    err_msg = fr"STEP {step_num}: Could not click on textbox."
+                    logging.error(err_msg)
+                    raise RuntimeError(err_msg)
+
+                self.enter_text(element, text, fr"STEP {step_num}")
+                logging.info(fr"STEP {step_num}: Text pasted.")
         
-        except Exception:
-            err_msg = fr"STEP {step_num}: Error while pasting text."
-            logging.error(err_msg)
-            raise RuntimeError(err_msg)
+            except Exception:
+                err_msg = fr"STEP {step_num}: Error while pasting text."
+                logging.error(err_msg)
+                raise RuntimeError(err_msg)
 
-        logging.info(fr"STEP {step_num}: Pasted text successfully")
-        self.save_screenshot(self.bot, self.debug, self.headless, screenshots_dir, fr"STEP {step_num} - Textbox Event")
-        time.sleep(1)
+            logging.info(fr"STEP {step_num}: Pasted text successfully")
+            self.save_screenshot(self.bot, self.debug, self.headless, screenshots_dir, fr"STEP {step_num} - Textbox Event")
+            self.wait_for("dom_settled", fr"STEP {step_num} textbox settle", timeout=2, quiet=0.3)
         
     # ────────────────────────────────
     # Utilities
@@ -407,6 +1035,9 @@ class BaseUploader(ABC):
     @classmethod
     def main(cls) -> None:
         args = cls.parse_arguments()
+        if args.resolve_publish and not resolve_publish(args.folder_path, cls.journal_name(),
+                                                        args.resolve_publish == "posted"):
+            logging.info("--resolve-publish: no unverified publish pending for %s.", cls.journal_name())
         uploader = cls(args.channel_name,
                        args.folder_path,
                        args.media_type,
@@ -0,0 +1,431 @@
+"""
+Global upload scheduler – one instance for every channel on the machine.
+
+Implements the Scheduler part of `Docs/BL Design.txt`: channels say *when*
+they may post (`MetaData/schedule.json`), the scheduler decides *what runs
+now* across all of them:
+
+• posting windows per channel (days + time ranges);
+• a priority queue of (channel, platform, clip) jobs;
+• global and per-platform concurrency caps;
+• CPU / RAM headroom before each Chrome launch, plus a launch gap;
+• per-account (channel + platform) minimum spacing between posts.
+
+Time, resources and uploads are injected (`Clock`, `probe`, `start_upload`),
+so the whole policy runs against `SimulatedClock` + `SimulatedUploads`:
+
+    python upload_scheduler.py --simulate 24
+
+schedule.json (every key optional):
+
+    {
+        "windows": ["mon-fri 09:00-12:00", "sat,sun 18:00-22:30"],
+        "priority": 3,                      # lower runs first, default 5
+        "min_spacing_minutes": 240,         # or {"youtube": 240, "tiktok": 120}
+        "platforms": ["youtube", "tiktok"]  # default: MetaData/media_list.txt
+    }
+"""
+
+from __future__ import annotations
+import argparse
+import datetime
+import heapq
+import itertools
+import json
+import logging
+import os
+import random
+import time
+from dataclasses import dataclass, field
+from typing import Callable, Dict, Iterable, List, Optional, Set, Tuple, Union
+
+try:
+    import psutil
+except ImportError:                 # headroom checks are skipped without psutil
+    psutil = None
+
+from base_uploader import UploadResult
+
+GLOBAL_LIMIT = 3                                    # Chrome instances at once
+PLATFORM_LIMITS = {"youtube": 1, "instagram": 1, "instagram_story": 1, "tiktok": 1, "facebook": 1}
+MAX_CPU_PERCENT = 80.0                              # no new launch above this
+MIN_FREE_RAM_MB = 1500                              # … or below this
+LAUNCH_GAP_SECONDS = 20                             # between two browser launches
+DEFAULT_PRIORITY = 5
+DEFAULT_MIN_SPACING_MINUTES = 240
+TICK_SECONDS = 15
+
+_DAYS = ["mon", "tue", "wed", "thu", "fri", "sat", "sun"]
+
+
+# ────────────────────────────────
+# Clocks
+# ────────────────────────────────
+class SystemClock:
+    def now(self) -> datetime.datetime:
+        return datetime.datetime.now()
+
+    def sleep(self, seconds: float) -> None:
+        time.sleep(seconds)
+
+
+class SimulatedClock:
+    """Time only moves when someone sleeps."""
+
+    def __init__(self, start: Optional[datetime.datetime] = None):
+        self._now = start or datetime.datetime(2025, 1, 6, 0, 0)     # a Monday
+
+    def now(self) -> datetime.datetime:
+        return self._now
+
+    def sleep(self, seconds: float) -> None:
+        self._now += datetime.timedelta(seconds=seconds)
+
+
+Clock = Union[SystemClock, SimulatedClock]
+
+
+# ────────────────────────────────
+# Channel schedules
+# ────────────────────────────────
+@dataclass(frozen=True)
+class PostingWindow:
+    days: frozenset                 # weekday numbers, Monday = 0
+    start: datetime.time
+    end: datetime.time              # end < start wraps past midnight
+
+    @classmethod
+    def parse(cls, spec: str) -> "PostingWindow":
+        """'mon-fri 09:00-12:00', 'sat,sun 18:00-02:00', 'daily 10:00-11:00', '09:00-17:00'."""
+        parts = spec.split()
+        day_spec, hours = (parts[0], parts[1]) if len(parts) == 2 else ("daily", parts[0])
+        days: Set[int] = set()
+        for token in day_spec.lower().split(","):
+            if token in ("daily", "*"):
+                days.update(range(7))
+            elif "-" in token:
+                a, b = (_DAYS.index(t[:3]) for t in token.split("-"))
+                days.update(range(a, b + 1) if a <= b else list(range(a, 7)) + list(range(0, b + 1)))
+            else:
+                days.add(_DAYS.index(token[:3]))
+        start, end = (datetime.time.fromisoformat(t) for t in hours.split("-"))
+        return cls(frozenset(days), start, end)
+
+    def contains(self, moment: datetime.datetime) -> bool:
+        t = moment.time()
+        if self.start <= self.end:
+            return moment.weekday() in self.days and self.start <= t < self.end
+        # overnight: the window belongs to the day it starts on
+        if t >= self.start:
+            return moment.weekday() in self.days
+        return t < self.end and (moment.weekday() - 1) % 7 in self.days
+
+
+@dataclass
+class ChannelSchedule:
+    name: str
+    platforms: List[str]
+    windows: List[PostingWindow] = field(default_factory=list)   # empty = always open
+    priority: int = DEFAULT_PRIORITY
+    min_spacing: Dict[str, float] = field(default_factory=dict)  # platform → seconds
+    default_spacing: float = DEFAULT_MIN_SPACING_MINUTES * 60
+
+    def is_open(self, moment: datetime.datetime) -> bool:
+        return not self.windows or any(w.contains(moment) for w in self.windows)
+
+    def spacing(self, platform: str) -> float:
+        return self.min_spacing.get(platform, self.default_spacing)
+
+    @classmethod
+    def load(cls, channel_dir: str) -> Optional["ChannelSchedule"]:
+        """Read MetaData/schedule.json + media_list.txt; None when the channel posts nowhere."""
+        meta = os.path.join(channel_dir, "MetaData")
+        try:
+            with open(os.path.join(meta, "schedule.json"), "r", encoding="utf-8") as f:
+                data = json.load(f)
+        except FileNotFoundError:
+            data = {}
+        platforms = data.get("platforms")
+        if platforms is None:
+            try:
+                with open(os.path.join(meta, "media_list.txt"), "r", encoding="utf-8") as f:
+                    platforms = [line.strip().lower() for line in f if line.strip()]
+            except FileNotFoundError:
+                platforms = []
+        if not platforms:
+            return None
+
+        spacing = data.get("min_spacing_minutes", DEFAULT_MIN_SPACING_MINUTES)
+        per_platform = spacing if isinstance(spacing, dict) else {}
+        default = per_platform.get("default", DEFAULT_MIN_SPACING_MINUTES) if per_platform else spacing
+        return cls(
+            name=os.path.basename(os.path.normpath(channel_dir)),
+            platforms=platforms,
+            windows=[PostingWindow.parse(w) for w in data.get("windows", [])],
+            priority=int(data.get("priority", DEFAULT_PRIORITY)),
+            min_spacing={p: float(m) * 60 for p, m in per_platform.items()},
+            default_spacing=float(default) * 60,
+        )
+
+
+# ────────────────────────────────
+# Jobs + resources
+# ────────────────────────────────
+@dataclass(order=True)
+class UploadJob:
+    priority: int
+    queued_at: datetime.datetime
+    seq: int
+    channel: str = field(compare=False)
+    platform: str = field(compare=False)
+    clip_folder: str = field(compare=False)
+
+    @property
+    def account(self) -> Tuple[str, str]:
+        return self.channel, self.platform
+
+
+def system_headroom() -> Tuple[float, float]:
+    """(CPU % in use, free RAM MB); (0, inf) when psutil is missing."""
+    if psutil is None:
+        return 0.0, float("inf")
+    return psutil.cpu_percent(interval=None), psutil.virtual_memory().available / 2 ** 20
+
+
+# ────────────────────────────────
+# Scheduler
+# ────────────────────────────────
+class Scheduler:
+    """
+    Callables:
+        channels()            → current ChannelSchedule list (re-read every tick)
+        next_clip(schedule)   → (clip folder, platforms still to deliver) or None
+        start_upload(job)     → future-like (done() / result() → UploadResult)
+        on_result(job, res)   → per platform result (logging)
+        on_clip_done(channel, clip_folder, results) → after the clip's last platform
+        renew_clip(channel, clip_folder)            → every tick while the clip has queued or running jobs
+
+    `last_posts` seeds the per-account spacing ({(channel, platform): time of
+    the last post}) so a restart doesn't post again right away.
+    """
+
+    def __init__(self,
+                 channels: Callable[[], Iterable[ChannelSchedule]],
+                 next_clip: Callable[[ChannelSchedule], Optional[Tuple[str, List[str]]]],
+                 start_upload: Callable[[UploadJob], object],
+                 on_result: Callable[[UploadJob, UploadResult], None] = lambda job, res: None,
+                 on_clip_done: Callable[[str, str, List[UploadResult]], None] = lambda c, f, r: None,
+                 renew_clip: Callable[[str, str], None] = lambda c, f: None,
+                 clock: Optional[Clock] = None,
+                 probe: Callable[[], Tuple[float, float]] = system_headroom,
+                 global_limit: int = GLOBAL_LIMIT,
+                 platform_limits: Optional[Dict[str, int]] = None,
+                 max_cpu: float = MAX_CPU_PERCENT,
+                 min_free_ram_mb: float = MIN_FREE_RAM_MB,
+                 launch_gap: float = LAUNCH_GAP_SECONDS,
+                 last_posts: Optional[Dict[Tuple[str, str], datetime.datetime]] = None):
+        self.channels = channels
+        self.next_clip = next_clip
+        self.start_upload = start_upload
+        self.on_result = on_result
+        self.on_clip_done = on_clip_done
+        self.renew_clip = renew_clip
+        self.clock = clock or SystemClock()
+        self.probe = probe
+        self.global_limit = global_limit
+        self.platform_limits = dict(PLATFORM_LIMITS if platform_limits is None else platform_limits)
+        self.max_cpu = max_cpu
+        self.min_free_ram_mb = min_free_ram_mb
+        self.launch_gap = launch_gap
+
+        self.queue: List[UploadJob] = []
+        self.running: Dict[int, Tuple[UploadJob, object]] = {}
+        self._seq = itertools.count()
+        self._schedules: Dict[str, ChannelSchedule] = {}
+        self._clips: Dict[str, Tuple[str, Set[str], List[UploadResult]]] = {}  # channel → (clip, pending, results)
+        self._last_post: Dict[Tuple[str, str], datetime.datetime] = dict(last_posts or {})
+        self._last_launch: Optional[datetime.datetime] = None
+
+    # ---------- one scheduling round ----------
+    def tick(self) -> List[UploadJob]:
+        self.reap()
+        self.renew()
+        self.plan()
+        return self.dispatch()
+
+    def run(self, until: Optional[datetime.datetime] = None, interval: float = TICK_SECONDS) -> None:
+        while until is None or self.clock.now() < until:
+            self.tick()
+            self.clock.sleep(interval)
+
+    def plan(self) -> None:
+        """Queue the next clip of every open channel that has nothing in flight."""
+        now = self.clock.now()
+        self._schedules = {s.name: s for s in self.channels()}
+        for schedule in self._schedules.values():
+            if schedule.name in self._clips or not schedule.is_open(now):
+                continue
+            work = self.next_clip(schedule)
+            if not work:
+                continue
+            clip, platforms = work
+            self._clips[schedule.name] = (clip, set(platforms), [])
+            if not platforms:                              # ledger says it's all delivered already
+                self.on_clip_done(schedule.name, clip, [])
+                del self._clips[schedule.name]
+                continue
+            for platform in platforms:
+                heapq.heappush(self.queue, UploadJob(schedule.priority, now, next(self._seq),
+                                                     schedule.name, platform, clip))
+            logging.info("SCHED: queued %s → %s", clip, ", ".join(platforms))
+
+    def renew(self) -> None:
+        """Keep every in-flight clip claimed: its jobs may wait hours for spacing or caps."""
+        for channel, (clip, _, _) in list(self._clips.items()):
+            self.renew_clip(channel, clip)
+
+    def dispatch(self) -> List[UploadJob]:
+        """Start every queued job that fits, best priority first; the rest stay queued."""
+        started, deferred = [], []
+        while self.queue:
+            job = heapq.heappop(self.queue)
+            reason = self._blocked(job)
+            if reason == "headroom":
+                deferred.append(job)
+                break                             # nothing else fits either
+            if reason:
+                deferred.append(job)
+                continue
+            self._launch(job)
+            started.append(job)
+        for job in deferred:
+            heapq.heappush(self.queue, job)
+        return started
+
+    def reap(self) -> None:
+        for key, (job, future) in list(self.running.items()):
+            if not future.done():
+                continue
+            del self.running[key]
+            try:
+                result = future.result()
+            except Exception as e:
+                result = UploadResult(job.platform, job.channel, "failure",
+                                      error_type=type(e).__name__, error=str(e))
+            self.on_result(job, result)
+            clip, pending, results = self._clips[job.channel]
+            pending.discard(job.platform)
+            results.append(result)
+            if not pending:
+                del self._clips[job.channel]
+                self.on_clip_done(job.channel, clip, results)
+
+    # ---------- policy ----------
+    def _blocked(self, job: UploadJob) -> Optional[str]:
+        now = self.clock.now()
+        schedule = self._schedules.get(job.channel)
+        if schedule is not None and not schedule.is_open(now):
+            return "window"
+        if len(self.running) >= self.global_limit:
+            return "global"
+        busy = sum(1 for j, _ in self.running.values() if j.platform == job.platform)
+        if busy >= self.platform_limits.get(job.platform, self.global_limit):
+            return "platform"
+        last = self._last_post.get(job.account)
+        spacing = schedule.spacing(job.platform) if schedule else 0
+        if last is not None and (now - last).total_seconds() < spacing:
+            return "spacing"
+        if self._last_launch is not None and (now - self._last_launch).total_seconds() < self.launch_gap:
+            return "headroom"
+        cpu, free_mb = self.probe()
+        if cpu > self.max_cpu or free_mb < self.min_free_ram_mb:
+            return "headroom"
+        return None
+
+    def _launch(self, job: UploadJob) -> None:
+        now = self.clock.now()
+        self._last_post[job.account] = now
+        self._last_launch = now
+        self.running[job.seq] = (job, self.start_upload(job))
+        logging.info("SCHED: start %s/%s (%s) – %d running", job.channel, job.platform,
+                     os.path.basename(job.clip_folder), len(self.running))
+
+    def stalled(self) -> bool:
+        """Nothing running and every queued job waits for a window or spacing (not resources)."""
+        return not self.running and all(self._blocked(j) in ("window", "spacing") for j in self.queue)
+
+    def status(self) -> dict:
+        return {
+            "queued": [(j.channel, j.platform) for j in sorted(self.queue)],
+            "running": [(j.channel, j.platform) for j, _ in self.running.values()],
+            "clips": {c: os.path.basename(v[0]) for c, v in self._clips.items()},
+        }
+
+
+# ────────────────────────────────
+# Simulation
+# ────────────────────────────────
+class SimulatedUploads:
+    """Fake uploaders for a SimulatedClock: each upload takes a random duration and may fail."""
+
+    class _Future:
+        def __init__(self, clock: SimulatedClock, ends: datetime.datetime, result: UploadResult):
+            self._clock, self._ends, self._result = clock, ends, result
+
+        def done(self) -> bool:
+            return self._clock.now() >= self._ends
+
+        def result(self) -> UploadResult:
+            return self._result
+
+    def __init__(self, clock: SimulatedClock, durations: Tuple[float, float] = (120, 600),
+                 failure_rate: float = 0.1, seed: int = 0):
+        self.clock = clock
+        self.durations = durations
+        self.failure_rate = failure_rate
+        self.rng = random.Random(seed)
+        self.log: List[Tuple[datetime.datetime, str, str]] = []
+
+    def __call__(self, job: UploadJob) -> "_Future":
+        duration = self.rng.uniform(*self.durations)
+        ok = self.rng.random() >= self.failure_rate
+        self.log.append((self.clock.now(), job.channel, job.platform))
+        result = UploadResult(job.platform, job.channel, "success" if ok else "failure",
+                              duration=round(duration, 1), error_type="" if ok else "SimulatedError")
+        return self._Future(self.clock, self.clock.now() + datetime.timedelta(seconds=duration), result)
+
+
+def simulate(hours: float = 24, channels: int = 6, clips_per_channel: int = 4, seed: int = 0) -> SimulatedUploads:
+    clock = SimulatedClock()
+    uploads = SimulatedUploads(clock, seed=seed)
+    rng = random.Random(seed)
+    platforms = ["youtube", "tiktok", "instagram"]
+    schedules = [
+        ChannelSchedule(f"Channel{i}", rng.sample(platforms, rng.randint(1, 3)),
+                        [PostingWindow.parse(rng.choice(["daily 08:00-12:00", "mon-fri 17:00-21:00", "daily 00:00-23:59"]))],
+                        priority=rng.randint(1, 9), default_spacing=3 * 3600)
+        for i in range(channels)
+    ]
+    backlog = {s.name: [f"{s.name}/clip{n}" for n in range(clips_per_channel)] for s in schedules}
+
+    scheduler = Scheduler(
+        channels=lambda: schedules,
+        next_clip=lambda s: (backlog[s.name][0], s.platforms) if backlog[s.name] else None,
+        start_upload=uploads,
+        on_clip_done=lambda channel, clip, results: backlog[channel].remove(clip),
+        clock=clock,
+        probe=lambda: (rng.uniform(10, 95), 4000.0),
+    )
+    scheduler.run(until=clock.now() + datetime.timedelta(hours=hours))
+    return uploads
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Upload scheduler policy simulation")
+    parser.add_argument("--simulate", type=float, default=24, metavar="HOURS")
+    parser.add_argument("--channels", type=int, default=6)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+    logging.getLogger().setLevel(logging.WARNING)
+    for moment, channel, platform in simulate(args.simulate, args.channels, seed=args.seed).log:
+        print(f"{moment:%a %H:%M:%S}  {channel:<10} {platform}")
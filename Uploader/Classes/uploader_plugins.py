@@ -0,0 +1,132 @@
+"""
+Uploader plugin discovery + in-process runner.
+
+Every `Platforms/<Platform>/<Uploader_X>/Code/Uploader_*.py` module that
+defines a `BaseUploader` subclass with `PLATFORM` set is a plugin. Plugins
+run inside a process pool whose workers import selenium, stealth and all
+plugin modules once, so each upload skips interpreter start-up and import
+time, and comes back as a structured `UploadResult` rather than stdout text.
+
+Each plugin folder ships its own `config.py` that the module star-imports,
+so modules are loaded one at a time with their folder first on `sys.path`
+and a fresh `config` import.
+"""
+
+from __future__ import annotations
+import concurrent.futures
+import glob
+import importlib.util
+import logging
+import os
+import re
+import sys
+from typing import Dict, Iterable, Iterator, Optional
+
+from base_uploader import BaseUploader, UploadResult
+
+PLUGIN_PATTERN = os.path.join("*", "*", "Code", "Uploader_*.py")
+
+_REGISTRY: Optional[Dict[str, type]] = None      # per worker process
+
+
+# ────────────────────────────────
+# Discovery
+# ────────────────────────────────
+def load_uploader_module(path: str):
+    """Import one uploader script by path, isolating its local `config` module."""
+    code_dir = os.path.dirname(os.path.abspath(path))
+    name = "uploader_plugin_" + re.sub(r"\W", "_", os.path.splitext(os.path.basename(path))[0])
+
+    saved_config = sys.modules.pop("config", None)
+    sys.path.insert(0, code_dir)
+    try:
+        spec = importlib.util.spec_from_file_location(name, path)
+        module = importlib.util.module_from_spec(spec)
+        sys.modules[name] = module
+        spec.loader.exec_module(module)
+        return module
+    finally:
+        sys.path.remove(code_dir)
+        sys.modules.pop("config", None)
+        if saved_config is not None:
+            sys.modules["config"] = saved_config
+
+
+def discover_uploaders(platforms_dir: str) -> Dict[str, type]:
+    """Map `PLATFORM` → uploader class for every plugin under `platforms_dir`."""
+    registry: Dict[str, type] = {}
+    for path in sorted(glob.glob(os.path.join(platforms_dir, PLUGIN_PATTERN))):
+        if "old" in os.path.basename(path).lower():
+            continue                                   # legacy scripts kept for reference
+        try:
+            module = load_uploader_module(path)
+        except Exception as e:
+            logging.warning("Skipping uploader plugin %s – %s", path, e)
+            continue
+        for obj in vars(module).values():
+            if (isinstance(obj, type) and issubclass(obj, BaseUploader)
+                    and obj.__module__ == module.__name__ and obj.PLATFORM):
+                registry[obj.PLATFORM] = obj
+    return registry
+
+
+# ────────────────────────────────
+# Worker side
+# ────────────────────────────────
+def _init_worker(platforms_dir: str) -> None:
+    global _REGISTRY
+    _REGISTRY = discover_uploaders(platforms_dir)
+
+
+def _run_in_worker(platform: str, channel_name: str, folder_path: str,
+                   headless: bool, debug: bool) -> UploadResult:
+    cls = (_REGISTRY or {}).get(platform)
+    if cls is None:
+        return UploadResult(platform, channel_name, "failure",
+                            error_type="UnknownPlatform", error=f"No uploader plugin for '{platform}'")
+    try:
+        uploader = cls(channel_name, folder_path, headless=headless, debug=debug)
+    except BaseException as e:                     # _validate_folder() exits on a bad path
+        return UploadResult(platform, channel_name, "failure", error_type=type(e).__name__, error=str(e))
+    return uploader.run_for_result()
+
+
+# ────────────────────────────────
+# Parent side
+# ────────────────────────────────
+def make_pool(max_workers: int, platforms_dir: str) -> concurrent.futures.ProcessPoolExecutor:
+    """Worker pool with all plugins pre-imported; keep it around to reuse the imports."""
+    return concurrent.futures.ProcessPoolExecutor(
+        max_workers=max_workers, initializer=_init_worker, initargs=(platforms_dir,)
+    )
+
+
+def submit_upload(pool: concurrent.futures.ProcessPoolExecutor, platform: str, channel_name: str,
+                  folder_path: str, headless: bool = True, debug: bool = False) -> concurrent.futures.Future:
+    """Queue one upload on a pool from `make_pool`; the future resolves to an `UploadResult`."""
+    return pool.submit(_run_in_worker, platform, channel_name, folder_path, headless, debug)
+
+
+def run_uploads(platforms: Iterable[str], channel_name: str, folder_path: str,
+                platforms_dir: str, headless: bool = True, debug: bool = False,
+                pool: Optional[concurrent.futures.ProcessPoolExecutor] = None) -> Iterator[UploadResult]:
+    """Run one upload per platform in parallel, yielding results as they finish."""
+    platforms = list(platforms)
+    if not platforms:
+        return
+    own_pool = pool is None
+    pool = pool or make_pool(len(platforms), platforms_dir)
+    try:
+        futures = {
+            submit_upload(pool, platform, channel_name, folder_path, headless, debug): platform
+            for platform in platforms
+        }
+        for future in concurrent.futures.as_completed(futures):
+            platform = futures[future]
+            try:
+                yield future.result()
+            except Exception as e:                 # worker crashed / result not picklable
+                yield UploadResult(platform, channel_name, "failure", error_type=type(e).__name__, error=str(e))
+    finally:
+        if own_pool:
+            pool.shutdown()
@@ -1,19 +1,26 @@
+import argparse
 import os
 import sys
 import subprocess
+import time
 import datetime
 import shutil
-import json
 import concurrent.futures
-from typing import List, Tuple
+from typing import Dict, List, Tuple
 
 from config import *  # Ensure this provides ROOT_DIR, LOGS_DIR, CHANNELS_ROOT_DIR, etc.
 
 INTERNAL_MODULES_DIR = "D:\\2025\\Projects\\Presence\\Presence0.1\\Resources\\Internal_Modules"
 sys.path.insert(0, INTERNAL_MODULES_DIR)
 import utilities.keyboard_switcher.keyboard_switcher as keyboard_switcher
+from uploaders.post_queue.post_queue import Post, PostQueue, default_owner
+from uploaders.upload_log.upload_log import TS_FORMAT, UploadLog, log_upload
+from uploaders.media_preflight.media_preflight import PREFLIGHT_DIR
+
+sys.path.insert(0, UPLOADER_CLASSES_DIR)
+from base_uploader import UploadResult, resolve_publish
+from uploader_plugins import run_uploads
 
-UPLOAD_LOG_PATH = r"D:\\2025\\Projects\\Presence\\Presence0.1\\Uploader\\Logs\\global_uploader_logs.json"
 
 class Logger(object):
     """Duplicate stdout & stderr to a log file (UTF‑8‑safe)."""
@@ -62,39 +69,90 @@ def select_channel(channels_root: str) -> str:
     return user_input
 
 
-def update_upload_log(channel_name: str, platform: str, status: str, log_path: str, exception: str | None = None) -> None:
-    os.makedirs(os.path.dirname(UPLOAD_LOG_PATH), exist_ok=True)
+def update_upload_log(channel_name: str, platform: str, status: str, log_path: str, exception: str | None = None,
+                      post_url: str | None = None, duration: float | None = None, clip: str | None = None) -> None:
+    """Append one attempt to the shared upload log (Uploader/Logs/upload_log.sqlite)."""
     try:
-        if os.path.exists(UPLOAD_LOG_PATH):
-            with open(UPLOAD_LOG_PATH, "r", encoding="utf-8") as f:
-                logs = json.load(f)
-        else:
-            logs = {}
-
-        logs.setdefault(channel_name, {})[platform] = {
-            "last_uploaded": datetime.datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
-            "status": status,
-            "exception": exception or "",
-            "log_file": log_path,
-        }
+        log_upload(channel_name, platform, status, exception=exception or "", log_file=log_path,
+                   post_url=post_url, duration=duration, clip=clip)
+    except Exception as e:
+        print(f"ERROR: Failed to update upload log: {e}")
 
-        with open(UPLOAD_LOG_PATH, "w", encoding="utf-8") as f:
-            json.dump(logs, f, indent=4)
 
+def last_successful_uploads() -> Dict[Tuple[str, str], datetime.datetime]:
+    """(channel, platform) → time of its latest successful upload in the shared upload log."""
+    try:
+        with UploadLog() as log:
+            latest = log.latest(status="success")
+        return {(channel, platform): datetime.datetime.strptime(entry["last_uploaded"], TS_FORMAT)
+                for channel, platforms in latest.items() for platform, entry in platforms.items()}
     except Exception as e:
-        print(f"ERROR: Failed to update upload log: {e}")
+        print(f"ERROR: Failed to read upload log: {e}")
+        return {}
+
+
+def parse_publish_resolution(spec: str) -> Tuple[str, bool]:
+    """'tiktok=posted' → ('tiktok', True); 'tiktok=retry' → ('tiktok', False)."""
+    platform, _, outcome = spec.partition("=")
+    if not platform.strip() or outcome.strip().lower() not in ("posted", "retry"):
+        raise argparse.ArgumentTypeError("Use PLATFORM=posted or PLATFORM=retry (e.g. tiktok=posted)")
+    return platform.strip().lower(), outcome.strip().lower() == "posted"
+
+
+def lease_next_clip(channel_dir: str, owner: str | None = None, post_id: int | None = None) -> Post | None:
+    """Lease the channel's next due post (or `post_id`) from its queue; unqueued Clips folders are added first."""
+    with PostQueue(channel_dir) as queue:
+        queue.sync_clips()
+        return queue.lease(owner or default_owner(), post_id=post_id)
+
+
+def pending_platforms(channel_dir: str, post: Post, platforms: List[str], account: str) -> List[str]:
+    """Register the required platforms in the post's delivery ledger; return those not yet delivered."""
+    with PostQueue(channel_dir) as queue:
+        queue.require(post.id, platforms, account)
+        return [platform for platform, acc in queue.missing(post.id) if acc == account]
+
+
+def record_delivery(channel_dir: str, post: Post, result: UploadResult) -> None:
+    with PostQueue(channel_dir) as queue:
+        queue.record_delivery(post.id, result.platform, result.channel_name, result.ok,
+                              post_url=result.post_url, error_type=result.error_type, error=result.error)
+
+
+def renew_clip(channel_dir: str, post: Post) -> bool:
+    """Push the post's lease expiry out again; False when the lease was already lost."""
+    with PostQueue(channel_dir) as queue:
+        return queue.renew(post.id, post.lease_owner)
+
 
+def finish_clip(channel_dir: str, post: Post) -> bool:
+    """Close the post's lease from its ledger; True once every required platform is delivered or waived."""
+    with PostQueue(channel_dir) as queue:
+        return queue.settle(post.id, post.lease_owner)
 
-def run_script(script_path: str, channel_name: str, clip_folder: str, platform: str, log_path: str) -> bool:
-    """Execute an uploader script for a single platform.
 
-    Returns True on success, False on failure. Exceptions are caught and
-    logged so they don't kill the whole thread pool.
+def archive_clip(clip_folder: str, archive_dir: str) -> str:
+    """Move a processed clip folder into the channel's archive; returns the new path."""
+    os.makedirs(archive_dir, exist_ok=True)
+    shutil.rmtree(os.path.join(clip_folder, PREFLIGHT_DIR), ignore_errors=True)   # conformed copies are a cache
+    destination = os.path.join(archive_dir, os.path.basename(clip_folder))
+    print(f"INFO: Moving folder '{clip_folder}' to archive: {destination}")
+    shutil.move(clip_folder, destination)
+    return destination
+
+
+def run_script(script_path: str, channel_name: str, clip_folder: str, platform: str) -> UploadResult:
+    """Execute an uploader script for a single platform in its own interpreter.
+
+    Subprocess mode – full isolation at the cost of a cold interpreter and
+    imports per upload. Exceptions are caught and reported in the result so
+    they don't kill the whole thread pool.
     """
 
     print(
         f"\nACTION: Running {platform.title()} Uploader\nCHANNEL: '{channel_name}',\nINPUT: '{clip_folder}'"
     )
+    start = time.perf_counter()
     try:
         result = subprocess.run(
             [sys.executable, script_path, channel_name, clip_folder],
@@ -104,15 +162,30 @@ def run_script(script_path: str, channel_name: str, clip_folder: str, platform:
             text=True,
         )
         print(result.stdout)
-        update_upload_log(channel_name, platform, status="success", log_path=log_path)
-        print(f"✅ {platform.title()} upload completed successfully.\n")
-        return True
+        return UploadResult(platform, channel_name, "success", duration=round(time.perf_counter() - start, 3))
 
     except subprocess.CalledProcessError as e:
         print(f"ERROR: '{os.path.basename(script_path)}' failed with exit code {e.returncode}")
         print(e.output)
-        update_upload_log(channel_name, platform, status="failure", log_path=log_path, exception=e.output)
-        return False  # Do not raise; let the main thread decide what to do.
+        return UploadResult(platform, channel_name, "failure", duration=round(time.perf_counter() - start, 3),
+                            error_type="CalledProcessError", error=e.output or "")
+
+
+def run_tasks_subprocess(tasks: List[Tuple[str, str]], channel_name: str, clip_folder: str):
+    """Yield an UploadResult per (script_path, platform) task, one subprocess each."""
+    # ThreadPoolExecutor is fine here because each task is an external
+    # subprocess; CPU‑bound Python limitations (GIL) don't apply.
+    with concurrent.futures.ThreadPoolExecutor(max_workers=len(tasks)) as executor:
+        futures = {
+            executor.submit(run_script, script, channel_name, clip_folder, platform): platform
+            for script, platform in tasks
+        }
+        for future in concurrent.futures.as_completed(futures):
+            platform = futures[future]
+            try:
+                yield future.result()
+            except Exception as exc:
+                yield UploadResult(platform, channel_name, "failure", error_type=type(exc).__name__, error=str(exc))
 
 
 def gather_tasks(media_list: List[str]) -> List[Tuple[str, str]]:
@@ -153,35 +226,35 @@ def main() -> None:
 
     print(f"INFO: Log file created: {log_filename}\n")
 
+    parser = argparse.ArgumentParser(description="Upload the next clip of a channel to all its platforms")
+    parser.add_argument("channel_name", nargs="?", default="", help="Channel folder name (prompted when omitted)")
+    parser.add_argument("--mode", choices=["inprocess", "subprocess"], default="inprocess",
+                        help="inprocess: plugin classes in a worker pool (default); subprocess: one interpreter per platform")
+    parser.add_argument("--retry-failed", action="store_true",
+                        help="Re-run only the missing platforms of the channel's failed posts")
+    parser.add_argument("--resolve-publish", type=parse_publish_resolution, action="append", default=[],
+                        metavar="PLATFORM=posted|retry",
+                        help="Settle a publish click an earlier run couldn't verify (check the account first): "
+                             "posted records it, retry publishes again. Repeatable")
+    args = parser.parse_args()
+
     # Select channel.
-    if len(sys.argv) > 1 and sys.argv[1].strip():
-        channel_name = sys.argv[1].strip()
+    if args.channel_name.strip():
+        channel_name = args.channel_name.strip()
         print(f"\nINFO: Channel provided from command line: {channel_name}")
     else:
         channel_name = select_channel(CHANNELS_ROOT_DIR)
         print(f"\nINFO: Channel selected: {channel_name}")
 
     base_dir = CHANNELS_ROOT_DIR
-    clips_dir = os.path.join(base_dir, channel_name, "Clips")
+    channel_dir = os.path.join(base_dir, channel_name)
+    clips_dir = os.path.join(channel_dir, "Clips")
     metadata_file = os.path.join(base_dir, channel_name, "MetaData", "media_list.txt")
-    archive_dir = os.path.join(base_dir, channel_name, "Clips_Archive")
 
     if not os.path.isdir(clips_dir):
         print(f"ERROR: Clips directory not found: {clips_dir}")
         sys.exit(1)
 
-    folders = [
-        os.path.join(clips_dir, d)
-        for d in os.listdir(clips_dir)
-        if os.path.isdir(os.path.join(clips_dir, d))
-    ]
-    if not folders:
-        print(f"ERROR: No folders found in: {clips_dir}")
-        sys.exit(1)
-
-    earliest_folder = min(folders, key=os.path.getctime)
-    print(f"INFO: Earliest folder found: {earliest_folder}")
-
     if not os.path.exists(metadata_file):
         print(f"ERROR: Media list file not found: {metadata_file}")
         sys.exit(1)
@@ -189,6 +262,40 @@ def main() -> None:
     with open(metadata_file, "r", encoding="utf-8") as f:
         media_list = [line.strip().lower() for line in f if line.strip()]
 
+    if args.retry_failed:
+        with PostQueue(channel_dir) as queue:
+            retry_ids = queue.retry_failed()
+        print(f"INFO: Retrying {len(retry_ids)} failed post(s) – missing platforms only.")
+        posts = [lease_next_clip(channel_dir, post_id=post_id) for post_id in retry_ids]
+    else:
+        posts = [lease_next_clip(channel_dir)]
+    posts = [p for p in posts if p]
+    if not posts:
+        print(f"ERROR: No queued post is due in: {clips_dir}")
+        sys.exit(1)
+
+    for platform, posted in args.resolve_publish:
+        for post in posts:
+            if resolve_publish(post.path, platform, posted):
+                print(f"INFO: Post #{post.id} {platform}: unverified publish marked as "
+                      f"{'posted' if posted else 'not posted – publishing again'}.")
+
+    success = True
+    for post in posts:
+        print(f"INFO: Post #{post.id} (priority {post.priority}, attempt {post.attempts}): {post.path}")
+        success &= upload_post(channel_name, channel_dir, post, media_list, args.mode, log_filename)
+
+    if success:
+        print("INFO: Process completed successfully.")
+    else:
+        print("ERROR: One or more uploads failed. See log for details.")
+        sys.exit(1)
+
+
+def upload_post(channel_name: str, channel_dir: str, post: Post, media_list: List[str],
+                mode: str, log_filename: str) -> bool:
+    """Run the post's undelivered platforms in parallel; archive it once fully delivered."""
+
     # ------------------------------------------------------------------
     # Run platform uploaders in parallel to speed things up.
     # ------------------------------------------------------------------
@@ -197,48 +304,44 @@ def main() -> None:
 
     if not tasks:
         print("WARNING: No valid media platforms detected – exiting.")
+        with PostQueue(channel_dir) as queue:
+            queue.release(post.id, post.lease_owner)
         sys.exit(0)
 
-    # ThreadPoolExecutor is fine here because each task is an external
-    # subprocess; CPU‑bound Python limitations (GIL) don't apply.
-    print("INFO: Launching uploaders in parallel...\n")
+    pending = pending_platforms(channel_dir, post, [platform for _, platform in tasks], channel_name)
+    tasks = [(script, platform) for script, platform in tasks if platform in pending]
+    print(f"INFO: Launching uploaders in parallel ({mode}): {', '.join(pending) or 'nothing left'}\n")
 
-    success = True
-    with concurrent.futures.ThreadPoolExecutor(max_workers=len(tasks)) as executor:
-        futures = {
-            executor.submit(
-                run_script, script, channel_name, earliest_folder, platform, log_filename
-            ): platform
-            for script, platform in tasks
-        }
+    if mode == "subprocess":
+        results = run_tasks_subprocess(tasks, channel_name, post.path) if tasks else []
+    else:
+        results = run_uploads([platform for _, platform in tasks], channel_name, post.path,
+                              platforms_dir=UPLOADER_PLATFORMS_DIR)
 
-        for future in concurrent.futures.as_completed(futures):
-            platform = futures[future]
-            try:
-                ok = future.result()
-                if not ok:
-                    success = False
-            except Exception as exc:
-                print(f"ERROR: {platform.title()} uploader raised an unexpected exception: {exc}")
-                success = False
+    for result in results:
+        if result.ok:
+            print(f"✅ {result.platform.title()} upload completed in {result.duration:.1f}s "
+                  f"{result.timings or ''} {result.post_url or ''}".rstrip())
+        else:
+            print(f"ERROR: {result.platform.title()} upload failed after {result.duration:.1f}s "
+                  f"[{result.error_type}] {result.error}")
+        record_delivery(channel_dir, post, result)
+        update_upload_log(
+            channel_name, result.platform, status=result.status, log_path=log_filename,
+            exception=f"{result.error_type}: {result.error}" if result.error_type else None,
+            post_url=result.post_url, duration=result.duration, clip=post.folder,
+        )
 
     # ------------------------------------------------------------------
-    # Archive processed folder after all uploaders finished.
+    # Archive only once every required platform has the clip; a failed
+    # post stays in Clips for --retry-failed.
     # ------------------------------------------------------------------
 
-    if not os.path.exists(archive_dir):
-        os.makedirs(archive_dir)
-
-    destination = os.path.join(archive_dir, os.path.basename(earliest_folder))
-    print(f"INFO: Moving folder '{earliest_folder}' to archive: {destination}")
-    shutil.move(earliest_folder, destination)
-
-    if success:
-        print("INFO: Process completed successfully.")
-    else:
-        print("ERROR: One or more uploads failed. See log for details.")
-        sys.exit(1)
-
+    if finish_clip(channel_dir, post):
+        archive_clip(post.path, os.path.join(channel_dir, "Clips_Archive"))
+        return True
+    print(f"WARNING: Post #{post.id} kept in Clips – missing platforms can be retried with --retry-failed.")
+    return False
 
 if __name__ == "__main__":
     main()
@@ -0,0 +1,125 @@
+"""
+Upload scheduler daemon – one per machine, replaces looping Channel_Uploader
+over every channel (All_Uploader_Executer.bat).
+
+Reads each channel's `MetaData/schedule.json` (see upload_scheduler.py) and
+runs uploads through one shared plugin worker pool, so concurrency caps,
+CPU/RAM headroom and per-account spacing hold across all channels.
+
+    python Upload_Scheduler.py                 # run forever
+    python Upload_Scheduler.py --once          # one scheduling round, wait for it, exit
+    python Upload_Scheduler.py --simulate 24   # policy dry-run: simulated clock, fake uploaders
+"""
+
+import argparse
+import datetime
+import os
+import sys
+import time
+
+from config import *
+
+sys.path.insert(0, UPLOADER_CLASSES_DIR)
+from upload_scheduler import GLOBAL_LIMIT, TICK_SECONDS, ChannelSchedule, Scheduler, simulate
+from uploader_plugins import make_pool, submit_upload
+
+from Channel_Uploader import (Logger, archive_clip, finish_clip, last_successful_uploads, lease_next_clip,
+                              pending_platforms, record_delivery, renew_clip, update_upload_log)
+
+SKIP_MARKERS = ("(not in use)",)
+
+
+def load_channels(channels_root: str):
+    schedules = []
+    for name in sorted(os.listdir(channels_root)):
+        channel_dir = os.path.join(channels_root, name)
+        if not os.path.isdir(channel_dir) or any(m in name.lower() for m in SKIP_MARKERS):
+            continue
+        try:
+            schedule = ChannelSchedule.load(channel_dir)
+        except Exception as e:
+            print(f"WARNING: Bad schedule for '{name}' – {e}")
+            continue
+        if schedule:
+            schedules.append(schedule)
+    return schedules
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Global upload scheduler for all channels")
+    parser.add_argument("--once", action="store_true", help="Run a single round and wait for its uploads")
+    parser.add_argument("--simulate", type=float, metavar="HOURS", help="Simulate HOURS with fake uploaders")
+    parser.add_argument("--visible", action="store_true", help="Run Chrome with a window")
+    args = parser.parse_args()
+
+    if args.simulate:
+        for moment, channel, platform in simulate(args.simulate).log:
+            print(f"{moment:%a %H:%M:%S}  {channel:<10} {platform}")
+        return
+
+    os.environ["PYTHONIOENCODING"] = "utf-8"
+    os.makedirs(LOGS_DIR, exist_ok=True)
+    log_filename = os.path.join(LOGS_DIR, f"scheduler_{datetime.datetime.now():%Y%m%d_%H%M%S}.log")
+    sys.stdout = Logger(log_filename)
+    sys.stderr = sys.stdout
+    print(f"INFO: Scheduler log: {log_filename}")
+
+    pool = make_pool(GLOBAL_LIMIT, UPLOADER_PLATFORMS_DIR)
+    leased = {}                                   # clip folder → Post leased from the brand queue
+
+    def next_clip(schedule):
+        channel_dir = os.path.join(CHANNELS_ROOT_DIR, schedule.name)
+        post = lease_next_clip(channel_dir)
+        if post is None:
+            return None
+        leased[post.path] = post
+        return post.path, pending_platforms(channel_dir, post, schedule.platforms, schedule.name)
+
+    def on_result(job, result):
+        state = "✅" if result.ok else f"ERROR [{result.error_type}] {result.error}"
+        print(f"{state} {job.channel}/{job.platform} in {result.duration:.1f}s {result.post_url or ''}".rstrip())
+        record_delivery(os.path.join(CHANNELS_ROOT_DIR, job.channel), leased[job.clip_folder], result)
+        update_upload_log(job.channel, job.platform, status=result.status, log_path=log_filename,
+                          exception=f"{result.error_type}: {result.error}" if result.error_type else None,
+                          post_url=result.post_url, duration=result.duration,
+                          clip=os.path.basename(job.clip_folder))
+
+    def keep_leased(channel, clip_folder):
+        # jobs can sit in the queue past LEASE_SECONDS waiting for spacing or caps
+        if not renew_clip(os.path.join(CHANNELS_ROOT_DIR, channel), leased[clip_folder]):
+            print(f"WARNING: Lease on {channel}/{os.path.basename(clip_folder)} was lost")
+
+    def on_clip_done(channel, clip_folder, results):
+        # archive only once every required platform is delivered (or waived)
+        if finish_clip(os.path.join(CHANNELS_ROOT_DIR, channel), leased.pop(clip_folder)):
+            archive_clip(clip_folder, os.path.join(CHANNELS_ROOT_DIR, channel, "Clips_Archive"))
+
+    scheduler = Scheduler(
+        channels=lambda: load_channels(CHANNELS_ROOT_DIR),
+        next_clip=next_clip,
+        start_upload=lambda job: submit_upload(pool, job.platform, job.channel, job.clip_folder,
+                                               headless=not args.visible),
+        on_result=on_result,
+        on_clip_done=on_clip_done,
+        renew_clip=keep_leased,
+        last_posts=last_successful_uploads(),      # spacing survives restarts
+    )
+
+    try:
+        if args.once:
+            scheduler.plan()
+            while not scheduler.stalled():
+                scheduler.reap()
+                scheduler.renew()
+                scheduler.dispatch()
+                time.sleep(1)
+        else:
+            scheduler.run()
+    except KeyboardInterrupt:
+        print("INFO: Scheduler stopped.")
+    finally:
+        pool.shutdown(cancel_futures=True)
+
+
+if __name__ == "__main__":
+    main()
@@ -1,5 +1,7 @@
 UPLOADER_ROOT_DIR = "D:\\2025\\Projects\\Presence\\Presence0.1\\Uploader"
 CHANNELS_ROOT_DIR = "D:\\2025\\Projects\\Presence\\Presence0.1\\Channels"
+UPLOADER_PLATFORMS_DIR = f"{UPLOADER_ROOT_DIR}\\Platforms"
+UPLOADER_CLASSES_DIR = f"{UPLOADER_ROOT_DIR}\\Classes"
 
 UPLOADER_SCRIPT_YOUTUBE = f"{UPLOADER_ROOT_DIR}\\Platforms\\Youtube\\Uploader_Youtube\\Code\\Uploader_YouTube_Post.py"
 UPLOADER_SCRIPT_TIKTOK = f"{UPLOADER_ROOT_DIR}\\Platforms\\Tiktok\\Uploader_Tiktok\\Code\\Uploader_TikTok_Post.py"
@@ -22,7 +22,7 @@ sys.path.insert(0, INTERNAL_MODULES_DIR)
 sys.path.insert(0, UPLOADER_CLASSES)
 
 from chrome_config import *
-from uploaders.run_chrome_beta.run_chrome_beta import start_browser
+from uploaders.run_chrome_beta.run_chrome_beta import start_browser, release_browser
 
 from base_uploader import BaseUploader
 
@@ -47,6 +47,7 @@ def get_description_from_json(folder_path: str) -> str:
 # ──────────────────────────────────────────────────────────────
 class FacebookReelUploader(BaseUploader):
     CLI_DESCRIPTION = "Facebook Reel Uploader"
+    PLATFORM = "facebook"
 
     # ---------- BaseUploader hooks ----------
     def setup(self) -> None:
@@ -58,9 +59,11 @@ class FacebookReelUploader(BaseUploader):
             CHROME_BETA_USER_DATA_DIR,
             CHROME_BETA_EXE_PATH,
             headless=self.headless,
+            platform="facebook",
+            url=PLATFORM_URL,
         )
         self.maximize_window(self.bot, self.headless)
-        self.bot.get(PLATFORM_URL)
+        self.open_page(PLATFORM_URL)
 
     def execute_steps(self) -> None:
         # STEP 1
@@ -76,6 +79,7 @@ class FacebookReelUploader(BaseUploader):
             self._step_button_handler("Add Video", 2, add_video_xpath, DEBUG_SCREENSHOTS_DIR, detect_dialog=True)
         except RuntimeError as e:
             raise RuntimeError(e)
+        self.checkpoint("media_uploaded")
 
         # # STEP 3
         # try:
@@ -91,7 +95,8 @@ class FacebookReelUploader(BaseUploader):
         except RuntimeError as e:
             pass
 
-        time.sleep(3)
+        self.wait_for("network_idle", "STEP 4 settle", timeout=3)
+        self.checkpoint("metadata_filled")
 
         # STEP 5
         try:
@@ -110,15 +115,18 @@ class FacebookReelUploader(BaseUploader):
         # STEP 7
         try:
             share_button_xpath = "//div[@role='button' and (.//div[text()='שיתוף'] or .//div[text()='Share'])]"
-            self._step_button_handler("Share", 7, share_button_xpath, DEBUG_SCREENSHOTS_DIR)
+            self._step_button_handler("Share", 7, share_button_xpath, DEBUG_SCREENSHOTS_DIR,
+                                      finish_delay=5, wait_after="network_idle",
+                                      checkpoint_name="publishing")
         except RuntimeError as e:
             raise RuntimeError(e)
+        self.checkpoint("published")
         
 
     def teardown(self) -> None:
         self.save_screenshot(self.bot, self.debug, self.headless, DEBUG_SCREENSHOTS_DIR, "Finish")
         try:
-            self.bot.quit()
+            release_browser(self.bot)
         except Exception:
             pass
         logging.info("Browser closed – uploader finished.")
@@ -22,7 +22,7 @@ sys.path.insert(0, INTERNAL_MODULES_DIR)
 sys.path.insert(0, UPLOADER_CLASSES)
 
 from chrome_config import *
-from uploaders.run_chrome_beta.run_chrome_beta import start_browser
+from uploaders.run_chrome_beta.run_chrome_beta import start_browser, release_browser
 
 from base_uploader import BaseUploader
 
@@ -87,6 +87,7 @@ def get_description_from_json(folder_path: str) -> str:
 # ──────────────────────────────────────────────────────────────
 class InstagramPostUploader(BaseUploader):
     CLI_DESCRIPTION = "Instagram Post Uploader"
+    PLATFORM = "instagram"
 
     # ---------- BaseUploader hooks ----------
     def setup(self) -> None:
@@ -97,9 +98,11 @@ class InstagramPostUploader(BaseUploader):
             CHROME_BETA_USER_DATA_DIR,
             CHROME_BETA_EXE_PATH,
             headless=self.headless,
+            platform="instagram",
+            url=PLATFORM_URL,
         )
         self.maximize_window(self.bot, self.headless)
-        self.bot.get(PLATFORM_URL)
+        self.open_page(PLATFORM_URL)
 
     def execute_steps(self) -> None:
         """High‑level workflow for posting a single video (reel) as in your legacy script."""
@@ -113,6 +116,7 @@ class InstagramPostUploader(BaseUploader):
         # STEP 3: Select/upload the video file (headless vs. visible dialog)
         if not self._step_select_media(file_input):
             return
+        self.checkpoint("media_uploaded")
 
         # STEP 4: Handle crop mode (portrait) dialogs
         if not self._step_handle_crop_flow():
@@ -120,6 +124,7 @@ class InstagramPostUploader(BaseUploader):
 
         # STEP 5: Paste caption / description
         self._step_paste_description()
+        self.checkpoint("metadata_filled")
 
         # STEP 6: Share + wait confirmation
         self._step_share_and_confirm()
@@ -133,7 +138,7 @@ class InstagramPostUploader(BaseUploader):
             "POST‑FINISHED",
         )
         try:
-            self.bot.quit()
+            release_browser(self.bot)
         except Exception:
             pass
         logging.info("Browser closed – uploader finished.")
@@ -149,7 +154,7 @@ class InstagramPostUploader(BaseUploader):
                 raise RuntimeError("STEP 1: Cannot click 'Create'.")
 
             logging.info("STEP 1: Clicked 'Create'.")
-            time.sleep(1)
+            self.wait_for("dom_settled", "STEP 1 settle", timeout=2, quiet=0.3)
             self.save_screenshot(
                 self.bot,
                 self.debug,
@@ -219,7 +224,7 @@ class InstagramPostUploader(BaseUploader):
             time.sleep(0.3)
             logging.info("STEP 3: Selected %s via OS dialog and closed the dialog.", self.media_type)
 
-        time.sleep(1)
+        self.wait_for("dom_settled", "STEP 3 settle", timeout=2, quiet=0.3)
         self.save_screenshot(
             self.bot,
             self.debug,
@@ -239,7 +244,7 @@ class InstagramPostUploader(BaseUploader):
             return False
         if not self._click_next_crop():
             return False
-        time.sleep(1)
+        self.wait_for("dom_settled", "STEP 4 crop settle", timeout=2, quiet=0.3)
         if not self._click_next_preview():
             return False
         return True
@@ -260,8 +265,7 @@ class InstagramPostUploader(BaseUploader):
                 )
             )
             try_click(self.bot, caption)
-            time.sleep(0.5)
-            ActionChains(self.bot).send_keys(text).perform()
+            self.enter_text(caption, text, "STEP 5 caption")
             logging.info("STEP 5: Caption pasted.")
         except Exception as e:
             logging.error("STEP 5: Could not paste caption – %s", e)
@@ -286,6 +290,7 @@ class InstagramPostUploader(BaseUploader):
         )
         if self._wait_for_share_confirmation():
             logging.info("STEP 6: Upload confirmed.")
+            self.checkpoint("published")
         else:
             logging.error("STEP 6: No confirmation detected.")
             raise RuntimeError("STEP 6: No confirmation detected.")
@@ -355,10 +360,8 @@ class InstagramPostUploader(BaseUploader):
                 EC.element_to_be_clickable((By.XPATH, ".//div[@role='button' and normalize-space()='Share']"))
             )
             self.bot.execute_script("arguments[0].scrollIntoView({block: 'center'});", share_btn)
-            try:
-                share_btn.click()
-            except Exception:
-                self.bot.execute_script("arguments[0].click();", share_btn)
+            if not self.click_checkpointed(share_btn, "publishing"):
+                raise RuntimeError("click failed")
             logging.info("STEP 6: Clicked 'Share'.")
             return True
         except Exception as e:
@@ -132,13 +132,17 @@ def select_image(self, file_input=None):
             raise RuntimeError("STEP 3: Failed to interact with file dialog – %s", e)
 
 
-def click_add_to_your_story(bot, timeout=30):
+def click_add_to_your_story(bot, timeout=30, click=None):
+    """`click(button) -> bool` replaces the plain click (e.g. a checkpointed one)."""
     xpath = "//span[normalize-space()='Add to your story']"
     try:
         btn = WebDriverWait(bot, timeout).until(
             EC.element_to_be_clickable((By.XPATH, xpath))
         )
-        btn.click()
+        if click is None:
+            btn.click()
+        elif not click(btn):
+            raise RuntimeError("click failed")
         logging.info("STEP 4: Clicked 'Add to your story' button.")
         return True
     except Exception as e:
@@ -151,6 +155,7 @@ def click_add_to_your_story(bot, timeout=30):
 # ──────────────────────────────────────────────────────────────
 class InstagramStoryUploader(BaseUploader):
     CLI_DESCRIPTION = "Instagram Story Uploader"
+    PLATFORM = "instagram_story"
 
     # ----- lifecycle hooks -----
     def setup(self) -> None:
@@ -161,9 +166,11 @@ class InstagramStoryUploader(BaseUploader):
             CHROME_BETA_USER_DATA_DIR,
             CHROME_BETA_EXE_PATH,
             headless=self.headless,
+            platform="instagram",
+            url=PLATFORM_URL,
         )
         self.maximize_window(self.bot, self.headless)
-        self.bot.get(PLATFORM_URL)
+        self.open_page(PLATFORM_URL)
 
     def execute_steps(self) -> None:
         # STEP 1
@@ -188,6 +195,7 @@ class InstagramStoryUploader(BaseUploader):
 
         # STEP 3
         select_image(self, file_input)
+        self.checkpoint("media_uploaded")
         self.save_screenshot(
             self.bot,
             self.debug,
@@ -197,7 +205,8 @@ class InstagramStoryUploader(BaseUploader):
         )
 
         # STEP 4
-        click_add_to_your_story(self.bot)
+        self.arm_waits()
+        click_add_to_your_story(self.bot, click=lambda btn: self.click_checkpointed(btn, "publishing"))
         self.save_screenshot(
             self.bot,
             self.debug,
@@ -206,7 +215,9 @@ class InstagramStoryUploader(BaseUploader):
             "STORY‑STEP‑4",
         )
 
-        time.sleep(5)
+        # story is posted once its upload request has gone out and settled
+        self.wait_for("network_idle", "STEP 4 publish", timeout=10, quiet=1.0)
+        self.checkpoint("published")
 
     def teardown(self) -> None:
         self.save_screenshot(
@@ -216,7 +227,7 @@ class InstagramStoryUploader(BaseUploader):
             DEBUG_SCREENSHOTS_DIR,
             "STORY‑FINISHED",
         )
-        self.bot.quit()
+        release_browser(self.bot)
 
 
 # ──────────────────────────────────────────────────────────────
@@ -9,7 +9,6 @@ TikTok Video Uploader – built on BaseUploader
 from __future__ import annotations
 import os, sys, time, json, logging
 from selenium.webdriver.common.by import By
-from selenium.webdriver.common.keys import Keys
 from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
 from selenium.common.exceptions import TimeoutException
@@ -20,7 +19,7 @@ sys.path.insert(0, INTERNAL_MODULES_DIR)
 sys.path.insert(0, UPLOADER_CLASSES)
 
 from chrome_config import *
-from uploaders.run_chrome_beta.run_chrome_beta import start_browser
+from uploaders.run_chrome_beta.run_chrome_beta import start_browser, release_browser
 
 from base_uploader import BaseUploader
 
@@ -59,6 +58,7 @@ def read_description(folder: str) -> str:
 # ──────────────────────────────────────────────────────────────
 class TikTokVideoUploader(BaseUploader):
     CLI_DESCRIPTION = "TikTok Video Uploader"
+    PLATFORM = "tiktok"
 
     # ---------- BaseUploader hooks ----------
     def setup(self) -> None:
@@ -72,9 +72,11 @@ class TikTokVideoUploader(BaseUploader):
             CHROME_BETA_USER_DATA_DIR,
             CHROME_BETA_EXE_PATH,
             headless=self.headless,
+            platform="tiktok",
+            url=PLATFORM_URL,
         )
         self.maximize_window(self.bot, self.headless)
-        self.bot.get(PLATFORM_URL)                     # https://www.tiktok.com/upload
+        self.open_page(PLATFORM_URL)                     # https://www.tiktok.com/upload
 
     def execute_steps(self) -> bool:
         """Upload the newest MP4 found in folder_path to TikTok."""
@@ -89,36 +91,43 @@ class TikTokVideoUploader(BaseUploader):
         # STEP 1 – choose file (headless or visible)
         try:
             file_input = wait_present(self.bot, By.CSS_SELECTOR, "input[type='file']", 60)
+            self.arm_waits()
             file_input.send_keys(os.path.abspath(video_path))
             logging.info("STEP 1: Video path sent.")
         except Exception as e:
             raise RuntimeError(f"STEP 1: Cannot send file – {e}")
 
-        time.sleep(5)
+        self.wait_for("dom_mutation", "STEP 1 upload started", timeout=10, required=False)
+        self.wait_for("dom_settled", "STEP 1 settle", timeout=5)
         close_popups_if_any(self.bot)
+        self.checkpoint("media_uploaded")
 
         # STEP 2 – fill description
         if description:
             self._replace_description(description)
+        self.checkpoint("metadata_filled")
 
         # STEP 3 – click Post
         try:
             post_btn = wait_clickable(self.bot, "//*[text()='Post']", 60)
             self.bot.execute_script("arguments[0].scrollIntoView({block:'center'});", post_btn)
-            post_btn.click()
+            self.arm_waits()
+            if not self.click_checkpointed(post_btn, "publishing"):
+                raise RuntimeError("click failed")
             logging.info("STEP 3: Clicked 'Post'.")
         except Exception as e:
             raise RuntimeError(f"STEP 3: Cannot click Post – {e}")
 
         # (Optional) wait for confirmation banner
         self.save_screenshot(self.bot, self.debug, self.headless, DEBUG_SCREENSHOTS_DIR, "TIKTOK_POST_CLICKED")
-        time.sleep(3)   # adjust if you want a stronger confirmation check
+        self.wait_for("network_idle", "STEP 3 publish", timeout=10, quiet=1.0)
+        self.checkpoint("published")
         return True
 
     def teardown(self) -> None:
         self.save_screenshot(self.bot, self.debug, self.headless, DEBUG_SCREENSHOTS_DIR, "TIKTOK_FINISH")
         try:
-            self.bot.quit()
+            release_browser(self.bot)
         finally:
             logging.info("Browser closed – TikTok uploader finished.")
 
@@ -140,10 +149,8 @@ class TikTokVideoUploader(BaseUploader):
                     self.bot, By.XPATH,
                     "//div[@contenteditable='true' and contains(@class,'public-DraftEditor-content')]", 60)
 
-            self.bot.execute_script("arguments[0].innerHTML='';", desc_area)
-            desc_area.click(); time.sleep(0.3)
-            desc_area.send_keys(Keys.CONTROL, "a"); desc_area.send_keys(Keys.BACKSPACE)
-            desc_area.send_keys(text)
+            # select-all + insert replaces the filename placeholder through Draft.js itself
+            self.enter_text(desc_area, text, "STEP 2 description")
             logging.info("STEP 2: Description updated.")
         except Exception as e:
             logging.warning("STEP 2: Cannot update description – %s", e)
@@ -7,6 +7,7 @@ YouTube Video Uploader – built on BaseUploader
 
 from __future__ import annotations
 import os, sys, time, json, logging
+import urllib.error, urllib.request
 from selenium.webdriver.common.by import By
 from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
@@ -18,8 +19,10 @@ sys.path.insert(0, INTERNAL_MODULES_DIR)
 sys.path.insert(0, UPLOADER_CLASSES)
 
 from chrome_config import *
-from uploaders.run_chrome_beta.run_chrome_beta import start_browser
+from uploaders.run_chrome_beta.run_chrome_beta import start_browser, release_browser
+from uploaders.platform_standin.platform_standin import standin_url
 from base_uploader import BaseUploader
+from studio_network import StudioProcessingWatcher, cdp_body_reader
 
 # ──────────────────────────────────────────────────────────────
 # Generic selenium helpers
@@ -58,20 +61,24 @@ def read_json(folder: str) -> tuple[str, str]:
 # ──────────────────────────────────────────────────────────────
 class YouTubeVideoUploader(BaseUploader):
     CLI_DESCRIPTION = "YouTube Video Uploader"
+    PLATFORM = "youtube"
 
     # ---------- BaseUploader hooks ----------
     def setup(self) -> None:
         self.clear_screenshots(self.debug, self.headless, DEBUG_SCREENSHOTS_DIR)
         self.media_type = "video"
+        self.studio = None                  # StudioProcessingWatcher, armed at the file send
 
         self.bot = start_browser(
             self.channel_name,
             CHROME_BETA_USER_DATA_DIR,
             CHROME_BETA_EXE_PATH,
             headless=self.headless,
+            platform="youtube",
+            url=PLATFORM_URL,
         )
         self.maximize_window(self.bot, self.headless)
-        self.bot.get(PLATFORM_URL)
+        self.open_page(PLATFORM_URL)
 
     def execute_steps(self) -> bool:
         video_path = self.get_latest_media()
@@ -81,60 +88,123 @@ class YouTubeVideoUploader(BaseUploader):
         title, description = read_json(self.folder_path)
         logging.info("Using file: %s", video_path)
 
-        # STEP 1 – click upload icon
+        # an earlier attempt already uploaded a draft: reopen it instead of re-uploading
+        draft_id = self.resume_point("media_uploaded").get("video_id")
+        if not (draft_id and self._open_draft(draft_id)):
+            self._upload_media(video_path)
+
+        # STEP 4 – fill title & description
+        self._update_details(title, description)
+        self.checkpoint("metadata_filled")
+
+        # STEP 5 – click Next ×3 then Done
+        self._click_next_buttons()
+        self._click_done()
+
+        self.save_screenshot(self.bot, self.debug, self.headless, DEBUG_SCREENSHOTS_DIR, "YT_FINISH")
+        return True
+
+    def teardown(self) -> None:
+        try:
+            release_browser(self.bot)
+        finally:
+            logging.info("Browser closed – YouTube uploader finished.")
+
+    def on_performance_entries(self, entries: list) -> None:
+        studio = getattr(self, "studio", None)
+        if studio is not None:
+            studio.feed(entries)
+
+    def find_existing_post(self):
+        """oEmbed answers 200 only for public / unlisted videos – drafts and private ones are 401/403/404."""
+        video_id = self.resume_point("media_uploaded").get("video_id")
+        if not video_id:
+            return None
+        url = f"https://youtu.be/{video_id}"
+        try:
+            with urllib.request.urlopen(standin_url(f"https://www.youtube.com/oembed?format=json&url={url}"),
+                                        timeout=10):
+                return url
+        except urllib.error.HTTPError as e:
+            return False if e.code in (401, 403, 404) else None
+        except OSError:
+            return None
+
+    # ---------- helpers ----------
+    def _upload_media(self, video_path: str) -> None:
+        # STEP 1 – click upload icon
         try:
             upload_icon = wait_clickable(self.bot, "//*[@id='upload-icon']", 60)
             upload_icon.click()
         except Exception as e:
             raise RuntimeError(f"STEP 1: Cannot click upload icon – {e}")
 
-        # STEP 2 – send file path
+        # STEP 2 – send file path
         try:
             file_input = wait_present(self.bot, By.CSS_SELECTOR, "input[type='file']", 60)
+            self.arm_waits()
+            self.studio = StudioProcessingWatcher(cdp_body_reader(self.bot))
             file_input.send_keys(os.path.abspath(video_path))
             logging.info("STEP 2: File path sent.")
         except Exception as e:
             raise RuntimeError(f"STEP 2: Cannot send file – {e}")
 
-        time.sleep(10); close_popups(self.bot)
+        # details dialog opens as soon as the upload starts
+        self.wait_for("dom_mutation", "STEP 2 upload dialog", timeout=10, required=False)
+        self.wait_for("dom_settled", "STEP 2 settle", timeout=10)
+        close_popups(self.bot)
 
-        # STEP 3 – wait for processing (Next button enabled)
+        # STEP 3 – wait for processing (Next button enabled)
         if not self._wait_processing():
             raise RuntimeError("STEP 3: Processing timeout")
+        if self.studio.video_id:
+            self.checkpoint("media_uploaded", video_id=self.studio.video_id)
 
-        # STEP 4 – fill title & description
-        self._update_details(title, description)
-
-        # STEP 5 – click Next ×3 then Done
-        self._click_next_buttons()
-        self._click_done()
-
-        self.save_screenshot(self.bot, self.debug, self.headless, DEBUG_SCREENSHOTS_DIR, "YT_FINISH")
-        return True
-
-    def teardown(self) -> None:
+    def _open_draft(self, video_id: str) -> bool:
+        """Reopen the details dialog of an already-uploaded draft (Studio shows the upload wizard for drafts)."""
+        logging.info("STEP 1-3: Resuming draft %s instead of re-uploading.", video_id)
         try:
-            self.bot.quit()
-        finally:
-            logging.info("Browser closed – YouTube uploader finished.")
+            self.open_page(f"https://studio.youtube.com/video/{video_id}/edit")
+            self.wait_for("clickable", "STEP 3 draft dialog",
+                          (By.XPATH, '//ytcp-button[contains(@id,"next-button")]'), timeout=30)
+        except Exception as e:
+            logging.warning("STEP 1-3: Draft %s not resumable (%s) – uploading again.", video_id, e)
+            self.open_page(PLATFORM_URL)
+            return False
+        self.post_url = f"https://youtu.be/{video_id}"
+        return True
 
-    # ---------- helpers ----------
     def _wait_processing(self, limit=600) -> bool:
+        """
+        Done when Studio's own upload/status responses say so (read off the
+        CDP log) or, without performance logging, when Next becomes enabled.
+        """
         logging.info("STEP 3: Waiting for processing…")
-        waited = 0
-        while waited < limit:
-            try:
-                next_btn = self.bot.find_element(By.ID, "next-button")
-                if next_btn.is_enabled():
-                    logging.info("STEP 3: Processing complete.")
+        studio = self.studio
+        last_progress = [None]
+
+        def processed(bot):
+            if self._drain_performance_log() is not None:
+                if studio.failed:
+                    raise RuntimeError(f"STEP 3: Studio reports {studio.status}")
+                if studio.progress != last_progress[0]:
+                    last_progress[0] = studio.progress
+                    logging.info("STEP 3: processing %s%% (%s)", studio.progress, studio.status or "…")
+                if studio.ready:
                     return True
+            try:
+                return bot.find_element(By.ID, "next-button").is_enabled()
             except Exception:
-                pass
-            time.sleep(10); waited += 10
-            if waited % 120 == 0:
-                logging.info("STEP 3: %ss elapsed – refreshing.", waited)
-                self.bot.refresh(); time.sleep(5)
-        return False
+                return False
+
+        try:
+            WebDriverWait(self.bot, limit, poll_frequency=0.5).until(processed)
+        except TimeoutException:
+            return False
+        if studio.video_id:
+            self.post_url = f"https://youtu.be/{studio.video_id}"
+        logging.info("STEP 3: Processing complete (%s).", self.post_url or "video id unknown")
+        return True
 
     def _update_details(self, title: str, description: str) -> None:
         if not (title or description):
@@ -149,9 +219,9 @@ class YouTubeVideoUploader(BaseUploader):
             title_box, desc_box = boxes[0], boxes[1]
 
             if title:
-                title_box.clear(); title_box.send_keys(title)
+                self.enter_text(title_box, title, "STEP 4 title")
             if description:
-                desc_box.clear(); desc_box.send_keys(description)
+                self.enter_text(desc_box, description, "STEP 4 description")
             logging.info("STEP 4: Title/description set.")
         except Exception as e:
             logging.warning("STEP 4: Cannot update metadata – %s", e)
@@ -164,21 +234,26 @@ class YouTubeVideoUploader(BaseUploader):
                     self.bot.execute_script("arguments[0].scrollIntoView({block:'center'});", next_btn)
                     next_btn.click()
                     logging.info("STEP 5: Clicked Next (%d/3).", i + 1)
-                    time.sleep(1.5)
+                    self.wait_for("dom_settled", "STEP 5 next settle", timeout=3, quiet=0.3)
                     break
                 except Exception as e:
                     logging.warning("STEP 5: Next not clickable (try %d) – %s", attempt + 1, e)
-                    self.bot.refresh(); time.sleep(5)
+                    self.bot.refresh()
+                    self.wait_for("dom_settled", "STEP 5 refresh settle", timeout=5)
 
     def _click_done(self) -> None:
         try:
             done_btn = wait_clickable(self.bot, '//ytcp-button[contains(@id,"done-button")]', 60)
             self.bot.execute_script("arguments[0].scrollIntoView({block:'center'});", done_btn)
-            done_btn.click()
+            self.arm_waits()
+            if not self.click_checkpointed(done_btn, "publishing"):
+                raise RuntimeError("click failed")
             logging.info("STEP 6: Clicked Done.")
-            time.sleep(3)
+            # publish request must finish before the browser goes away
+            self.wait_for("network_idle", "STEP 6 publish", timeout=5, quiet=1.0)
         except Exception as e:
             raise RuntimeError(f"STEP 6: Cannot click Done – {e}")
+        self.checkpoint("published")
 
 
 # ──────────────────────────────────────────────────────────────
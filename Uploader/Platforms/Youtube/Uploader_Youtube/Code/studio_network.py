@@ -0,0 +1,239 @@
+"""
+YouTube Studio upload / processing state read from the page's own traffic.
+
+Studio already fetches the upload session (upload.youtube.com, resumable
+protocol) and polls the creator API for the new video's processing status.
+`StudioProcessingWatcher` consumes Chrome's CDP performance-log entries,
+pulls the bodies of those responses with `Network.getResponseBody` and
+reports completion the moment Studio learns about it – no polling sleep,
+no page refresh.
+
+`serve_standin()` runs a local page that performs the same kind of requests
+(resumable upload + status polls with rising progress) so the watcher and
+the uploader's STEP 3 can be exercised without touching a real channel:
+
+    python studio_network.py --port 8765 --processing-seconds 8
+"""
+
+from __future__ import annotations
+import argparse
+import json
+import logging
+import re
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Callable, Iterable, Optional
+
+# Requests whose responses carry upload / processing state. Only the upload
+# session and createvideo name *our* video; creator calls (content lists…)
+# mention other videos too.
+UPLOAD_URL_RE = re.compile(r"upload\.youtube\.com|/upload/", re.I)
+CREATE_URL_RE = re.compile(r"/youtubei/v1/upload/createvideo", re.I)
+STATUS_URL_RE = re.compile(r"/youtubei/v1/(creator|upload)/", re.I)
+
+DONE_MARKERS = ("SUCCEEDED", "PROCESSED", "COMPLETE")
+FAILED_MARKERS = ("FAILED", "REJECTED", "ABANDONED")
+
+
+def _walk(obj):
+    """Yield (key, value) for every dict entry in a nested JSON value."""
+    if isinstance(obj, dict):
+        for k, v in obj.items():
+            yield k, v
+            yield from _walk(v)
+    elif isinstance(obj, list):
+        for v in obj:
+            yield from _walk(v)
+
+
+def _entries_for(obj, video_id: str):
+    """Yield every dict in a nested JSON value that describes `video_id`."""
+    if isinstance(obj, dict):
+        if obj.get("videoId") == video_id:
+            yield obj
+            return
+        for v in obj.values():
+            yield from _entries_for(v, video_id)
+    elif isinstance(obj, list):
+        for v in obj:
+            yield from _entries_for(v, video_id)
+
+
+class StudioProcessingWatcher:
+    """
+    Feed it performance-log entries; it tracks:
+        uploaded   – the resumable upload session was finalised
+        video_id   – id Studio assigned to the new video (upload / createvideo responses only)
+        progress   – last processing percentage seen for video_id (or None)
+        status     – last processing / video status string for video_id
+        done / failed
+    """
+
+    def __init__(self, get_body: Callable[[str], Optional[str]]):
+        self._get_body = get_body                # requestId -> response body text
+        self._tracked = {}                       # requestId -> "upload" | "create" | "status"
+        self.uploaded = False
+        self.video_id: Optional[str] = None
+        self.progress: Optional[float] = None
+        self.status = ""
+        self.failed = False
+
+    @property
+    def done(self) -> bool:
+        return any(m in self.status for m in DONE_MARKERS)
+
+    @property
+    def ready(self) -> bool:
+        """Studio lets you continue once the upload is in and processing has started or finished."""
+        return self.done or (self.uploaded and self.video_id is not None)
+
+    def feed(self, entries: Iterable[dict]) -> None:
+        for entry in entries:
+            try:
+                msg = json.loads(entry["message"])["message"]
+            except (KeyError, TypeError, ValueError):
+                continue
+            method, params = msg.get("method", ""), msg.get("params", {})
+            request_id = params.get("requestId")
+
+            if method == "Network.responseReceived":
+                response = params.get("response", {})
+                url = response.get("url", "")
+                if CREATE_URL_RE.search(url):
+                    self._tracked[request_id] = "create"
+                elif STATUS_URL_RE.search(url):
+                    self._tracked[request_id] = "status"
+                elif UPLOAD_URL_RE.search(url):
+                    self._tracked[request_id] = "upload"
+                    headers = {k.lower(): v for k, v in response.get("headers", {}).items()}
+                    if headers.get("x-goog-upload-status", "").lower() == "final" and response.get("status") == 200:
+                        self.uploaded = True
+
+            elif method == "Network.loadingFinished" and request_id in self._tracked:
+                self._read_body(request_id, self._tracked.pop(request_id))
+
+    def _read_body(self, request_id: str, kind: str) -> None:
+        try:
+            body = self._get_body(request_id)
+            data = json.loads(body) if body else None
+        except Exception:
+            return
+        if kind != "status" and self.video_id is None:
+            self.video_id = next((v for k, v in _walk(data) if k == "videoId" and isinstance(v, str) and v), None)
+        if self.video_id is None:
+            return                               # can't tell whose status this is
+        for entry in _entries_for(data, self.video_id):
+            self._read_status(entry)
+
+    def _read_status(self, entry: dict) -> None:
+        for key, value in _walk(entry):
+            if key in ("processingStatus", "status", "uploadStatus") and isinstance(value, str):
+                upper = value.upper()
+                if "STATUS" in upper or upper.isupper():
+                    self.status = upper
+                    if any(m in upper for m in FAILED_MARKERS):
+                        self.failed = True
+            elif key in ("percentComplete", "processingProgress") and isinstance(value, (int, float)):
+                self.progress = float(value)
+            elif key == "processingProgress" and isinstance(value, dict):
+                pct = value.get("percentComplete") or value.get("partsProcessed")
+                if isinstance(pct, (int, float)):
+                    self.progress = float(pct)
+
+
+def cdp_body_reader(driver) -> Callable[[str], Optional[str]]:
+    """`get_body` for a selenium Chrome driver (decodes base64 bodies)."""
+    import base64
+
+    def _get(request_id: str) -> Optional[str]:
+        res = driver.execute_cdp_cmd("Network.getResponseBody", {"requestId": request_id})
+        body = res.get("body", "")
+        if res.get("base64Encoded"):
+            body = base64.b64decode(body).decode("utf-8", errors="replace")
+        # youtubei responses may start with an XSSI guard
+        return body[body.find("{"):] if "{" in body else body
+    return _get
+
+
+# ──────────────────────────────────────────────────────────────
+# Local stand-in
+# ──────────────────────────────────────────────────────────────
+_STANDIN_PAGE = """<!doctype html>
+<html><body>
+<h1>Studio stand-in</h1>
+<input type="file" id="file">
+<div id="progress" role="progressbar" aria-valuenow="0" aria-valuemax="100"></div>
+<ytcp-button id="next-button" disabled>Next</ytcp-button>
+<script>
+document.getElementById('file').addEventListener('change', async () => {
+  const up = await fetch('/upload/?upload_id=standin', {method: 'PUT', body: 'x'});
+  const {videoId} = await up.json();
+  const poll = async () => {
+    const r = await fetch('/youtubei/v1/creator/get_creator_videos', {method: 'POST', body: JSON.stringify({videoIds: [videoId]})});
+    const v = (await r.json()).videos[0];
+    document.getElementById('progress').setAttribute('aria-valuenow', v.processingProgress.percentComplete);
+    if (v.processingProgress.processingStatus.endsWith('SUCCEEDED')) {
+      document.getElementById('next-button').removeAttribute('disabled');
+    } else { setTimeout(poll, 1000); }
+  };
+  poll();
+});
+</script>
+</body></html>"""
+
+
+def serve_standin(port: int = 8765, processing_seconds: float = 8.0) -> ThreadingHTTPServer:
+    """Start the stand-in on a daemon thread and return the server (call .shutdown() to stop)."""
+    state = {"uploaded_at": None}
+
+    class Handler(BaseHTTPRequestHandler):
+        def log_message(self, *args):
+            pass
+
+        def _send(self, body: str, ctype: str = "application/json", extra: Optional[dict] = None):
+            data = body.encode("utf-8")
+            self.send_response(200)
+            self.send_header("Content-Type", ctype)
+            self.send_header("Content-Length", str(len(data)))
+            for k, v in (extra or {}).items():
+                self.send_header(k, v)
+            self.end_headers()
+            self.wfile.write(data)
+
+        def do_GET(self):
+            self._send(_STANDIN_PAGE, "text/html")
+
+        def do_PUT(self):
+            self.rfile.read(int(self.headers.get("Content-Length", 0)))
+            state["uploaded_at"] = time.time()
+            self._send(json.dumps({"videoId": "STANDIN01"}), extra={"X-Goog-Upload-Status": "final"})
+
+        def do_POST(self):
+            self.rfile.read(int(self.headers.get("Content-Length", 0)))
+            elapsed = time.time() - (state["uploaded_at"] or time.time())
+            pct = min(100, int(100 * elapsed / processing_seconds))
+            status = "PROCESSING_STATUS_SUCCEEDED" if pct >= 100 else "PROCESSING_STATUS_PROCESSING"
+            self._send(json.dumps({"videos": [{
+                "videoId": "STANDIN01",
+                "processingProgress": {"processingStatus": status, "percentComplete": pct},
+            }]}))
+
+    server = ThreadingHTTPServer(("127.0.0.1", port), Handler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    logging.info("Studio stand-in on http://127.0.0.1:%d/", port)
+    return server
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Local YouTube Studio processing stand-in")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--processing-seconds", type=float, default=8.0)
+    args = parser.parse_args()
+    logging.basicConfig(level=logging.INFO)
+    serve_standin(args.port, args.processing_seconds)
+    try:
+        while True:
+            time.sleep(3600)
+    except KeyboardInterrupt:
+        pass